@@ -30,127 +30,190 @@ Refer to the files in this folder for the full documentation. Below an overview:
 import os
 import pkgutil
 from importlib import import_module as _import_module
-from inspect import isfunction as _isfunction
-from inspect import getmembers as _getmembers
+from robot.api.deco import library as _library
+from ams.data_model.common_libs.utils.keyword_manifest import (
+    load_keyword_manifest as _load_keyword_manifest,
+)
 
 # get PROTOCOL environment variable
 protocol = os.environ.get("PROTOCOL", "EDIFACT")
 
-# Discover and import automatically keywords
+# Discover keywords automatically, modules are imported when a keyword is first used
 PACKAGE_NAME = __name__
 
-# import package and discover list of functionality modules
-mod = __import__(PACKAGE_NAME)
+# discover list of functionality modules
 func_modules_list = [
     modname
-    for importer, modname, ispkg in pkgutil.iter_modules(mod.__path__)
+    for importer, modname, ispkg in pkgutil.iter_modules(__path__)
     if modname not in ["main", "commons", "data_model", "grammar", "version"]
 ]
 
-# list of modules containing keywords at functionality level
-modules_with_keywords = ["injector", "responses"]
 # list of modules containing keywords at library level
 extra_modules = []
 
+# functions imported by the functionality modules which are keywords too, the other
+# imported functions are helpers of the library
+reexported_keywords = [
+    "add_data_to_clean_up",
+    "construct_attributes",
+    "construct_default_params",
+    "fail",
+    "get_customer_id",
+    "get_dates_between",
+    "get_ref_airport_iata",
+    "get_ref_airport_id",
+    "get_resource_period_details",
+    "initialize_context",
+    "initialize_test_context",
+    "load_and_validate_response_schema",
+    "now_gmt",
+    "rest_injector",
+    "validate_general_processing",
+]
+
+# keyword name -> module, arguments and documentation of the keyword
+_KEYWORD_MANIFEST = _load_keyword_manifest(
+    __path__[0],
+    PACKAGE_NAME,
+    func_modules_list,
+    extra_modules,
+    reexports=reexported_keywords,
+)
+
+# compile all payload templates at import instead of on first use
+if os.environ.get("AMS_PRECOMPILE_TEMPLATES", "").lower() in ("1", "true", "yes"):
+    _import_module(
+        "ams.data_model.common_libs.request_response_handler.request_generator"
+    ).precompile_templates(__path__[0])
 
-# def _discover_keywords(current_functionality, directory=""):
-#     """
-#     Discover keywords in Python modules - functionality level
-#     """
-#     for module in modules_with_keywords:
-#         keywords_list = []
-#         try:
-#             imported_module = _import_module(
-#                 "%(package_name)s.%(functionality)s%(directory)s.%(module)s"
-#                 % {
-#                     "package_name": PACKAGE_NAME,
-#                     "functionality": current_functionality,
-#                     "directory": directory,
-#                     "module": module,
-#                 }
-#             )
-#         except ImportError:
-#             # optional response module
-#             if module == "responses" and not os.path.isfile(
-#                 os.path.sep.join(
-#                     [PACKAGE_NAME, directory, current_functionality, module, ".py"]
-#                 )
-#             ):
-#                 continue
-#             raise
-#         # get list of keywords from the imported module
-#         for function in _getmembers(imported_module, _isfunction):
-#             if _isfunction(function[1]):
-#                 keywords_list.append(function[0])
-
-#         # create variables for every keyword discovered
-#         for keyword in keywords_list:
-#             globals()[keyword] = getattr(imported_module, keyword)
-
-
-# pylint: disable=redefined-outer-name
-def _discover_keywords(current_functionality, module, subfolder=""):
+
+def _import_keyword(name):
     """
-    Discover keywords in Python modules
+    Import the module defining the keyword and return the keyword
     """
-    module_path = (
-        f"{PACKAGE_NAME}.{current_functionality}.{subfolder}.{module}"
-        if subfolder
-        else f"{PACKAGE_NAME}.{current_functionality}.{module}"
-    )
+    entry = _KEYWORD_MANIFEST.get(name)
+    if entry is None:
+        raise AttributeError(f"module '{PACKAGE_NAME}' has no attribute '{name}'")
     try:
-        imported_module = _import_module(module_path)
+        imported_module = _import_module(entry["module"])
     except ImportError as e:
-        print(f"Failed to import module {module_path}: {e}")
+        print(f"Failed to import module {entry['module']}: {e}")
         raise
+    return getattr(imported_module, entry["attribute"])
 
-    # get list of keywords from the imported module
-    keywords_list = [
-        function
-        for function in dir(imported_module)
-        if callable(getattr(imported_module, function))
-    ]
-    # create variables for every keyword discovered
-    for keyword in keywords_list:
-        globals()[keyword] = getattr(imported_module, keyword)
 
+# keywords already imported
+_KEYWORDS = {}
+
+
+def _get_keyword(name):
+    """
+    Return the keyword, importing its module on first use
+    """
+    if name not in _KEYWORDS:
+        _KEYWORDS[name] = _import_keyword(name)
+    return _KEYWORDS[name]
+
+
+def __getattr__(name):
+    """
+    Resolve keywords on first access and keep them as module variables
+    """
+    keyword = _get_keyword(name)
+    globals()[name] = keyword
+    return keyword
+
+
+class _LazyListener:
+    """
+    Robot listener importing the module of the listener it stands for on its first event,
+    so that importing the library does not load the HTTP clients
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._listener = None
+
+    def _get_listener(self):
+        """Returns the listener, importing its module on first use"""
+        if self._listener is None:
+            self._listener = getattr(_import_module(self._module), self._name)()
+        return self._listener
+
+    def _forward(self, event, *args):
+        """Calls the event method of the listener if it has one"""
+        method = getattr(self._get_listener(), event, None)
+        if method is not None:
+            method(*args)
+
+    def start_suite(self, name, attributes):
+        """Forwards the start of a suite"""
+        self._forward("start_suite", name, attributes)
+
+    def end_suite(self, name, attributes):
+        """Forwards the end of a suite"""
+        self._forward("end_suite", name, attributes)
+
+    def start_keyword(self, name, attributes):
+        """Forwards the start of a keyword"""
+        self._forward("start_keyword", name, attributes)
+
+    def end_keyword(self, name, attributes):
+        """Forwards the end of a keyword"""
+        self._forward("end_keyword", name, attributes)
+
+    def close(self):
+        """Forwards the end of the execution"""
+        self._forward("close")
 
-def _discover_extra_keywords():
+
+@_library(scope="GLOBAL")
+class AmsLibrary:
     """
-    Discover extra keywords in Python modules - library level
+    Robot Framework dynamic library exposing the keywords of the manifest.
+
+    Keywords are registered from the manifest, the module of a keyword is imported
+    only when the keyword is run for the first time.
+    The HTTP calls are measured per endpoint and keyword by the library listeners, and
+    recorded or replayed from a cassette when ``AMS_CASSETTE_MODE`` is set.
     """
-    for module in extra_modules:
-        keywords_list = []
-        imported_module = _import_module(
-            "%(package_name)s.%(module)s"
-            % {
-                "package_name": PACKAGE_NAME,
-                "module": module,
-            }
-        )
-        # get list of keywords from the imported module
-        for function in _getmembers(imported_module, _isfunction):
-            if _isfunction(function[1]):
-                keywords_list.append(function[0])
-
-        # create variables for every keyword discovered
-        for keyword in keywords_list:
-            globals()[keyword] = getattr(imported_module, keyword)
-
-
-for functionality in func_modules_list:
-    # discover keywords for every functionality modules
-    for root, directories, files in os.walk(mod.__path__[0] + os.sep + functionality):
-        directories = [
-            directory for directory in directories if "__pycache__" not in directory
+
+    ROBOT_LIBRARY_LISTENER = [
+        _LazyListener(
+            "ams.data_model.common_libs.clients.cassette", "CassetteListener"
+        ),
+        _LazyListener(
+            "ams.data_model.common_libs.clients.http_metrics", "HttpMetricsListener"
+        ),
+    ]
+
+    def get_keyword_names(self):
+        """Returns the names of all keywords"""
+        return [name for name, entry in _KEYWORD_MANIFEST.items() if entry["keyword"]]
+
+    def run_keyword(self, name, args, kwargs=None):
+        """Runs the keyword, importing its module if needed"""
+        return _get_keyword(name)(*args, **(kwargs or {}))
+
+    def get_keyword_arguments(self, name):
+        """Returns the argument specification of the keyword"""
+        return [
+            tuple(argument) if isinstance(argument, list) else argument
+            for argument in _KEYWORD_MANIFEST[name]["args"]
         ]
-        py_files = [file for file in files if file.endswith(".py")]
-        for file in py_files:
-            module = file.split(".")[0]
-            subfolder = root.split(functionality)[1].strip(os.sep)
-            if os.sep in subfolder:
-                # in case subfolder has additional folders
-                subfolder = subfolder.replace(os.sep, ".")
-            _discover_keywords(functionality, module, subfolder)
-# discover extra keywords
-_discover_extra_keywords()
+
+    def get_keyword_documentation(self, name):
+        """Returns the documentation of the keyword or of the library"""
+        if name == "__intro__":
+            return __doc__
+        if name == "__init__":
+            return ""
+        return _KEYWORD_MANIFEST[name]["doc"]
+
+    def get_keyword_source(self, name):
+        """Returns the source file and line number of the keyword"""
+        entry = _KEYWORD_MANIFEST[name]
+        return f"{entry['source']}:{entry['lineno']}"
@@ -1,6 +1,7 @@
 """Injector module to handle GET http calls from CDS"""
 
 import logging
+from ams.data_model.common_libs.clients.http_cache import invalidate_cache
 from ams.data_model.common_libs.injectors.injector import _http_call
 from ams.data_model.common_libs.utils.generic_helpers import add_data_to_clean_up
 from ams.data_model.common_libs.request_response_handler.request_generator import (
@@ -34,7 +35,7 @@ def cds_v1_get_rule_template_by_id(template_id="TEST"):
     """
     cds_endpoint = "/cds/services/v1/rule-template/{id}"
 
-    kwargs = {"path_params": {"id": template_id}}
+    kwargs = {"path_params": {"id": template_id}, "cache": True}
 
     return _http_call(cds_endpoint, **kwargs)
 
@@ -61,7 +62,7 @@ def cds_v1_get_rule_templates():
     """
     cds_endpoint = "/cds/services/v1/rule-templates"
 
-    kwargs = {}
+    kwargs = {"cache": True}
 
     return _http_call(cds_endpoint, **kwargs)
 
@@ -255,7 +256,7 @@ def cds_v1_get_tags():
     """
     cds_endpoint = "/cds/services/v1/rules/tags"
 
-    kwargs = {}
+    kwargs = {"cache": True}
 
     return _http_call(cds_endpoint, **kwargs)
 
@@ -284,6 +285,7 @@ def cds_v1_get_tags_for_template(template_id="TEST"):
 
     kwargs = {
         "path_params": {"template_id": template_id},
+        "cache": True,
     }
 
     return _http_call(cds_endpoint, **kwargs)
@@ -380,6 +382,7 @@ def cds_v1_create_rule():
     kwargs = {"operation": "POST", "payload": entity}
 
     response = _http_call(cds_endpoint, **kwargs)
+    invalidate_cache("/cds/services/v1/rules/tags")
 
     LOGGER.info("Rule created for template: %s, response: %s", template_uuid, response)
 
@@ -418,6 +421,7 @@ def cds_v1_delete_rule(rule):
     kwargs = {"operation": "DELETE", "payload": entity}
 
     response = _http_call(cds_endpoint, **kwargs)
+    invalidate_cache("/cds/services/v1/rules/tags")
 
     LOGGER.info(
         "Deleted rule: %s, from template: %s", rule["uuid"], rule["ruleTemplateUuid"]
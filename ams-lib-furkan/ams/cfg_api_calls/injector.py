@@ -2,10 +2,13 @@
 
 import logging
 from protocols import session_manager
+from ams.data_model.common_libs.clients.http_cache import invalidate_cache
 from ams.data_model.common_libs.injectors.injector import _http_call
 from ams.data_model.common_libs.request_response_handler.request_generator import (
     PayloadGenerator,
 )
+from ams.data_model.common_libs.utils.generic_helpers import invalidate_settings_index
+from ams.data_model.initialize_ams_test.session_cache import SESSION_CACHE
 
 LOGGER = logging.getLogger(__name__)
 
@@ -165,7 +168,9 @@ def cfg_v2_get_configuration_application(component="COMMON", revision="-1"):
             "configuration": customer_id,
             "component": component,
             "revision": revision,
-        }
+        },
+        # reference data, revalidated with a conditional GET
+        "cache": True,
     }
 
     response_json = _http_call(cfg_endpoint, **kwargs)
@@ -273,7 +278,11 @@ def cfg_v1_update_parameter(component, param, value):
         "payload": entity,
     }
 
-    return _http_call(cfg_endpoint, **kwargs)
+    response = _http_call(cfg_endpoint, **kwargs)
+    invalidate_settings_index()
+    invalidate_cache("/configuration/")
+    SESSION_CACHE.discard_configurations()
+    return response
 
 
 def cfg_v2_publish_configuration(configuration, revision):
@@ -304,4 +313,8 @@ def cfg_v2_publish_configuration(configuration, revision):
         "path_params": {"configurationName": configuration, "revision": revision},
     }
 
-    return _http_call(cfg_endpoint, **kwargs)
+    response = _http_call(cfg_endpoint, **kwargs)
+    invalidate_settings_index()
+    invalidate_cache("/configuration/")
+    SESSION_CACHE.discard_configurations()
+    return response
@@ -11,6 +11,7 @@ import jmespath
 import jmespath.exceptions
 from protocols import session_manager
 from ams.data_model.common_libs.utils.date_handler import now_gmt
+from ams.data_model.common_libs.utils.period_index import PeriodIndex
 from ams.data_model.common_libs.utils.generic_helpers import (
     find_matching_setting,
     find_matching_setting_with_criteria,
@@ -90,10 +91,14 @@ def get_resource_id(response_json, return_type="list"):
     | Get Resource Id    response_json=${response_json}    return_type=str  |
 
     """
-    resource_id = jmespath.search(
-        f"[?periods[?endDateTime == null || endDateTime > '{now_gmt()}']].id",
-        response_json,
-    )
+    resources = _current_resources(response_json)
+    if resources is None:
+        return None
+    resource_id = [
+        match["entity"]["id"]
+        for match in resources
+        if match["entity"].get("id") is not None
+    ]
     if return_type == "str":
         return ", ".join(resource_id)
     return resource_id
@@ -130,10 +135,14 @@ def get_resource_name(response_json, return_type="list"):
     | Get Resource Name    response_json=${response_json}    return_type=str  |
 
     """
-    resource_name = jmespath.search(
-        f"[?periods[?endDateTime == null || endDateTime > '{now_gmt()}']].name",
-        response_json,
-    )
+    resources = _current_resources(response_json)
+    if resources is None:
+        return None
+    resource_name = [
+        match["entity"]["name"]
+        for match in resources
+        if match["entity"].get("name") is not None
+    ]
     if return_type == "str":
         return ", ".join(resource_name)
     return resource_name
@@ -169,12 +178,67 @@ def get_resource_name_and_id(response_json):
     | Get Resource Name And Id    response_json=${response_json}     |
 
     """
-    resource_name_id_list = jmespath.search(
-        f"[?periods[?endDateTime == null || endDateTime > '{now_gmt()}']].{{name: name, id: id}}",
-        response_json,
-    )
+    resources = _current_resources(response_json)
+    if resources is None:
+        return None
+    return [
+        {"name": match["entity"].get("name"), "id": match["entity"].get("id")}
+        for match in resources
+    ]
+
+
+def get_valid_resources(response_json, valid_at=None, valid_from=None, valid_to=None):
+    """
+    Returns the id, name and valid periods of the resource entities of a JSON response valid at a time or during a time range,
+    by default the ones with a period not ended now. The periods are indexed once per call.
 
-    return resource_name_id_list
+    | *Arguments*               | *Description*                                                                         |
+
+    | ``response_json``         | response object from any GET api call                                                 |
+    | ``valid_at``              | (Optional) date time (ISO 8601) at which a period is started and not ended            |
+    | ``valid_from``            | (Optional) start of the range of date times overlapped by a period, open by default   |
+    | ``valid_to``              | (Optional) end of the range of date times overlapped by a period, open by default     |
+
+    Every resource is a dict with ``id``, ``name`` and ``periods``, the list of its matching periods
+    (``periodId``, ``startDateTime`` and ``endDateTime``).
+
+    === Usage: ===
+    | ${resources}=    Get Valid Resources    response_json=${response_json}    |
+    | ${resources}=    Get Valid Resources    response_json=${response_json}    valid_at=2025-06-01T10:00:00    |
+    | ${resources}=    Get Valid Resources    response_json=${response_json}    valid_from=2025-06-01T00:00:00    valid_to=2025-06-02T00:00:00    |
+
+    """
+    if not isinstance(response_json, list):
+        return None
+    index = PeriodIndex(response_json)
+    if valid_at is not None:
+        resources = index.active_at(valid_at)
+    elif valid_from is None and valid_to is None:
+        resources = index.valid_between(start=now_gmt())
+    else:
+        resources = index.valid_between(valid_from, valid_to)
+    return [
+        {
+            "id": match["entity"].get("id"),
+            "name": match["entity"].get("name"),
+            "periods": [
+                {
+                    "periodId": period.get("periodId"),
+                    "startDateTime": period.get("startDateTime"),
+                    "endDateTime": period.get("endDateTime"),
+                }
+                for period in match["periods"]
+            ],
+        }
+        for match in resources
+    ]
+
+
+def _current_resources(response_json):
+    """Returns the entities of the response with a period not ended now, None if the response is not a list"""
+    if not isinstance(response_json, list):
+        return None
+    return PeriodIndex(response_json).valid_between(start=now_gmt())
 
 
 def get_resource_period_details(response_json, **kwargs):
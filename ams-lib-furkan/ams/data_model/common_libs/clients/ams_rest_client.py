@@ -0,0 +1,438 @@
+"""
+REST client used by the injectors to send HTTP requests to AMS.
+
+Requests are sent through one pooled ``requests.Session`` per server url, so connections
+(and their TLS handshake) are kept alive and reused across calls instead of being opened
+for every request. Authentication headers and cookies are taken from the security context
+of the protocols session, the sessions never store cookies themselves.
+"""
+
+import copy
+import functools
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+from http.cookiejar import DefaultCookiePolicy
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from protocols import broker, session_manager
+from ams.data_model.common_libs.clients.http_cache import (
+    HTTP_CACHE,
+    is_enabled as is_cache_enabled,
+)
+from ams.data_model.common_libs.clients.http_metrics import METRICS, is_enabled
+from ams.data_model.common_libs.clients.single_flight import (
+    SINGLE_FLIGHT,
+    is_enabled as is_single_flight_enabled,
+)
+from ams.data_model.common_libs.request_response_handler.response_validator import (
+    verify_response_status_code,
+)
+from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+# pylint: disable=line-too-long
+# pylint: disable = protected-access
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 120
+
+# callables (session_key) -> bool called on 401 Unauthorized, the request is sent again
+# once if one of them authenticated the session again
+_UNAUTHORIZED_HANDLERS = []
+
+
+def register_unauthorized_handler(handler):
+    """Registers a handler called when a request is rejected with 401 Unauthorized"""
+    if handler not in _UNAUTHORIZED_HANDLERS:
+        _UNAUTHORIZED_HANDLERS.append(handler)
+
+
+def unregister_unauthorized_handler(handler):
+    """Removes a handler registered with register_unauthorized_handler"""
+    if handler in _UNAUTHORIZED_HANDLERS:
+        _UNAUTHORIZED_HANDLERS.remove(handler)
+
+
+def _handle_unauthorized(session_key):
+    for handler in _UNAUTHORIZED_HANDLERS:
+        try:
+            if handler(session_key):
+                return True
+        except Exception as e:
+            LOGGER.warning(
+                "Unable to authenticate session %s again: %s", session_key, e
+            )
+    return False
+
+
+# callables (session_key) -> security context or None, for the sessions not opened with
+# protocols (e.g. the sessions of a session pool)
+_SECURITY_CONTEXT_PROVIDERS = []
+
+
+def register_security_context_provider(provider):
+    """Registers a provider of the security context of session keys unknown to protocols"""
+    if provider not in _SECURITY_CONTEXT_PROVIDERS:
+        _SECURITY_CONTEXT_PROVIDERS.append(provider)
+
+
+def unregister_security_context_provider(provider):
+    """Removes a provider registered with register_security_context_provider"""
+    if provider in _SECURITY_CONTEXT_PROVIDERS:
+        _SECURITY_CONTEXT_PROVIDERS.remove(provider)
+
+
+def get_security_context(session_key="defaultKey"):
+    """Returns the security context (server url and headers) of the session"""
+    for provider in _SECURITY_CONTEXT_PROVIDERS:
+        security_context = provider(session_key)
+        if security_context is not None:
+            return security_context
+    return session_manager.sessions._get_security_context_details(session_key)
+
+
+class TransportStatistics:
+    """Thread safe counters of requests and connections per host"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, host):
+        return self._hosts.setdefault(host, {"requests": 0, "new_connections": 0})
+
+    def record_request(self, host):
+        """Counts a request sent to the host"""
+        with self._lock:
+            self._host(host)["requests"] += 1
+
+    def record_new_connection(self, host):
+        """Counts a new connection opened to the host"""
+        with self._lock:
+            self._host(host)["new_connections"] += 1
+
+    def snapshot(self):
+        """
+        Returns the counters per host:
+            - requests: number of requests sent
+            - new_connections: number of connections opened (including TLS handshake)
+            - reused_connections: number of requests sent on an already opened connection
+        """
+        with self._lock:
+            return {
+                host: {
+                    **counters,
+                    "reused_connections": max(
+                        counters["requests"] - counters["new_connections"], 0
+                    ),
+                }
+                for host, counters in self._hosts.items()
+            }
+
+    def reset(self):
+        """Resets all counters"""
+        with self._lock:
+            self._hosts = {}
+
+
+STATISTICS = TransportStatistics()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        STATISTICS.record_new_connection(self.host)
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        STATISTICS.record_new_connection(self.host)
+        return super()._new_conn()
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTP adapter counting the connections opened by its connection pools"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+
+class RestTransport:
+    """
+    Holds one pooled session per server url.
+
+    The pool size and the request timeout can be set with the ``AMS_HTTP_POOL_SIZE`` and
+    ``AMS_HTTP_TIMEOUT`` Robot variables (or environment variables).
+    """
+
+    def __init__(self, pool_size=None, timeout=None):
+        self.pool_size = int(
+            pool_size or get_variable_value("AMS_HTTP_POOL_SIZE", DEFAULT_POOL_SIZE)
+        )
+        self.timeout = float(
+            timeout or get_variable_value("AMS_HTTP_TIMEOUT", DEFAULT_TIMEOUT)
+        )
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def get_session(self, server_url):
+        """Returns the pooled session for the server url, creating it if needed"""
+        with self._lock:
+            session = self._sessions.get(server_url)
+            if session is None:
+                session = requests.Session()
+                adapter = PooledHTTPAdapter(
+                    pool_connections=self.pool_size, pool_maxsize=self.pool_size
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                # cookies come from the security context of each protocols session
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                self._sessions[server_url] = session
+                LOGGER.debug(
+                    "New pooled session for %s (pool size %s)",
+                    server_url,
+                    self.pool_size,
+                )
+            return session
+
+    def send(self, rest_details, session_key="defaultKey"):
+        """
+        Sends the request described by the rest details built by an injector_rest module.
+
+        Args:
+            rest_details (dict): operation, path, params, headers, data, json, files, verify
+                and optional expected_status_code, stream (the body is then read on demand)
+                and cache (a GET of reference data, see http_cache).
+            session_key (str): protocols session used for the server url and security headers.
+
+        Returns:
+            requests.Response: the response of the call.
+
+        A request rejected with 401 Unauthorized is sent again once if the session could be
+        authenticated again (see register_unauthorized_handler).
+        """
+        cache_key = entry = None
+        if (
+            rest_details.get("cache")
+            and not rest_details.get("stream")
+            and rest_details.get("operation", "GET") == "GET"
+            and is_cache_enabled()
+        ):
+            cache_key = HTTP_CACHE.key(session_key, rest_details)
+            entry, fresh = HTTP_CACHE.lookup(cache_key)
+            if fresh:
+                return HTTP_CACHE.hit(entry)
+            if entry is not None:
+                rest_details = {
+                    **rest_details,
+                    "headers": {
+                        **(rest_details.get("headers") or {}),
+                        **entry.conditional_headers(),
+                    },
+                }
+
+        flight_key = _flight_key(rest_details, session_key)
+        if flight_key is not None:
+            # identical GETs in flight are sent once, the waiters get a copy of the response
+            response = SINGLE_FLIGHT.do(
+                flight_key,
+                lambda: self._send_authenticated(rest_details, session_key),
+                _copy_response,
+            )
+        else:
+            response = self._send_authenticated(rest_details, session_key)
+
+        if cache_key is not None:
+            response = HTTP_CACHE.resolve(cache_key, entry, response)
+
+        if rest_details.get("expected_status_code") is not None:
+            verify_response_status_code(
+                response.status_code, rest_details["expected_status_code"]
+            )
+        return response
+
+    def _send_authenticated(self, rest_details, session_key):
+        response = self._send(rest_details, session_key)
+        if response.status_code == 401 and _handle_unauthorized(session_key):
+            response = self._send(rest_details, session_key)
+        return response
+
+    def _send(self, rest_details, session_key):
+        security_context = get_security_context(session_key)
+        server_url = security_context.get("server_url") or (
+            session_manager.sessions._get_session_context_data()
+            .get("global_environment_context", {})
+            .get("server_url")
+        )
+        headers = {
+            **(security_context.get("header") or {}),
+            **(rest_details.get("headers") or {}),
+        }
+
+        session = self.get_session(server_url)
+        STATISTICS.record_request(urlparse(server_url).hostname)
+        start = time.perf_counter()
+        response = None
+        try:
+            response = session.request(
+                rest_details.get("operation", "GET"),
+                f"{server_url}{rest_details['path']}",
+                params=rest_details.get("params"),
+                data=rest_details.get("data"),
+                json=rest_details.get("json"),
+                files=rest_details.get("files"),
+                headers={
+                    key: value for key, value in headers.items() if value is not None
+                },
+                verify=rest_details.get("verify", False),
+                timeout=self.timeout,
+                stream=rest_details.get("stream", False),
+            )
+        finally:
+            if is_enabled():
+                _record_call(
+                    rest_details.get("operation", "GET"),
+                    rest_details["path"],
+                    response,
+                    time.perf_counter() - start,
+                    rest_details.get("path_template"),
+                )
+
+        LOGGER.debug(
+            "%s %s: %s",
+            rest_details.get("operation", "GET"),
+            rest_details["path"],
+            response.status_code,
+        )
+        return response
+
+    def close(self):
+        """Closes all pooled sessions and their connections"""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+def _flight_key(rest_details, session_key):
+    """Returns the key of identical GETs, None if the request cannot be collapsed"""
+    if (
+        rest_details.get("operation", "GET") != "GET"
+        or rest_details.get("stream")
+        or rest_details.get("data") is not None
+        or rest_details.get("json") is not None
+        or rest_details.get("files")
+        or not is_single_flight_enabled()
+    ):
+        return None
+    params = rest_details.get("params") or {}
+    headers = rest_details.get("headers") or {}
+    return (
+        session_key,
+        rest_details["path"],
+        repr(sorted(params.items()) if isinstance(params, dict) else params),
+        repr(sorted((key, str(value)) for key, value in headers.items())),
+    )
+
+
+def _copy_response(response):
+    """Returns a copy of a read response for another caller, who may close it"""
+    shared = copy.copy(response)
+    shared.headers = copy.copy(response.headers)
+    # the connection was released when the body was read
+    shared.raw = None
+    return shared
+
+
+def _body_size(body):
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return 0
+
+
+def _record_call(method, path, response, latency, path_template=None):
+    """Records the call in the HTTP metrics, response is None when the call failed"""
+    if response is None:
+        METRICS.record(method, path, None, latency, path_template=path_template)
+        return
+    request = getattr(response, "request", None)
+    if response.raw is not None and not response._content_consumed:
+        # streamed response, the body is not read yet
+        response_bytes = int(response.headers.get("Content-Length") or 0)
+    else:
+        response_bytes = len(response.content or b"")
+    METRICS.record(
+        method,
+        path,
+        response.status_code,
+        latency,
+        request_bytes=_body_size(getattr(request, "body", None)),
+        response_bytes=response_bytes,
+        path_template=path_template,
+    )
+
+
+def instrument_broker():
+    """
+    Measures the calls sent through protocols.broker.injector, which do not use the pooled
+    transport.
+    """
+    injector = broker.injector
+    if getattr(injector, "ams_http_metrics", False):
+        return
+
+    @functools.wraps(injector)
+    def measured_injector(*args, **kwargs):
+        start = time.perf_counter()
+        response = injector(*args, **kwargs)
+        if is_enabled() and hasattr(response, "status_code"):
+            request = getattr(response, "request", None)
+            _record_call(
+                getattr(request, "method", None),
+                urlparse(getattr(request, "url", None) or "").path,
+                response,
+                time.perf_counter() - start,
+            )
+        return response
+
+    measured_injector.ams_http_metrics = True
+    broker.injector = measured_injector
+
+
+instrument_broker()
+
+
+_TRANSPORT = None
+_TRANSPORT_LOCK = threading.Lock()
+
+
+def get_transport():
+    """Returns the process wide transport, creating it on first use"""
+    global _TRANSPORT  # pylint: disable=global-statement
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is None:
+            _TRANSPORT = RestTransport()
+        return _TRANSPORT
+
+
+def send_request(rest_details, session_key="defaultKey"):
+    """Sends the request described by the rest details through the pooled transport"""
+    return get_transport().send(rest_details, session_key)
+
+
+def close_transport():
+    """Closes the pooled transport, a new one is created on the next request"""
+    global _TRANSPORT  # pylint: disable=global-statement
+    with _TRANSPORT_LOCK:
+        if _TRANSPORT is not None:
+            _TRANSPORT.close()
+        _TRANSPORT = None
@@ -0,0 +1,319 @@
+"""
+Module to record the HTTP traffic to AMS in a cassette and to replay it without AMS.
+
+In record mode every response received through ``requests`` (the pooled transport of the
+injectors and the protocols broker) is appended to the cassette. In replay mode the requests
+are not sent: the response is served from the cassette, matched on the method, the templated
+path (ids replaced by ``{id}``), the query and a hash of the body. When several recorded calls
+match, they are served in the recorded order, the call with the same exact path first.
+This gives suites which run in seconds, to profile the library itself without AMS.
+
+The cassette is a JSON lines file, gzip compressed when its name ends with ``.gz``. Every
+pabot process records in its own file (``ams_cassette_<index>.jsonl.gz``), all of them are
+replayed.
+The mode and the file are set with the ``AMS_CASSETTE_MODE`` (``record`` or ``replay``) and
+``AMS_CASSETTE`` Robot variables (or environment variables).
+"""
+
+import base64
+import glob
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from urllib.parse import parse_qsl, urlparse
+import requests
+from requests.structures import CaseInsensitiveDict
+from ams.data_model.common_libs.clients.http_metrics import template_path
+
+# pylint: disable=line-too-long
+# pylint: disable = protected-access
+
+LOGGER = logging.getLogger(__name__)
+
+RECORD = "record"
+REPLAY = "replay"
+
+DEFAULT_CASSETTE = "ams_cassette.jsonl.gz"
+
+# response headers kept in the cassette
+_KEPT_HEADERS = ("Content-Type", "Location", "ETag", "Last-Modified")
+
+
+class CassetteMiss(requests.ConnectionError):
+    """Raised in replay mode when no recorded call matches the request"""
+
+
+def _body_bytes(body):
+    if body is None:
+        return b""
+    if isinstance(body, str):
+        return body.encode("utf-8")
+    if isinstance(body, bytes):
+        return body
+    # generators and files are not replayable, they match on their absence
+    return b""
+
+
+def request_key(method, url, body=None, content_type=None):
+    """
+    Returns the key matching a request: method, templated path, sorted query and body hash.
+    The random boundary of a multipart body is left out of the hash.
+    """
+    parsed = urlparse(url)
+    body = _body_bytes(body)
+    if content_type and "boundary=" in content_type:
+        boundary = content_type.split("boundary=", 1)[1].split(";")[0].strip('"')
+        body = body.replace(boundary.encode("utf-8"), b"")
+    return "|".join(
+        [
+            (method or "GET").upper(),
+            template_path(parsed.path),
+            "&".join(f"{key}={value}" for key, value in sorted(parse_qsl(parsed.query))),
+            hashlib.sha1(body).hexdigest() if body else "",
+        ]
+    )
+
+
+def _split_extension(path):
+    """Returns the path without and with its extensions (e.g. .jsonl.gz)"""
+    directory, name = os.path.split(path)
+    stem, dot, extension = name.partition(".")
+    return os.path.join(directory, stem), dot + extension
+
+
+class Cassette:
+    """Thread safe recorded calls, by request key"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        # request key -> recorded calls, in the recorded order
+        self._calls = {}
+        # request key -> recorded calls not served yet
+        self._pending = {}
+        self.new_calls = []
+
+    def __len__(self):
+        return sum(len(calls) for calls in self._calls.values())
+
+    def load(self):
+        """Loads the recorded calls of the file and of the files of the pabot processes"""
+        stem, extension = _split_extension(self.path)
+        paths = [self.path] if os.path.exists(self.path) else []
+        paths += sorted(glob.glob(f"{glob.escape(stem)}_*{extension}"))
+        if not paths:
+            raise FileNotFoundError(f"No cassette {self.path}")
+        for path in paths:
+            opener = gzip.open if path.endswith(".gz") else open
+            with opener(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        self._add(json.loads(line))
+        LOGGER.info("Loaded %s recorded HTTP calls from %s", len(self), ", ".join(paths))
+        return self
+
+    def save(self):
+        """Appends the calls recorded since the last save to the file"""
+        with self._lock:
+            calls, self.new_calls = self.new_calls, []
+        if not calls:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        opener = gzip.open if self.path.endswith(".gz") else open
+        with opener(self.path, "at", encoding="utf-8") as file:
+            for call in calls:
+                file.write(json.dumps(call, separators=(",", ":")) + "\n")
+        LOGGER.info("Recorded %s HTTP calls in %s", len(calls), self.path)
+
+    def _add(self, call):
+        self._calls.setdefault(call["key"], []).append(call)
+        self._pending.setdefault(call["key"], []).append(call)
+
+    def record(self, request, response):
+        """Records the response of the prepared request, its body is read"""
+        content = response.content or b""
+        try:
+            body = {"text": content.decode("utf-8")}
+        except UnicodeDecodeError:
+            body = {"base64": base64.b64encode(content).decode("ascii")}
+        call = {
+            "key": request_key(
+                request.method,
+                request.url,
+                request.body,
+                request.headers.get("Content-Type"),
+            ),
+            "path": urlparse(request.url).path,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: response.headers[name]
+                for name in _KEPT_HEADERS
+                if name in response.headers
+            },
+            **body,
+        }
+        with self._lock:
+            self._add(call)
+            self.new_calls.append(call)
+
+    def find(self, request):
+        """
+        Returns the recorded call matching the prepared request: the next call not served yet
+        with the same key, the one with the same exact path first, or the last one of the key
+        once all were served. None if no call matches.
+        """
+        key = request_key(
+            request.method, request.url, request.body, request.headers.get("Content-Type")
+        )
+        path = urlparse(request.url).path
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending:
+                call = next((call for call in pending if call["path"] == path), pending[0])
+                pending.remove(call)
+                return call
+            recorded = self._calls.get(key)
+            if not recorded:
+                return None
+            return next(
+                (call for call in reversed(recorded) if call["path"] == path),
+                recorded[-1],
+            )
+
+
+def build_response(request, call):
+    """Returns the requests response of a recorded call, for the prepared request"""
+    response = requests.Response()
+    response.status_code = call["status"]
+    response.reason = call.get("reason")
+    response.headers = CaseInsensitiveDict(call.get("headers") or {})
+    if "base64" in call:
+        response._content = base64.b64decode(call["base64"])
+    else:
+        response._content = call.get("text", "").encode("utf-8")
+    # the body is already read, iter_content serves it by chunks
+    response._content_consumed = True
+    response.encoding = "utf-8"
+    response.url = request.url
+    response.request = request
+    return response
+
+
+_ORIGINAL_SEND = requests.Session.send
+_STATE = {"mode": None, "cassette": None}
+# cassettes recorded by this process, they are emptied the first time only
+_RECORDED_PATHS = set()
+
+
+def _send(session, request, **kwargs):
+    mode, cassette = _STATE["mode"], _STATE["cassette"]
+    if mode == REPLAY:
+        call = cassette.find(request)
+        if call is None:
+            raise CassetteMiss(
+                f"No recorded call for {request.method} {request.url} in {cassette.path}",
+                request=request,
+            )
+        return build_response(request, call)
+    response = _ORIGINAL_SEND(session, request, **kwargs)
+    if mode == RECORD:
+        cassette.record(request, response)
+    return response
+
+
+def start_cassette(path=None, mode=None):
+    """
+    Records the HTTP calls in the cassette or replays them from it, until stop_cassette.
+
+    Args:
+        path (str): The cassette file. Default is AMS_CASSETTE or ams_cassette.jsonl.gz.
+        mode (str): record or replay. Default is AMS_CASSETTE_MODE.
+
+    Raises:
+        ValueError: If the mode is neither record nor replay.
+
+    The first time a cassette is recorded by the process, the calls of a previous run are
+    removed from it. The next recordings of the run are appended to it.
+    """
+    # pylint: disable=import-outside-toplevel
+    from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+    path = path or get_variable_value("AMS_CASSETTE", DEFAULT_CASSETTE)
+    mode = (mode or get_variable_value("AMS_CASSETTE_MODE", "")).lower()
+    if mode not in (RECORD, REPLAY):
+        raise ValueError(f"Invalid cassette mode {mode!r}, expected record or replay")
+    stop_cassette()
+    if mode == RECORD:
+        pabot_index = get_variable_value("PABOTQUEUEINDEX")
+        if pabot_index is not None:
+            stem, extension = _split_extension(path)
+            path = f"{stem}_{pabot_index}{extension}"
+        if path not in _RECORDED_PATHS:
+            _RECORDED_PATHS.add(path)
+            if os.path.exists(path):
+                os.remove(path)
+                LOGGER.info("Previous recording %s removed", path)
+    cassette = Cassette(path)
+    if mode == REPLAY:
+        cassette.load()
+    _STATE.update(mode=mode, cassette=cassette)
+    requests.Session.send = _send
+    LOGGER.info("HTTP cassette %s started in %s mode", path, mode)
+    return cassette
+
+
+def stop_cassette():
+    """Saves the recorded calls and sends the requests to AMS again"""
+    cassette = _STATE["cassette"]
+    if cassette is not None and _STATE["mode"] == RECORD:
+        cassette.save()
+    requests.Session.send = _ORIGINAL_SEND
+    _STATE.update(mode=None, cassette=None)
+
+
+def active_cassette():
+    """Returns the cassette in use, None when the requests are sent to AMS"""
+    return _STATE["cassette"]
+
+
+class CassetteListener:
+    """
+    Robot Framework listener (API version 2) starting the cassette of AMS_CASSETTE_MODE with
+    the first suite it sees, saving the recorded calls at the end of every suite and stopping
+    the cassette when the execution ends.
+
+    In a directory or pabot run the library is imported by the child suites, the listener
+    does not see the top level suite: the cassette is started with the first child suite.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self):
+        self.started = False
+
+    def start_suite(self, _name, _attributes):
+        """Starts the cassette of AMS_CASSETTE_MODE with the first suite"""
+        # pylint: disable=import-outside-toplevel
+        from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+        if self.started:
+            return
+        self.started = True
+        if get_variable_value("AMS_CASSETTE_MODE"):
+            start_cassette()
+
+    def end_suite(self, _name, _attributes):
+        """Saves the calls recorded during the suite"""
+        cassette = _STATE["cassette"]
+        if cassette is not None and _STATE["mode"] == RECORD:
+            cassette.save()
+
+    def close(self):
+        """Saves the recorded calls and stops the cassette at the end of the execution"""
+        stop_cassette()
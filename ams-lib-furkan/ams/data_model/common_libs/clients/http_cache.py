@@ -0,0 +1,197 @@
+"""
+Module to cache the responses of read-only reference endpoints with conditional GETs.
+
+The body and the validators (``ETag`` and ``Last-Modified``) of a cached call are stored per
+session, path and query. The next call sends ``If-None-Match`` / ``If-Modified-Since`` and the
+stored body is reused when the server answers 304 Not Modified. When the server sends no
+validator, the body is reused without request for ``AMS_HTTP_CACHE_TTL`` seconds (default 10).
+
+Only the calls marked with ``cache`` in their REST details are cached. The keywords saving or
+deleting reference data invalidate the cached paths they change. The ``AMS_HTTP_CACHE=0``
+environment variable disables the cache.
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# pylint: disable=line-too-long
+# pylint: disable = protected-access
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 10
+
+
+def is_enabled():
+    """Returns False when the cache is disabled with AMS_HTTP_CACHE=0"""
+    return os.environ.get("AMS_HTTP_CACHE", "1").lower() not in ("0", "false", "no")
+
+
+class CacheEntry:
+    """Body and validators of a cached response"""
+
+    def __init__(self, response, stored_at):
+        self.content = response.content
+        self.headers = CaseInsensitiveDict(
+            {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+            }
+        )
+        self.encoding = response.encoding
+        self.url = response.url
+        self.etag = response.headers.get("ETag")
+        self.last_modified = response.headers.get("Last-Modified")
+        self.stored_at = stored_at
+
+    def has_validators(self):
+        """Returns True if the server sent an ETag or a Last-Modified date"""
+        return bool(self.etag or self.last_modified)
+
+    def conditional_headers(self):
+        """Returns the headers making the request conditional"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def response(self):
+        """Returns a new response with the cached body"""
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(self.headers)
+        response._content = self.content
+        response._content_consumed = True
+        response.encoding = self.encoding
+        response.url = self.url
+        response.from_cache = True
+        return response
+
+
+class HttpCache:
+    """Thread safe cached responses per session, path and query"""
+
+    def __init__(self, ttl=None, clock=time.monotonic):
+        self._ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @property
+    def ttl(self):
+        """Seconds a response without validator is reused, AMS_HTTP_CACHE_TTL by default"""
+        if self._ttl is not None:
+            return self._ttl
+        # pylint: disable=import-outside-toplevel
+        from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+        return float(get_variable_value("AMS_HTTP_CACHE_TTL", DEFAULT_TTL))
+
+    @staticmethod
+    def key(session_key, rest_details):
+        """Returns the key of the call: session, path and sorted query"""
+        params = rest_details.get("params") or {}
+        if isinstance(params, dict):
+            params = "&".join(f"{name}={params[name]}" for name in sorted(params))
+        return (session_key, rest_details["path"], str(params))
+
+    def lookup(self, key):
+        """
+        Returns the entry of the key and whether it can be reused without request:
+        a response without validator younger than the TTL.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None, False
+        fresh = (
+            not entry.has_validators()
+            and self.clock() - entry.stored_at < self.ttl
+        )
+        return entry, fresh
+
+    def resolve(self, key, entry, response):
+        """
+        Returns the response of a cached call: the cached body on 304 Not Modified,
+        otherwise the response, stored when it succeeded.
+        """
+        if entry is not None and response.status_code == 304:
+            response.close()
+            with self._lock:
+                entry.stored_at = self.clock()
+                self.revalidations += 1
+            return entry.response()
+        with self._lock:
+            self.misses += 1
+            if response.status_code == 200:
+                self._entries[key] = CacheEntry(response, self.clock())
+            else:
+                self._entries.pop(key, None)
+        return response
+
+    def hit(self, entry):
+        """Returns the cached response of a fresh entry"""
+        with self._lock:
+            self.hits += 1
+        return entry.response()
+
+    def invalidate(self, pattern=None, session_key=None):
+        """
+        Drops the cached responses whose path matches the regular expression (all of them
+        without pattern), only of the session if given. Returns the number of dropped responses.
+        """
+        regex = re.compile(pattern) if pattern else None
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if (session_key is None or key[0] == session_key)
+                and (regex is None or regex.match(key[1]))
+            ]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            LOGGER.debug("%s cached responses invalidated for %s", len(keys), pattern)
+        return len(keys)
+
+    def statistics(self):
+        """
+        Returns the counters of the cache:
+            - entries: number of cached responses
+            - hits: responses reused without request (no validator, within the TTL)
+            - revalidations: responses reused after a 304 Not Modified
+            - misses: responses downloaded
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "revalidations": self.revalidations,
+                "misses": self.misses,
+            }
+
+    def reset(self):
+        """Drops all cached responses and resets the counters"""
+        with self._lock:
+            self._entries = {}
+            self.hits = self.revalidations = self.misses = 0
+
+
+HTTP_CACHE = HttpCache()
+
+
+def invalidate_cache(pattern=None, session_key=None):
+    """Drops the cached responses whose path matches the regular expression"""
+    return HTTP_CACHE.invalidate(pattern, session_key)
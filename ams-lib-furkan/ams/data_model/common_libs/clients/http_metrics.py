@@ -0,0 +1,398 @@
+"""
+Module to measure the HTTP calls sent to AMS.
+
+Every call is aggregated as it is sent, per endpoint (method and path template) and per
+Robot keyword: count, errors, bytes, total and maximum latency, and a bounded sample of the
+latencies for the p50/p95/p99 percentiles, so the memory used does not grow with the number
+of calls. The path template is the one given by the caller, else the registered endpoint
+template the path matches (``PATH_TEMPLATES``: the end points of the session and the SDS
+services), else the path with its segments containing digits replaced by ``{id}``.
+At the end of the execution the aggregates are written as JSON and CSV reports, to find the
+endpoints and keywords which dominate the run time.
+
+The reports are written to the ``AMS_HTTP_METRICS_DIR`` directory (the Robot output
+directory by default). The ``AMS_HTTP_METRICS=0`` environment variable disables the measures.
+"""
+
+import csv
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+
+# pylint: disable=line-too-long
+
+LOGGER = logging.getLogger(__name__)
+
+REPORT_NAME = "ams_http_metrics"
+
+# path segments kept as they are: words and versions (v1, v2...)
+_KEPT_SEGMENT = re.compile(r"^(v\d+|[A-Za-z_\-.]*)$")
+
+_PLACEHOLDER = re.compile(r"\{[^}/]*\}")
+
+# latencies kept per endpoint and keyword for the percentiles
+MAX_LATENCY_SAMPLES = 1000
+
+_ENDPOINT_FIELDS = [
+    "method",
+    "path",
+    "count",
+    "errors",
+    "error_rate",
+    "p50",
+    "p95",
+    "p99",
+    "max",
+    "total_time",
+    "request_bytes",
+    "response_bytes",
+]
+
+_KEYWORD_FIELDS = ["keyword"] + _ENDPOINT_FIELDS[2:]
+
+
+def is_enabled():
+    """Returns False when the measures are disabled with AMS_HTTP_METRICS=0"""
+    return os.environ.get("AMS_HTTP_METRICS", "1").lower() not in ("0", "false", "no")
+
+
+def template_path(path):
+    """
+    Returns the path with its ids replaced by {id}: segments containing digits other than
+    versions (e.g. /fom/v3/movements/internal-id/123 -> /fom/v3/movements/internal-id/{id}).
+    """
+    path = path.split("?", 1)[0]
+    return "/".join(
+        segment if _KEPT_SEGMENT.match(segment) else "{id}"
+        for segment in path.split("/")
+    )
+
+
+class PathTemplates:
+    """
+    Thread safe registry of the endpoint templates, e.g. /sds/data/v4/stand/{id} or the base
+    paths of the end points of the session (/sds/data/v4/stand).
+
+    A path is measured with, in this order: the template equal to it, the template with
+    placeholders it matches, or the longest base path it starts with followed by ``/`` or
+    ``-``, the rest of the path being the parameters (/sds/data/v4/stand/{id}) but for the
+    fixed segments of the templates (/sds/data/v4/stand/list).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._literals = set()
+        # number of segments -> [(pattern, template)]
+        self._patterns = {}
+        # fixed segments of the templates, e.g. list, kept as is after a base path
+        self._segments = set()
+
+    def register(self, template):
+        """Registers an endpoint template, its query is ignored"""
+        template = template.split("?", 1)[0].rstrip("/") or "/"
+        with self._lock:
+            self._segments.update(
+                segment
+                for segment in template.split("/")
+                if segment and not _PLACEHOLDER.search(segment)
+            )
+            if not _PLACEHOLDER.search(template):
+                self._literals.add(template)
+                return
+            pattern = re.compile(
+                "^"
+                + "[^/]+".join(
+                    re.escape(part) for part in _PLACEHOLDER.split(template)
+                )
+                + "$"
+            )
+            patterns = self._patterns.setdefault(template.count("/"), [])
+            if all(known != template for _pattern, known in patterns):
+                patterns.append((pattern, template))
+
+    def register_end_points(self, end_points):
+        """Registers the paths of a (nested) dict of end points, e.g. the end_points.yml data"""
+        for value in end_points.values():
+            if isinstance(value, dict):
+                self.register_end_points(value)
+            elif isinstance(value, str) and value.startswith("/"):
+                self.register(value)
+
+    def match(self, path):
+        """Returns the template of the path, None if no registered template matches it"""
+        path = path.split("?", 1)[0].rstrip("/") or "/"
+        with self._lock:
+            if path in self._literals:
+                return path
+            for pattern, template in self._patterns.get(path.count("/"), ()):
+                if pattern.match(path):
+                    return template
+            for end in range(len(path) - 1, 0, -1):
+                if path[end] in "/-" and path[:end] in self._literals:
+                    rest = path[end + 1 :]
+                    parameters = "/".join(
+                        segment if segment in self._segments else "{id}"
+                        for segment in rest.split("/")
+                    )
+                    return f"{path[:end]}{path[end]}{parameters}"
+        return None
+
+    def clear(self):
+        """Drops the registered templates"""
+        with self._lock:
+            self._literals = set()
+            self._patterns = {}
+            self._segments = set()
+
+
+PATH_TEMPLATES = PathTemplates()
+
+
+def endpoint_template(path):
+    """Returns the registered template of the path, the path with its ids replaced otherwise"""
+    return PATH_TEMPLATES.match(path) or template_path(path)
+
+
+def percentile(values, fraction):
+    """Returns the nearest rank percentile of the sorted values"""
+    if not values:
+        return None
+    rank = max(math.ceil(fraction * len(values)), 1)
+    return values[rank - 1]
+
+
+class _Aggregate:
+    """Measures of the calls of an endpoint or a keyword"""
+
+    __slots__ = (
+        "count",
+        "errors",
+        "total_time",
+        "max",
+        "request_bytes",
+        "response_bytes",
+        "latencies",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.latencies = []
+
+    def add(self, latency, error, request_bytes, response_bytes, sampler):
+        """Adds a call, its latency replaces a random sample once the samples are full"""
+        self.count += 1
+        self.errors += 1 if error else 0
+        self.total_time += latency
+        self.max = max(self.max, latency)
+        self.request_bytes += request_bytes
+        self.response_bytes += response_bytes
+        if len(self.latencies) < MAX_LATENCY_SAMPLES:
+            self.latencies.append(latency)
+        else:
+            index = sampler.randrange(self.count)
+            if index < MAX_LATENCY_SAMPLES:
+                self.latencies[index] = latency
+
+    def summary(self):
+        """Returns the measures of the report"""
+        latencies = sorted(self.latencies)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / self.count, 4),
+            "p50": round(percentile(latencies, 0.50), 4),
+            "p95": round(percentile(latencies, 0.95), 4),
+            "p99": round(percentile(latencies, 0.99), 4),
+            "max": round(self.max, 4),
+            "total_time": round(self.total_time, 4),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+        }
+
+
+class HttpMetrics:
+    """Thread safe measures of the HTTP calls, with the keyword currently running"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+        self._keyword_calls = {}
+        self._keywords = []
+        self._sampler = random.Random(0)
+
+    def start_keyword(self, name):
+        """Pushes the keyword being run"""
+        self._keywords.append(name)
+
+    def end_keyword(self):
+        """Pops the keyword which ended"""
+        if self._keywords:
+            self._keywords.pop()
+
+    def current_keyword(self):
+        """Returns the keyword being run, None outside of Robot Framework"""
+        return self._keywords[-1] if self._keywords else None
+
+    def record(
+        self,
+        method,
+        path,
+        status,
+        latency,
+        request_bytes=0,
+        response_bytes=0,
+        path_template=None,
+    ):
+        """
+        Records a call, status is None when no response was received.
+        Calls with no response or a status code of 400 or more are errors.
+        """
+        endpoint = ((method or "GET").upper(), path_template or endpoint_template(path))
+        keyword = self.current_keyword() or ""
+        measures = (
+            latency,
+            status is None or status >= 400,
+            request_bytes or 0,
+            response_bytes or 0,
+            self._sampler,
+        )
+        with self._lock:
+            if endpoint not in self._endpoints:
+                self._endpoints[endpoint] = _Aggregate()
+            self._endpoints[endpoint].add(*measures)
+            if keyword not in self._keyword_calls:
+                self._keyword_calls[keyword] = _Aggregate()
+            self._keyword_calls[keyword].add(*measures)
+
+    def report(self):
+        """
+        Returns the calls aggregated per endpoint and per keyword, the slowest first:
+            {"endpoints": [{"method", "path", "count", ...}], "keywords": [{"keyword", "count", ...}]}
+        """
+        with self._lock:
+            endpoints = [
+                {"method": method, "path": path, **aggregate.summary()}
+                for (method, path), aggregate in self._endpoints.items()
+            ]
+            keywords = [
+                {"keyword": keyword, **aggregate.summary()}
+                for keyword, aggregate in self._keyword_calls.items()
+            ]
+        return {
+            "endpoints": sorted(endpoints, key=lambda row: -row["total_time"]),
+            "keywords": sorted(keywords, key=lambda row: -row["total_time"]),
+        }
+
+    def write_report(self, directory, name=REPORT_NAME):
+        """
+        Writes the report as <name>.json, <name>.csv (endpoints) and <name>_keywords.csv.
+        Returns the path of the JSON report, None if no call was recorded.
+        """
+        report = self.report()
+        if not report["endpoints"]:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        json_path = os.path.join(directory, f"{name}.json")
+        with open(json_path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        for rows, fields, suffix in (
+            (report["endpoints"], _ENDPOINT_FIELDS, ""),
+            (report["keywords"], _KEYWORD_FIELDS, "_keywords"),
+        ):
+            with open(
+                os.path.join(directory, f"{name}{suffix}.csv"),
+                "w",
+                encoding="utf-8",
+                newline="",
+            ) as file:
+                writer = csv.DictWriter(file, fieldnames=fields)
+                writer.writeheader()
+                writer.writerows(rows)
+        return json_path
+
+    def reset(self):
+        """Drops the measures"""
+        with self._lock:
+            self._endpoints = {}
+            self._keyword_calls = {}
+
+
+METRICS = HttpMetrics()
+
+
+class HttpMetricsListener:
+    """
+    Robot Framework listener (API version 2) following the running keywords and writing the
+    report when the execution ends.
+
+    The report is written in close(), called once at the end of the execution both for a
+    library listener and a ``--listener``: in a directory or pabot run the library is
+    imported by the child suites and never sees the top level suite.
+    """
+
+    ROBOT_LISTENER_API_VERSION = 2
+
+    def __init__(self, metrics=METRICS):
+        self.metrics = metrics
+        self.directory = None
+
+    def start_suite(self, _name, _attributes):
+        """Measures the calls of the protocols broker, once its module can be imported"""
+        if self.directory is None:
+            # the Robot variables are not available anymore when close() is called
+            self.directory = _report_directory()
+        if is_enabled():
+            # pylint: disable=import-outside-toplevel
+            from ams.data_model.common_libs.clients.ams_rest_client import (
+                instrument_broker,
+            )
+
+            instrument_broker()
+
+    def start_keyword(self, name, _attributes):
+        """Follows the running keyword"""
+        self.metrics.start_keyword(name)
+
+    def end_keyword(self, _name, _attributes):
+        """Follows the running keyword"""
+        self.metrics.end_keyword()
+
+    def close(self):
+        """Writes the report at the end of the execution"""
+        if not is_enabled():
+            return
+        try:
+            json_path = self.metrics.write_report(
+                self.directory or _report_directory()
+            )
+            if json_path is not None:
+                LOGGER.info("HTTP metrics report written to %s", json_path)
+        except OSError as e:
+            LOGGER.error("Unable to write the HTTP metrics report: %s", e)
+
+
+def _report_directory():
+    """
+    Returns the directory of the report, a sub directory per pabot process so the parallel
+    processes do not overwrite each other's report.
+    """
+    # pylint: disable=import-outside-toplevel
+    from robot.libraries.BuiltIn import BuiltIn
+    from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+    directory = get_variable_value("AMS_HTTP_METRICS_DIR") or BuiltIn().get_variable_value(
+        "${OUTPUT DIR}", os.curdir
+    )
+    pabot_index = get_variable_value("PABOTQUEUEINDEX")
+    if pabot_index is not None:
+        directory = os.path.join(directory, f"{REPORT_NAME}_{pabot_index}")
+    return directory
@@ -0,0 +1,92 @@
+"""
+Module to collapse identical calls running at the same time into one.
+
+The first caller of a key runs the call, the callers arriving with the same key while it is in
+flight wait for it and get its result (or its error) instead of running the call again. The
+shared transport uses it for the identical GETs sent concurrently by parallel keywords and
+background threads. The ``AMS_HTTP_SINGLE_FLIGHT=0`` environment variable disables it.
+"""
+
+import logging
+import os
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+
+def is_enabled():
+    """Returns False when the calls are not collapsed, with AMS_HTTP_SINGLE_FLIGHT=0"""
+    return os.environ.get("AMS_HTTP_SINGLE_FLIGHT", "1").lower() not in (
+        "0",
+        "false",
+        "no",
+    )
+
+
+class _Call:
+    """A call in flight, its waiters are notified when it is over"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread safe calls in flight per key, with the number of executed and collapsed calls"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, function, share=None):
+        """
+        Returns the result of function, called once for all the callers of the key arriving
+        while it runs. The waiting callers get share(result) (the result itself by default),
+        e.g. a copy of a mutable result, and the error of the call if it failed.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            LOGGER.debug("Waiting for the identical call in flight %s", key)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return share(call.result) if share is not None else call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def statistics(self):
+        """
+        Returns the counters:
+            - executed: calls executed
+            - coalesced: calls which waited for an identical call in flight instead of running
+        """
+        with self._lock:
+            return {"executed": self.executed, "coalesced": self.coalesced}
+
+    def reset(self):
+        """Resets the counters"""
+        with self._lock:
+            self.executed = self.coalesced = 0
+
+
+SINGLE_FLIGHT = SingleFlight()
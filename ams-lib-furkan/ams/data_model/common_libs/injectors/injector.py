@@ -1,9 +1,20 @@
 """Injector module to handle generic calls"""
 
+import asyncio
 import logging
-import protocols.broker
-from ams.data_model.common_libs.injectors.injector_rest import injector as rest_injector
-
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    get_transport,
+    send_request,
+)
+from ams.data_model.common_libs.injectors.injector_rest import build_rest_details
+from ams.data_model.common_libs.utils.json_stream import (
+    iter_response_items,
+    loads,
+    stream_option,
+)
+from ams.data_model.common_libs.utils.pagination import paginate
 
 # pylint: disable=line-too-long
 
@@ -21,10 +32,16 @@ def _http_call(path, **kwargs):
             - query_params (dict): Dictionary of query parameters to be appended to the request.
             - operation (str): The HTTP operation to perform. Default is "GET".
             - json_response (bool): If the response should be automatically deserialized from Json. Default is True
+            - stream (bool or str): If set, the path of a list in the JSON response (True for the response
+              itself, or keys separated by dots, e.g. "content"). The response is decoded while it is
+              received and an iterator over the items of the list is returned. Default is None.
+            - cache (bool): If the response is reference data, cached and revalidated with a conditional
+              GET (see http_cache). Default is False.
 
     Returns:
         dict or None: The JSON response from the API if the call is successful and returns content,
                       None if the response status code is 204 (No Content).
+        iterator: The items of the list when stream is set.
 
     Raises:
         ValueError: If the response status code is not 200 or 204.
@@ -34,7 +51,11 @@ def _http_call(path, **kwargs):
         Http Call    path=/configuration/admin/rest/v2/configuration/{conf_id}    path_params=${additional_params}
     """
     kwargs["path"] = f"{path}"
-    response = protocols.broker.injector(kwargs, "defaultKey", rest_injector)
+    stream = stream_option(kwargs.get("stream"))
+    rest_details = build_rest_details(kwargs)
+    if stream:
+        rest_details["stream"] = True
+    response = send_request(rest_details, "defaultKey")
 
     LOGGER.debug(
         "HTTP Call: %s, Response: %s.",
@@ -43,15 +64,19 @@ def _http_call(path, **kwargs):
     )
 
     if response.status_code != 200 and response.status_code != 204:
+        response.close()
         raise ValueError(
             f"Call to {kwargs['path']} failed with status {response.status_code}"
         )
 
     if response.status_code == 204:
+        response.close()
         return None
 
+    if stream:
+        return iter_response_items(response, stream)
     if kwargs.get("json_response", True):
-        return response.json()
+        return loads(response.content)
     else:
         return response.text
 
@@ -82,6 +107,8 @@ def _http_call_and_check(path, field="generalProcessingStatus", value="OK", **kw
     Usage:
         ${response}=    Fom Http Call    /fom/rest-services/v3/movements/internal-id/{id}    path_params=${additional_params}
     """
+    if stream_option(kwargs.get("stream")):
+        raise ValueError(f"Call to {path} cannot be checked when its response is streamed")
     response_json = _http_call(path, **kwargs)
     if response_json is not None and response_json.get(field) != value:
         raise ValueError(
@@ -89,3 +116,107 @@ def _http_call_and_check(path, field="generalProcessingStatus", value="OK", **kw
             f"errors={response_json.get('generalErrorInformation')}"
         )
     return response_json
+
+
+def _http_call_pages(path, paging, prefetch=False, check=False, **kwargs):
+    """
+    Executes a HTTP call for every page of a paged list and returns an iterator over the items of all the pages.
+
+    The paging parameters of every page are added to the query parameters, the next page is
+    requested when the items of the current page are consumed (see pagination).
+
+    Args:
+        path (str): The endpoint path for the API call.
+        paging (_Paging): The paging scheme, e.g. PageNumberPaging(items_path="content").
+        prefetch (bool): If the next page should be requested in the background while the items
+            of the current page are consumed. Default is False.
+        check (bool): If every page should be checked with _http_call_and_check. Default is False.
+        **kwargs: The options of _http_call (path_params, query_params, operation...).
+
+    Returns:
+        iterator: The items of all the pages.
+
+    Raises:
+        ValueError: If the response status code of a page is not 200 or 204,
+                    or if generalProcessingStatus of a page is not "OK" when check is True.
+
+    Usage:
+        ${visits}=    Http Call Pages    /fom/rest-services/v4/visits/searches    ${paging}    operation=POST
+    """
+    if stream_option(kwargs.get("stream")):
+        raise ValueError(f"Call to {path} cannot be paged when its response is streamed")
+    call_function = _http_call_and_check if check else _http_call
+    query_params = kwargs.pop("query_params", None) or {}
+
+    def fetch(params):
+        return call_function(path, query_params={**query_params, **params}, **kwargs)
+
+    return paginate(fetch, paging, prefetch=prefetch)
+
+
+def _http_call_spec(spec):
+    """
+    Returns the path and the keyword arguments of a call of _http_call_many.
+    A spec is a path, a (path, kwargs) couple or a dict with the path and the kwargs.
+    """
+    if isinstance(spec, str):
+        return spec, {}
+    if isinstance(spec, dict):
+        kwargs = dict(spec)
+        return kwargs.pop("path"), kwargs
+    path, kwargs = spec
+    return path, dict(kwargs or {})
+
+
+async def _gather_http_calls(calls, concurrency):
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="ams-http"
+    ) as executor:
+        return await asyncio.gather(
+            *(loop.run_in_executor(executor, call) for call in calls),
+            return_exceptions=True,
+        )
+
+
+def _http_call_many(specs, concurrency=None, check=False, return_exceptions=False):
+    """
+    Executes independent HTTP calls concurrently and returns their results in order.
+
+    Every call is executed as _http_call (or _http_call_and_check when check is True) on the
+    pooled transport, so it uses the security headers and cookies of the session and has the
+    same status code and generalProcessingStatus checks.
+
+    Args:
+        specs (list): The calls, each one is a path, a (path, kwargs) couple or a dict with
+            the path and the kwargs of _http_call (e.g. {"path": "/x/{id}", "path_params": {"id": 1}}).
+        concurrency (int): Maximum number of calls in flight. Default is the pool size of the transport.
+        check (bool): If the responses should be checked with _http_call_and_check. Default is False.
+        return_exceptions (bool): If the exception of a failed call should be returned in its
+            place instead of being raised. Default is False.
+
+    Returns:
+        list: The result of every call, in the order of the specs.
+
+    Raises:
+        ValueError: The error of the first failed call, once all the calls are done.
+
+    Usage:
+        ${results}=    Http Call Many    ${specs}    concurrency=5
+    """
+    call_function = _http_call_and_check if check else _http_call
+    calls = []
+    for spec in specs:
+        path, kwargs = _http_call_spec(spec)
+        calls.append(partial(call_function, path, **kwargs))
+    if not calls:
+        return []
+
+    concurrency = max(int(concurrency or get_transport().pool_size), 1)
+    results = asyncio.run(_gather_http_calls(calls, min(concurrency, len(calls))))
+
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
@@ -12,8 +12,11 @@ LOGGER = logging.getLogger(__name__)
 # pylint: disable=unused-argument, unused-variable, protected-access
 
 
-@RestInjector
-def injector(kwargs, session_key):
+def build_rest_details(kwargs, session_key="defaultKey"):
+    """
+    Builds the REST details of a generic call
+    """
+    path_template = kwargs["path"]
     path_params = kwargs.get("path_params", {})
     if path_params:
         for key, value in path_params.items():
@@ -30,7 +33,17 @@ def injector(kwargs, session_key):
         "data": kwargs.get("payload", None),
         "verify": False,
     }
+    if path_params:
+        # measured per endpoint with the placeholders of the path
+        rest_details["path_template"] = path_template
+    if kwargs.get("cache"):
+        rest_details["cache"] = True
 
     LOGGER.debug("REST Details: %s", rest_details)
 
     return rest_details
+
+
+@RestInjector
+def injector(kwargs, session_key):
+    return build_rest_details(kwargs, session_key)
@@ -1,8 +1,14 @@
 """This module provides a class `PayloadGenerator` to generate payloads for
-requests using Jinja2 templates."""
+requests using Jinja2 templates.
+
+Compiled templates are kept in a process wide LRU cache keyed by the template path and its
+modification time, so a template is read and compiled once and recompiled only when it changes.
+"""
 
 import os
 import logging
+import threading
+from collections import OrderedDict
 from jinja2 import Environment
 from ams.data_model.common_libs.utils.airport_data_generator import (
     GenerateAirportData as GaD,
@@ -10,6 +16,111 @@ from ams.data_model.common_libs.utils.airport_data_generator import (
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_TEMPLATE_CACHE_SIZE = 256
+
+TEMPLATE_EXTENSIONS = (".jinja", ".j2")
+
+# shared by all the templates, the template functions are passed when rendering
+_ENVIRONMENT = Environment(trim_blocks=True, lstrip_blocks=True)
+
+
+class TemplateCache:
+    """
+    Thread safe LRU cache of compiled templates keyed by (template path, modification time).
+    """
+
+    def __init__(self, maxsize=DEFAULT_TEMPLATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._templates = OrderedDict()
+
+    def get(self, key):
+        """Returns the compiled template for the key, None if it is not cached"""
+        with self._lock:
+            template = self._templates.get(key)
+            if template is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._templates.move_to_end(key)
+            return template
+
+    def put(self, key, template):
+        """Caches the compiled template, evicting the least recently used ones"""
+        with self._lock:
+            self._templates[key] = template
+            self._templates.move_to_end(key)
+            while len(self._templates) > self.maxsize:
+                self._templates.popitem(last=False)
+
+    def clear(self):
+        """Removes all the cached templates"""
+        with self._lock:
+            self._templates.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._templates)
+
+
+TEMPLATE_CACHE = TemplateCache(
+    int(os.environ.get("AMS_TEMPLATE_CACHE_SIZE", DEFAULT_TEMPLATE_CACHE_SIZE))
+)
+
+
+def _template_paths(_filename, _current_file):
+    directory = os.path.dirname(os.path.abspath(_current_file))
+    return [
+        os.path.join(directory, "template_files", _filename),
+        os.path.join(directory, _filename),
+    ]
+
+
+def _cache_key(path):
+    """Returns the cache key of the template path, None if the file does not exist"""
+    try:
+        return path, os.stat(path).st_mtime_ns
+    except (OSError, TypeError):
+        return None
+
+
+def compile_template(source):
+    """Compiles the template source with the shared Jinja2 environment"""
+    return _ENVIRONMENT.from_string(source)
+
+
+def precompile_templates(root=None):
+    """
+    Compiles all the templates found under the root folder (the ams package by default)
+    and stores them in the template cache.
+
+    Returns:
+        int: The number of compiled templates.
+    """
+    root = root or os.path.dirname(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    )
+    count = 0
+    for directory, _subdirectories, files in os.walk(root):
+        for file in files:
+            if not file.endswith(TEMPLATE_EXTENSIONS):
+                continue
+            path = os.path.join(directory, file)
+            key = _cache_key(path)
+            try:
+                with open(path, "r", encoding="utf-8") as template_file:
+                    TEMPLATE_CACHE.put(
+                        key, compile_template(template_file.read().strip())
+                    )
+                count += 1
+            except Exception as e:
+                LOGGER.warning("Unable to precompile template %s: %s", path, e)
+    LOGGER.debug("%s templates precompiled from %s", count, root)
+    return count
+
 
 class PayloadGenerator:
     """
@@ -50,10 +161,7 @@ class PayloadGenerator:
         Raises:
             FileNotFoundError: If the template file does not exist at the specified path.
         """
-        paths = [
-            os.path.join(os.path.dirname(_current_file), "template_files", _filename),
-            os.path.join(os.path.dirname(_current_file), _filename),
-        ]
+        paths = _template_paths(_filename, _current_file)
 
         path = next((p for p in paths if os.path.isfile(p)), None)
         if not os.path.isfile(path):
@@ -61,25 +169,51 @@ class PayloadGenerator:
         with open(path, "r", encoding="utf-8") as template_file:
             return template_file.read().strip()
 
+    def get_template(self):
+        """
+        Returns the compiled template, reading and compiling it only if it is not cached yet.
+        """
+        key = next(
+            (
+                key
+                for key in map(
+                    _cache_key, _template_paths(self.filename, self.current_file)
+                )
+                if key is not None
+            ),
+            None,
+        )
+        template = TEMPLATE_CACHE.get(key) if key is not None else None
+        if template is None:
+            template = compile_template(
+                self.read_template(self.filename, self.current_file)
+            )
+            if key is not None:
+                TEMPLATE_CACHE.put(key, template)
+        return template
+
     def construct_generic_payload(self):
         """
         Constructs a generic payload by rendering a Jinja2 template with the provided input data.
         This method reads a template file, processes it using Jinja2 with the given input data,
         and returns the generated payload as a string. The payload is formatted to replace
         single quotes with double quotes.
+        The compiled template is taken from the template cache when the file did not change.
         Returns:
             str: The generated payload string.
         """
-        jinja_env = Environment(trim_blocks=True, lstrip_blocks=True)
-        jinja_env.globals.update(self.function_dict)
-        template_file_data = self.read_template(self.filename, self.current_file)
-        template = jinja_env.from_string(template_file_data)
+        template = self.get_template()
         LOGGER.debug(
             "Attempting to construct payload from template using input data : %s",
             self.input_data,
         )
         request_str = "".join(
-            map(str.strip, template.render(data=self.input_data).splitlines())
+            map(
+                str.strip,
+                template.render(
+                    data=self.input_data, **self.function_dict
+                ).splitlines(),
+            )
         )
         LOGGER.debug("Generated payload is :%s", request_str)
         request_str = request_str.replace("'", '"')
@@ -3,23 +3,122 @@
 import json
 import logging
 import os
+import threading
 from json import JSONDecodeError
-from jsonschema import validate, ValidationError
+from jsonschema import validate, validators, ValidationError
+from jsonschema.exceptions import best_match
 import jmespath
 
 # pylint: disable=line-too-long
 
 LOGGER = logging.getLogger()
 
+# keywords of the root schema kept when validating only some fields, so references still resolve
+_SCHEMA_ROOT_KEYWORDS = ("$schema", "$id", "id", "$defs", "definitions", "type")
 
-def load_and_validate_response_schema(current_file, schema_name, response):
+
+class SchemaValidatorRegistry:
+    """
+    Thread safe registry of compiled JSON schema validators keyed by schema path.
+
+    A schema file is loaded, checked and compiled (with its format checker) once per process.
+    It is reloaded only if the file is modified.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._validators = {}
+
+    def _load(self, schema_file_path):
+        """Returns the schema of the file, reloading it if the file was modified"""
+        stat = os.stat(schema_file_path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._schemas.get(schema_file_path)
+        if cached is None or cached[0] != version:
+            with open(schema_file_path, "r", encoding="utf-8") as schema_file:
+                schema = json.load(schema_file)
+            cached = (version, schema)
+            self._schemas[schema_file_path] = cached
+            # validators of the previous version of the schema are obsolete
+            for key in [key for key in self._validators if key[0] == schema_file_path]:
+                del self._validators[key]
+        return cached[1]
+
+    def get_validator(self, schema_file_path, fields=None):
+        """
+        Returns the compiled validator of the schema file.
+
+        Args:
+            schema_file_path (str): The path of the schema file.
+            fields (list, optional): Top level properties to validate, all the schema by default.
+        """
+        fields = tuple(fields) if fields else None
+        with self._lock:
+            schema = self._load(schema_file_path)
+            key = (schema_file_path, fields)
+            validator = self._validators.get(key)
+            if validator is None:
+                if fields is not None:
+                    schema = _restrict_schema(schema, fields)
+                validator_class = validators.validator_for(schema)
+                validator_class.check_schema(schema)
+                validator = validator_class(
+                    schema, format_checker=validator_class.FORMAT_CHECKER
+                )
+                self._validators[key] = validator
+            return validator
+
+    def clear(self):
+        """Removes all the loaded schemas and validators"""
+        with self._lock:
+            self._schemas.clear()
+            self._validators.clear()
+
+
+SCHEMA_VALIDATORS = SchemaValidatorRegistry()
+
+
+def _restrict_schema(schema, fields):
+    """
+    Returns the schema validating only the given top level properties of the response.
+    """
+    properties = schema.get("properties", {})
+    unknown_fields = [field for field in fields if field not in properties]
+    if unknown_fields:
+        raise ValueError(f"Fields {unknown_fields} are not defined in the schema")
+    restricted = {
+        keyword: schema[keyword]
+        for keyword in _SCHEMA_ROOT_KEYWORDS
+        if keyword in schema
+    }
+    restricted["properties"] = {field: properties[field] for field in fields}
+    restricted["required"] = [
+        field for field in schema.get("required", []) if field in fields
+    ]
+    return restricted
+
+
+def _find_schema_file(current_file, schema_name):
+    schema_file_paths = [
+        os.path.join(os.path.dirname(current_file), schema_name),
+        os.path.join(os.path.dirname(current_file), "schemas", schema_name),
+    ]
+    return next((p for p in schema_file_paths if os.path.isfile(p)), None)
+
+
+def load_and_validate_response_schema(current_file, schema_name, response, fields=None):
     """
     Load a JSON schema from a file and validate a given response against it.
 
+    The compiled validator of the schema is cached, the schema file is read only once
+    (or again when it is modified).
+
     Args:
         current_file (str): The path to the current file, used to locate the schema file.
         schema_name (str): The name of the schema file to load.
         response (dict): The JSON response to validate against the loaded schema.
+        fields (list, optional): Only validate these top level properties of the response.
 
     Raises:
         AssertionError: If the response does not conform to the loaded schema, an AssertionError
@@ -28,23 +127,17 @@ def load_and_validate_response_schema(current_file, schema_name, response):
     Logs:
         Logs a message indicating whether the response is valid according to the loaded schema.
     """
-    schema_file_paths = [
-        os.path.join(os.path.dirname(current_file), schema_name),
-        os.path.join(os.path.dirname(current_file), "schemas", schema_name),
-    ]
-    schema_file_path = next((p for p in schema_file_paths if os.path.isfile(p)), None)
+    schema_file_path = _find_schema_file(current_file, schema_name)
+    if schema_file_path is None:
+        raise FileNotFoundError(f"Schema {schema_name} not found for {current_file}")
 
-    with open(schema_file_path, "r", encoding="utf-8") as schema_file:
-        generated_schema = json.load(schema_file)
-    try:
-        validate(instance=response, schema=generated_schema)
-        LOGGER.info(
-            "The response is valid according to loaded schema for %s", schema_name
-        )
-    except ValidationError as e:
+    validator = SCHEMA_VALIDATORS.get_validator(schema_file_path, fields)
+    error = best_match(validator.iter_errors(response))
+    if error is not None:
         raise AssertionError(
-            "error found in path: " + e.json_path + "\n" + e.message
-        ) from e
+            "error found in path: " + error.json_path + "\n" + error.message
+        )
+    LOGGER.info("The response is valid according to loaded schema for %s", schema_name)
 
 
 def _validate_json_response_schema(response, expected_schema):
@@ -0,0 +1,166 @@
+"""
+Module to wait for eventually consistent data with exponential backoff.
+
+A wait calls an optional cheap probe until it succeeds, then the (possibly expensive) fetch,
+until the fetch succeeds or the deadline is reached. The delay between two attempts grows
+exponentially up to a maximum, with random jitter so parallel tests do not poll in step.
+The number of attempts and the time of every wait are recorded per name, so the timeouts of
+the suites can be tuned on the measured propagation times.
+"""
+
+import logging
+import random
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_INITIAL_INTERVAL = 0.5
+DEFAULT_MAX_INTERVAL = 5
+DEFAULT_MULTIPLIER = 2
+DEFAULT_JITTER = 0.5
+
+
+class BackoffPolicy:
+    """
+    Delays between the attempts of a wait: initial_interval * multiplier ** attempt, capped at
+    max_interval, minus a random part of at most jitter (a fraction) of the delay.
+    """
+
+    def __init__(
+        self,
+        initial_interval=DEFAULT_INITIAL_INTERVAL,
+        max_interval=DEFAULT_MAX_INTERVAL,
+        multiplier=DEFAULT_MULTIPLIER,
+        jitter=DEFAULT_JITTER,
+    ):
+        self.initial_interval = float(initial_interval)
+        self.max_interval = float(max_interval)
+        self.multiplier = float(multiplier)
+        self.jitter = min(max(float(jitter), 0.0), 1.0)
+
+    def delay(self, attempt, rng=random):
+        """Returns the delay in seconds after the given attempt (starting at 0)"""
+        delay = min(
+            self.initial_interval * self.multiplier**attempt, self.max_interval
+        )
+        return delay * (1 - self.jitter * rng.random())
+
+
+class WaitStatistics:
+    """Thread safe attempts and durations of the waits per name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waits = {}
+
+    def record(self, name, attempts, elapsed, succeeded):
+        """Records a wait which is over"""
+        with self._lock:
+            wait = self._waits.setdefault(
+                name,
+                {
+                    "waits": 0,
+                    "failures": 0,
+                    "attempts": 0,
+                    "max_attempts": 0,
+                    "total_time": 0.0,
+                    "max_time": 0.0,
+                },
+            )
+            wait["waits"] += 1
+            wait["failures"] += 0 if succeeded else 1
+            wait["attempts"] += attempts
+            wait["max_attempts"] = max(wait["max_attempts"], attempts)
+            wait["total_time"] += elapsed
+            wait["max_time"] = max(wait["max_time"], elapsed)
+
+    def snapshot(self):
+        """
+        Returns the counters per name:
+            - waits: number of waits
+            - failures: number of waits which reached their deadline
+            - attempts / max_attempts: total and maximum number of fetch attempts
+            - total_time / max_time / average_time: durations of the waits in seconds
+        """
+        with self._lock:
+            return {
+                name: {**wait, "average_time": wait["total_time"] / wait["waits"]}
+                for name, wait in self._waits.items()
+            }
+
+    def reset(self):
+        """Resets all counters"""
+        with self._lock:
+            self._waits = {}
+
+
+STATISTICS = WaitStatistics()
+
+
+def wait_until_succeeds(
+    fetch,
+    probe=None,
+    timeout=DEFAULT_TIMEOUT,
+    policy=None,
+    name=None,
+    retry_error=None,
+    sleep=time.sleep,
+    clock=time.monotonic,
+):
+    """
+    Calls fetch until it returns without raising, and returns its result.
+
+    Args:
+        fetch (callable): The call to retry, it fails by raising an exception.
+        probe (callable): Optional cheap call, fetch is only called once probe returns a true
+            value without raising.
+        timeout (float): Deadline of the wait in seconds. An attempt started before the
+            deadline is never interrupted.
+        policy (BackoffPolicy): Delays between the attempts. Default is BackoffPolicy().
+        name (str): Name of the wait in the statistics. Default is the name of fetch.
+        retry_error (callable): Optional predicate, an error for which it returns False is
+            raised at once instead of being retried.
+
+    Raises:
+        AssertionError: If fetch did not succeed before the deadline, chained to the last error.
+    """
+    policy = policy or BackoffPolicy()
+    name = name or getattr(fetch, "__name__", str(fetch))
+    start = clock()
+    deadline = start + float(timeout)
+    attempt = 0
+    fetches = 0
+    last_error = None
+    while True:
+        try:
+            if probe is None or probe():
+                fetches += 1
+                result = fetch()
+                elapsed = clock() - start
+                STATISTICS.record(name, fetches, elapsed, True)
+                LOGGER.info(
+                    "%s succeeded after %s attempt(s) in %.2fs", name, fetches, elapsed
+                )
+                return result
+            last_error = None
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            if retry_error is not None and not retry_error(e):
+                STATISTICS.record(name, fetches, clock() - start, False)
+                raise
+            last_error = e
+
+        remaining = deadline - clock()
+        if remaining <= 0:
+            break
+        # the last attempt is made at the deadline
+        sleep(min(policy.delay(attempt), remaining))
+        attempt += 1
+
+    elapsed = clock() - start
+    STATISTICS.record(name, fetches, elapsed, False)
+    reason = f": {last_error}" if last_error is not None else ", the probe did not succeed"
+    raise AssertionError(
+        f"{name} did not succeed within {timeout}s after {fetches} attempt(s){reason}"
+    ) from last_error
@@ -0,0 +1,198 @@
+"""
+Module to keep reference data entities in memory, indexed by id and codes.
+
+The entities of a type are loaded at once (e.g. from a SDS list) and indexed on their id,
+IATA, ICAO, code, name and external id, read at the top level of the entity and in its
+periods. The lookups are then answered without request until the time to live of the type
+is over (``AMS_SDS_STORE_TTL`` seconds, default 300). The keywords saving and deleting
+entities update the loaded entities in place.
+
+``AMS_SDS_STORE`` sets the scope of the store: ``session`` (default) drops it when a new
+AMS session is opened, ``process`` keeps it for the whole run, ``0`` disables it.
+"""
+
+import logging
+import threading
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TTL = 300
+
+SESSION_SCOPE = "session"
+PROCESS_SCOPE = "process"
+
+# index -> fields of the entity (or of its periods) holding the value
+INDEXED_FIELDS = {
+    "id": ("id",),
+    "iata": ("iata", "iataCode"),
+    "icao": ("icao", "icaoCode"),
+    "code": ("code",),
+    "name": ("name",),
+    "external_id": ("externalId",),
+}
+
+
+def store_scope():
+    """Returns the scope of the store: session, process, or None when it is disabled"""
+    # pylint: disable=import-outside-toplevel
+    from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+    scope = str(get_variable_value("AMS_SDS_STORE", SESSION_SCOPE)).lower()
+    if scope in ("0", "false", "no", "off"):
+        return None
+    return PROCESS_SCOPE if scope == PROCESS_SCOPE else SESSION_SCOPE
+
+
+def index_values(entity):
+    """Yields the (index, value) couples of an entity, from its fields and its periods"""
+    if not isinstance(entity, dict):
+        return
+    sources = [entity] + [
+        period for period in entity.get("periods") or [] if isinstance(period, dict)
+    ]
+    for index, fields in INDEXED_FIELDS.items():
+        for source in sources:
+            for field in fields:
+                value = source.get(field)
+                if value not in (None, ""):
+                    yield index, str(value)
+
+
+class _Entities:
+    """Entities of a type with their indexes"""
+
+    def __init__(self, entities, loaded_at):
+        self.loaded_at = loaded_at
+        self.by_id = {}
+        self.indexes = {}
+        for entity in entities:
+            self.put(entity)
+
+    def put(self, entity):
+        """Adds or replaces an entity"""
+        entity_id = entity.get("id") if isinstance(entity, dict) else None
+        if entity_id is None:
+            return
+        self.remove(entity_id)
+        self.by_id[str(entity_id)] = entity
+        for index, value in index_values(entity):
+            self.indexes.setdefault(index, {}).setdefault(value, set()).add(
+                str(entity_id)
+            )
+
+    def remove(self, entity_id):
+        """Removes an entity, returns True if it was loaded"""
+        entity = self.by_id.pop(str(entity_id), None)
+        if entity is None:
+            return False
+        for index, value in index_values(entity):
+            ids = self.indexes.get(index, {}).get(value)
+            if ids is not None:
+                ids.discard(str(entity_id))
+        return True
+
+    def find(self, criteria):
+        """Returns the entities matching all the criteria (index=value)"""
+        ids = None
+        for index, value in criteria.items():
+            matching = self.indexes.get(index, {}).get(str(value), set())
+            ids = set(matching) if ids is None else ids & matching
+        if ids is None:
+            return list(self.by_id.values())
+        return [self.by_id[entity_id] for entity_id in sorted(ids)]
+
+
+class EntityStore:
+    """Thread safe entities per key (e.g. entity type, version and customer)"""
+
+    def __init__(self, ttl=None, clock=time.monotonic):
+        self._ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entities = {}
+        self.hits = 0
+        self.loads = 0
+
+    @property
+    def ttl(self):
+        """Seconds the loaded entities are used, AMS_SDS_STORE_TTL by default"""
+        if self._ttl is not None:
+            return self._ttl
+        # pylint: disable=import-outside-toplevel
+        from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+        return float(get_variable_value("AMS_SDS_STORE_TTL", DEFAULT_TTL))
+
+    def _loaded(self, key):
+        entities = self._entities.get(key)
+        if entities is not None and self.clock() - entities.loaded_at >= self.ttl:
+            del self._entities[key]
+            entities = None
+        return entities
+
+    def find(self, key, load, **criteria):
+        """
+        Returns the entities of the key matching the criteria (index=value, e.g. iata="ZZ").
+        The entities are loaded with load() first when they are not loaded or expired.
+        """
+        with self._lock:
+            entities = self._loaded(key)
+            if entities is not None:
+                self.hits += 1
+                return entities.find(criteria)
+        loaded = _Entities(load() or [], self.clock())
+        with self._lock:
+            self._entities[key] = loaded
+            self.loads += 1
+        LOGGER.debug("%s entities loaded for %s", len(loaded.by_id), key)
+        return loaded.find(criteria)
+
+    def put(self, key, entity):
+        """Adds or replaces the entity in the loaded entities of the key"""
+        with self._lock:
+            entities = self._loaded(key)
+            if entities is not None:
+                entities.put(entity)
+
+    def remove(self, matches, entity_id):
+        """Removes the entity from the loaded entities of the keys for which matches(key) is True"""
+        with self._lock:
+            for key, entities in self._entities.items():
+                if matches(key):
+                    entities.remove(entity_id)
+
+    def invalidate(self, matches=None):
+        """Drops the entities of the keys for which matches(key) is True (all by default)"""
+        with self._lock:
+            keys = [key for key in self._entities if matches is None or matches(key)]
+            for key in keys:
+                del self._entities[key]
+        return len(keys)
+
+    def statistics(self):
+        """
+        Returns the counters of the store:
+            - keys: number of loaded entity lists
+            - entities: number of loaded entities
+            - hits: lookups answered without request
+            - loads: entity lists loaded
+        """
+        with self._lock:
+            return {
+                "keys": len(self._entities),
+                "entities": sum(
+                    len(entities.by_id) for entities in self._entities.values()
+                ),
+                "hits": self.hits,
+                "loads": self.loads,
+            }
+
+    def reset(self):
+        """Drops all the entities and resets the counters"""
+        with self._lock:
+            self._entities = {}
+            self.hits = self.loads = 0
+
+
+SDS_STORE = EntityStore()
@@ -297,6 +297,116 @@ def generate_json_to_jinja_template(data):
     return formatted_template
 
 
+class SettingsIndex:
+    """
+    Index of the settings of a configuration loaded in the context data.
+
+    Settings are indexed by (applicationName, parameterName) and by applicationName, the
+    first setting found in the configuration wins as with a linear search. Children of a
+    setting are indexed by criteria the first time the setting is searched by criteria.
+    """
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        self.settings = {}
+        self.applications = {}
+        self.children_by_name = {}
+        self._criteria = {}
+        for setting in configuration.get("settings", []):
+            application_name = setting.get("applicationName")
+            self.settings.setdefault(
+                (application_name, setting.get("parameterName")), setting
+            )
+            if application_name not in self.applications:
+                self.applications[application_name] = setting
+                children = {}
+                for child in setting.get("children", []):
+                    children.setdefault(child.get("parameterName"), child)
+                self.children_by_name[application_name] = children
+
+    def find_setting(self, param_name, application_name):
+        """Returns the setting of the application, None if not found"""
+        return self.settings.get((application_name, param_name))
+
+    def find_application_setting(self, application_name):
+        """Returns the first setting of the application, None if not found"""
+        return self.applications.get(application_name)
+
+    def find_child(self, application_name, name):
+        """Returns the child of the first setting of the application, None if not found"""
+        return self.children_by_name.get(application_name, {}).get(name)
+
+    def find_by_criteria(self, setting, criteria):
+        """
+        Returns the setting or the first of its descendants with exactly the given criteria.
+        """
+        criteria_key = _criteria_key(criteria)
+        if criteria_key is None:
+            return _find_in_children(setting, criteria)
+        by_criteria = self._criteria.get(id(setting))
+        if by_criteria is None:
+            by_criteria = {}
+            stack = [setting]
+            while stack:
+                current = stack.pop()
+                current_key = _criteria_key(current.get("criteria"))
+                if current_key is not None:
+                    by_criteria.setdefault(current_key, current)
+                stack.extend(reversed(current.get("children", [])))
+            self._criteria[id(setting)] = by_criteria
+        return by_criteria.get(criteria_key)
+
+
+def _criteria_key(criteria):
+    """Returns a hashable key of the criteria, None if it cannot be serialized"""
+    try:
+        return json.dumps(criteria, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+
+def _find_in_children(setting, criteria):
+    if setting.get("criteria") == criteria:
+        return setting
+    for child in setting.get("children", []):
+        result = _find_in_children(child, criteria)
+        if result:
+            return result
+    return None
+
+
+# context key of the configuration -> index of the configuration
+_SETTINGS_INDEXES = {}
+
+
+def get_settings_index(context_key="active_configuration"):
+    """
+    Returns the index of the configuration stored in the context data under context_key.
+
+    The index is built on first use and rebuilt when another configuration is loaded in the
+    context data or after invalidate_settings_index.
+    """
+    context_data = session_manager.sessions._get_session_context_data()
+    configuration = context_data.get(context_key) or {}
+    index = _SETTINGS_INDEXES.get(context_key)
+    if index is None or index.configuration is not configuration:
+        index = SettingsIndex(configuration)
+        _SETTINGS_INDEXES[context_key] = index
+        LOGGER.debug("Indexed %s settings of %s", len(index.settings), context_key)
+    return index
+
+
+def invalidate_settings_index(context_key=None):
+    """
+    Drops the index of the configuration stored under context_key (all indexes by default),
+    to be called when the configuration is changed.
+    """
+    if context_key is None:
+        _SETTINGS_INDEXES.clear()
+    else:
+        _SETTINGS_INDEXES.pop(context_key, None)
+
+
 def find_matching_setting(param_name, application_name, skip_when_not_found=True):
     """
     Finds a setting in the settings list from the active configuration
@@ -313,22 +423,8 @@ def find_matching_setting(param_name, application_name, skip_when_not_found=True
         dict: The matching setting if found, otherwise test exection is interrupted.
     """
 
-    # Retrieve the active configuration from context_data
-    context_data = session_manager.sessions._get_session_context_data()
-    active_configuration = context_data.get("active_configuration", {})
-
-    # Get the list of settings
-    settings = active_configuration.get("settings", [])
-
-    matching_setting = next(
-        (
-            setting
-            for setting in settings
-            if setting.get("parameterName") == param_name
-            and setting.get("applicationName") == application_name
-        ),
-        None,
-    )
+    # Look up the setting in the index of the active configuration
+    matching_setting = get_settings_index().find_setting(param_name, application_name)
 
     if not matching_setting:
         if skip_when_not_found:
@@ -471,23 +567,9 @@ def find_matching_setting_with_criteria(
         except json.JSONDecodeError:
             LOGGER.debug("Input criteria is not a valid JSON string: %s", criteria)
 
-    # Retrieve the active configuration from context_data
-    context_data = session_manager.sessions._get_session_context_data()
-    active_configuration = context_data.get("active_configuration", {})
-
-    # Get the list of settings
-    settings = active_configuration.get("settings", [])
-
-    # Find the top-level matching setting
-    matching_setting = next(
-        (
-            setting
-            for setting in settings
-            if setting.get("parameterName") == param_name
-            and setting.get("applicationName") == application_name
-        ),
-        None,
-    )
+    # Find the top-level matching setting in the index of the active configuration
+    settings_index = get_settings_index()
+    matching_setting = settings_index.find_setting(param_name, application_name)
 
     if not matching_setting:
         if skip_when_not_found:
@@ -496,18 +578,8 @@ def find_matching_setting_with_criteria(
             )
         return None
 
-    # Drill down into children to find the setting with matching criteria
-    def find_in_children(setting, criteria):
-        if setting.get("criteria") == criteria:
-            return setting
-        for child in setting.get("children", []):
-            result = find_in_children(child, criteria)
-            if result:
-                return result
-        return None
-
     # At this point, matching_setting is guaranteed to be found and we can begin to evaluate the criteria
-    result = find_in_children(matching_setting, criteria)
+    result = settings_index.find_by_criteria(matching_setting, criteria)
     if not result:
         if skip_when_not_found:
             skip(
@@ -534,22 +606,9 @@ def find_matching_toggle(toggle_name, application_name, skip_when_not_found=True
         dict: The matching toggle if found, otherwise test execution is interrupted.
     """
 
-    # Retrieve the toggles configuration from context_data
-    context_data = session_manager.sessions._get_session_context_data()
-    toggles_configuration = context_data.get("toggles_configuration", {})
-
-    # Get the list of settings
-    settings = toggles_configuration.get("settings", [])
-
-    # Find the matching setting by application_name
-    matching_setting = next(
-        (
-            setting
-            for setting in settings
-            if setting.get("applicationName") == application_name
-        ),
-        None,
-    )
+    # Find the matching setting by application_name in the index of the toggles configuration
+    settings_index = get_settings_index("toggles_configuration")
+    matching_setting = settings_index.find_application_setting(application_name)
 
     if not matching_setting:
         if skip_when_not_found:
@@ -559,14 +618,7 @@ def find_matching_toggle(toggle_name, application_name, skip_when_not_found=True
         return None
 
     # Find the toggle in the children of the matching setting
-    matching_toggle = next(
-        (
-            child
-            for child in matching_setting.get("children", [])
-            if child.get("parameterName") == toggle_name
-        ),
-        None,
-    )
+    matching_toggle = settings_index.find_child(application_name, toggle_name)
 
     if not matching_toggle:
         if skip_when_not_found:
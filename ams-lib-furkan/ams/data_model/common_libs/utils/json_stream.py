@@ -0,0 +1,194 @@
+"""
+Module to decode JSON responses, incrementally for very large lists.
+
+``loads`` decodes a whole document with orjson when it is installed (several times faster
+than the standard library), with the json module otherwise.
+
+``iter_json_array`` decodes a list of a document while its chunks are received: only the
+current item is held in memory, so a response of thousands of items can be filtered
+without materializing the whole document. The list is selected with a path of object keys
+(e.g. ``content`` or ``data.alerts``), the document itself must be the list without path.
+"""
+
+import codecs
+import json
+
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - optional dependency
+    _orjson = None
+
+# pylint: disable=line-too-long
+
+STREAM_CHUNK_SIZE = 65536
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+# characters which may follow a complete value
+_DELIMITERS = _WHITESPACE + ",]}:"
+
+
+def json_backend():
+    """Returns the name of the module used to decode whole documents"""
+    return "orjson" if _orjson is not None else "json"
+
+
+def loads(content):
+    """Decodes a whole JSON document (str or bytes)"""
+    if _orjson is not None:
+        return _orjson.loads(content)
+    return json.loads(content)
+
+
+def parse_path(path):
+    """
+    Returns the keys of a path selecting a list: True, None or "" for the document itself,
+    otherwise keys separated by dots, an optional trailing [] or [*] is ignored
+    (e.g. "content", "data.alerts[*]").
+    """
+    if path is True or not path:
+        return []
+    path = str(path)
+    for suffix in ("[*]", "[]"):
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+    return [key for key in path.split(".") if key]
+
+
+def stream_option(stream):
+    """
+    Returns the stream argument of a keyword: None when the response is not streamed, True or
+    the path of the list otherwise. The strings given by Robot Framework are parsed, "False"
+    or "None" do not stream the response.
+    """
+    if isinstance(stream, str):
+        value = stream.strip().lower()
+        if value in ("", "false", "no", "off", "0", "none"):
+            return None
+        if value in ("true", "yes", "on", "1"):
+            return True
+        return stream
+    return stream or None
+
+
+class _Reader:
+    """Text buffer over the chunks of a document, read on demand"""
+
+    def __init__(self, chunks, min_read=65536):
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.min_read = min_read
+        self.eof = False
+
+    def read_more(self):
+        """Appends at least one chunk to the buffer, returns False at the end of the document"""
+        if self.eof:
+            return False
+        # drop what has been consumed
+        self.buffer = self.buffer[self.pos :]
+        self.pos = 0
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                chunk = self.decoder.decode(chunk)
+            self.buffer += chunk
+            return True
+        self.buffer += self.decoder.decode(b"", final=True)
+        self.eof = True
+        return False
+
+    def peek(self):
+        """Returns the next non whitespace character, None at the end of the document"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.read_more():
+                return None
+
+    def expect(self, characters):
+        """Consumes the next non whitespace character, which must be one of the characters"""
+        character = self.peek()
+        if character is None or character not in characters:
+            raise ValueError(
+                f"Invalid JSON document: expected {characters!r} and got {character!r}"
+            )
+        self.pos += 1
+        return character
+
+    def value(self):
+        """Decodes the next value, reading chunks until it is complete"""
+        self.peek()
+        required = 0
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # a number may continue in the next chunk (e.g. "-2." then "5"), it is
+                # complete once followed by a delimiter
+                if (
+                    self.eof
+                    or self.buffer[self.pos] in '"{['
+                    or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS)
+                ):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # the value is incomplete, read until the buffer grew enough to avoid decoding
+            # the start of a large value again for every chunk
+            required = max(required * 2, len(self.buffer) - self.pos + self.min_read)
+            while len(self.buffer) - self.pos < required and self.read_more():
+                pass
+
+
+def iter_json_array(chunks, path=None):
+    """
+    Yields the items of the list at the path of the document, decoded while the chunks
+    (bytes or str) of the document are read.
+
+    Args:
+        chunks (iterable): The chunks of the document (e.g. response.iter_content(65536)).
+        path (str): The keys of the list, see parse_path. Default is the document itself.
+
+    Raises:
+        ValueError: If the document is not valid JSON or the path is not a list.
+    """
+    keys = parse_path(path)
+    reader = _Reader(chunks)
+    for depth, key in enumerate(keys):
+        reader.expect("{")
+        while True:
+            if reader.peek() == "}":
+                raise ValueError(f"Key {'.'.join(keys[: depth + 1])} not found")
+            name = reader.value()
+            reader.expect(":")
+            if name == key:
+                break
+            reader.value()  # skip the value of another key
+            if reader.expect(",}") == "}":
+                raise ValueError(f"Key {'.'.join(keys[: depth + 1])} not found")
+
+    if reader.peek() != "[":
+        raise ValueError(f"The value at {'.'.join(keys) or 'the root'} is not a list")
+    reader.expect("[")
+    if reader.peek() == "]":
+        return
+    while True:
+        yield reader.value()
+        if reader.expect(",]") == "]":
+            return
+
+
+def iter_response_items(response, path=None):
+    """
+    Yields the items of the list at the path of a streamed requests response, decoded while
+    the body is received. The connection is released once the items are read or the
+    iterator is closed.
+    """
+    try:
+        yield from iter_json_array(response.iter_content(STREAM_CHUNK_SIZE), path)
+    finally:
+        response.close()
@@ -0,0 +1,380 @@
+"""
+Module to build and cache the keyword manifest used by the library to load keywords lazily.
+
+The manifest maps every keyword name to the module defining it, together with the
+argument specification and documentation Robot Framework needs to register the keyword.
+The keywords are the public functions defined in the modules containing keywords, and the
+functions they import which are listed as re-exported keywords of the library.
+It is built by parsing the source files (nothing is imported) and cached on disk, so
+importing the library does not import every functionality module.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+# pylint: disable=line-too-long
+
+LOGGER = logging.getLogger(__name__)
+
+# bump when the structure of the manifest changes to invalidate existing caches
+MANIFEST_VERSION = 2
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ams-lib")
+
+# types which can be safely stored as default values in the json manifest
+_JSON_DEFAULT_TYPES = (str, int, float, bool, type(None), list, dict)
+
+# alias resolution depth to avoid looping on circular imports
+_MAX_ALIAS_DEPTH = 10
+
+
+def _module_file(package_path, package_name, module_path):
+    """
+    Returns the file path of a module of the package, None if the module is not part of it.
+    """
+    parts = module_path.split(".")
+    if parts[0] != package_name:
+        return None
+    base_path = os.path.join(package_path, *parts[1:])
+    for candidate in (base_path + ".py", os.path.join(base_path, "__init__.py")):
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+def _resolve_import(current_module, is_package, imported_module, level):
+    """
+    Resolves a (possibly relative) import into an absolute module path.
+    """
+    if level == 0:
+        return imported_module
+    parts = current_module.split(".")
+    if not is_package:
+        parts = parts[:-1]
+    if level > 1:
+        parts = parts[: -(level - 1)]
+    if imported_module:
+        parts.append(imported_module)
+    return ".".join(parts)
+
+
+def _format_argument(name, default):
+    """
+    Formats an argument for the Robot Framework dynamic library API.
+
+    Literal default values are kept as values (so Robot Framework can use them for argument
+    conversion), other default values are kept as their source code.
+    """
+    if default is None:
+        return name
+    try:
+        value = ast.literal_eval(default)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return f"{name}={ast.unparse(default)}"
+    if isinstance(value, _JSON_DEFAULT_TYPES):
+        try:
+            json.dumps(value)
+            return [name, value]
+        except (TypeError, ValueError):
+            pass
+    return f"{name}={ast.unparse(default)}"
+
+
+def _argument_spec(node):
+    """
+    Builds the argument specification of a function definition node.
+    """
+    if node.decorator_list:
+        # decorators may change the signature of the function
+        return ["*args", "**kwargs"]
+
+    arguments = node.args
+    positional = arguments.posonlyargs + arguments.args
+    defaults = [None] * (len(positional) - len(arguments.defaults)) + list(
+        arguments.defaults
+    )
+
+    spec = [
+        _format_argument(argument.arg, default)
+        for argument, default in zip(positional, defaults)
+    ]
+    if arguments.vararg:
+        spec.append(f"*{arguments.vararg.arg}")
+    elif arguments.kwonlyargs:
+        spec.append("*")
+    spec.extend(
+        _format_argument(argument.arg, default)
+        for argument, default in zip(arguments.kwonlyargs, arguments.kw_defaults)
+    )
+    if arguments.kwarg:
+        spec.append(f"**{arguments.kwarg.arg}")
+    return spec
+
+
+def _collect_statements(statements, module_path, is_package, definitions, aliases):
+    """
+    Collects the callables defined or imported by the given statements.
+    Later statements override earlier ones, as they would when the module is executed.
+    """
+    for node in statements:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            aliases.pop(node.name, None)
+            definitions[node.name] = {
+                "kind": "function",
+                "args": _argument_spec(node),
+                "doc": ast.get_docstring(node) or "",
+                "lineno": node.lineno,
+            }
+        elif isinstance(node, ast.ClassDef):
+            aliases.pop(node.name, None)
+            definitions[node.name] = {
+                "kind": "class",
+                "doc": ast.get_docstring(node) or "",
+                "lineno": node.lineno,
+            }
+        elif isinstance(node, ast.ImportFrom):
+            source_module = _resolve_import(
+                module_path, is_package, node.module, node.level
+            )
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                name = alias.asname or alias.name
+                definitions.pop(name, None)
+                aliases[name] = (source_module, alias.name)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                name = alias.asname or alias.name.split(".")[0]
+                definitions.pop(name, None)
+                aliases.pop(name, None)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                for name_node in ast.walk(target):
+                    if isinstance(name_node, ast.Name):
+                        definitions.pop(name_node.id, None)
+                        aliases.pop(name_node.id, None)
+        elif isinstance(node, ast.If):
+            _collect_statements(
+                node.body + node.orelse, module_path, is_package, definitions, aliases
+            )
+        elif isinstance(node, ast.Try):
+            _collect_statements(
+                node.body + node.orelse + node.finalbody,
+                module_path,
+                is_package,
+                definitions,
+                aliases,
+            )
+
+
+class _ModuleParser:
+    """
+    Parses the modules of the package and resolves imported names to their definition.
+    """
+
+    def __init__(self, package_path, package_name):
+        self.package_path = package_path
+        self.package_name = package_name
+        self.modules = {}
+
+    def parse(self, module_path):
+        """
+        Returns the (definitions, aliases, file path) of a module, None if it cannot be parsed.
+        """
+        if module_path in self.modules:
+            return self.modules[module_path]
+
+        self.modules[module_path] = None
+        file_path = _module_file(self.package_path, self.package_name, module_path)
+        if file_path is None:
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as source_file:
+                tree = ast.parse(source_file.read(), filename=file_path)
+        except (OSError, SyntaxError, ValueError) as e:
+            LOGGER.warning("Unable to parse module %s for keywords: %s", module_path, e)
+            return None
+
+        definitions, aliases = {}, {}
+        _collect_statements(
+            tree.body,
+            module_path,
+            file_path.endswith("__init__.py"),
+            definitions,
+            aliases,
+        )
+        self.modules[module_path] = (definitions, aliases, file_path)
+        return self.modules[module_path]
+
+    def resolve(self, module_path, name, depth=0):
+        """
+        Returns the (module path, attribute name, definition, file path) defining the name,
+        None if it is not defined inside the package.
+        """
+        parsed = self.parse(module_path)
+        if parsed is None or depth > _MAX_ALIAS_DEPTH:
+            return None
+        definitions, aliases, file_path = parsed
+        if name in definitions:
+            return module_path, name, definitions[name], file_path
+        if name in aliases:
+            source_module, source_name = aliases[name]
+            return self.resolve(source_module, source_name, depth + 1)
+        return None
+
+
+def _discover_module_paths(package_path, package_name, func_modules, extra_modules):
+    """
+    Lists the modules containing keywords, in the order they are registered.
+    """
+    module_paths = []
+    for functionality in func_modules:
+        functionality_path = os.path.join(package_path, functionality)
+        for root, _directories, files in os.walk(functionality_path):
+            if "__pycache__" in root:
+                continue
+            subfolder = os.path.relpath(root, functionality_path)
+            for file in files:
+                if not file.endswith(".py") or file == "__init__.py":
+                    continue
+                module = file.split(".")[0]
+                parts = [package_name, functionality]
+                if subfolder != os.curdir:
+                    parts.extend(subfolder.split(os.sep))
+                parts.append(module)
+                module_paths.append(".".join(parts))
+    module_paths.extend(f"{package_name}.{module}" for module in extra_modules)
+    return module_paths
+
+
+def _fingerprint(package_path, reexports=()):
+    """
+    Computes a fingerprint of all the Python sources of the package and of the re-exports.
+    """
+    digest = hashlib.sha1(
+        f"{MANIFEST_VERSION}:{package_path}:{sorted(reexports)}".encode("utf-8")
+    )
+    for root, directories, files in os.walk(package_path):
+        directories.sort()
+        for file in sorted(files):
+            if file.endswith(".py"):
+                stat = os.stat(os.path.join(root, file))
+                digest.update(
+                    f"{os.path.join(root, file)}:{stat.st_mtime_ns}:{stat.st_size}".encode(
+                        "utf-8"
+                    )
+                )
+    return digest.hexdigest()
+
+
+def build_keyword_manifest(
+    package_path, package_name, func_modules, extra_modules=(), reexports=()
+):
+    """
+    Builds the keyword manifest of the package by parsing the modules containing keywords.
+
+    Args:
+        package_path (str): The directory of the package.
+        package_name (str): The name of the package (e.g. "ams").
+        func_modules (list): The functionality folders containing keywords.
+        extra_modules (list): Library level modules containing keywords.
+        reexports (list): Names of the functions imported by these modules which are
+            keywords too, the other imported functions are only reachable as attributes.
+
+    Returns:
+        dict: keyword name -> entry with the following keys:
+            - module (str): module to import to get the keyword.
+            - attribute (str): name of the keyword in the module.
+            - keyword (bool): True if the name is exposed as a Robot Framework keyword.
+            - args (list): argument specification for the Robot Framework dynamic API.
+            - doc (str): keyword documentation.
+            - source (str): source file of the keyword.
+            - lineno (int): line number of the keyword in the source file.
+    """
+    parser = _ModuleParser(package_path, package_name)
+    manifest = {}
+    for module_path in _discover_module_paths(
+        package_path, package_name, func_modules, extra_modules
+    ):
+        parsed = parser.parse(module_path)
+        if parsed is None:
+            continue
+        definitions, aliases, _file_path = parsed
+        for name in list(definitions) + list(aliases):
+            resolved = parser.resolve(module_path, name)
+            if resolved is None:
+                # imported from outside the package
+                continue
+            defining_module, attribute, definition, source = resolved
+            is_keyword = (
+                definition["kind"] == "function"
+                and not name.startswith("_")
+                and (name in definitions or name in reexports)
+            )
+            if name in manifest and manifest[name]["module"] == defining_module:
+                # imported by another module than the one defining the keyword
+                is_keyword = is_keyword or manifest[name]["keyword"]
+            manifest[name] = {
+                "module": defining_module,
+                "attribute": attribute,
+                "keyword": is_keyword,
+                "args": definition.get("args", []),
+                "doc": definition["doc"],
+                "source": source,
+                "lineno": definition["lineno"],
+            }
+    return manifest
+
+
+def load_keyword_manifest(
+    package_path,
+    package_name,
+    func_modules,
+    extra_modules=(),
+    cache_dir=None,
+    reexports=(),
+):
+    """
+    Loads the keyword manifest from the cache, building it when the sources have changed.
+
+    The cache directory can be changed with the AMS_KEYWORD_CACHE_DIR environment variable.
+    Failing to read or write the cache is not an error, the manifest is then built in memory.
+
+    Returns:
+        dict: the keyword manifest, see build_keyword_manifest.
+    """
+    cache_dir = cache_dir or os.environ.get("AMS_KEYWORD_CACHE_DIR", DEFAULT_CACHE_DIR)
+    fingerprint = _fingerprint(package_path, reexports)
+    cache_file = os.path.join(cache_dir, f"keyword_manifest_{package_name}.json")
+
+    try:
+        with open(cache_file, "r", encoding="utf-8") as manifest_file:
+            cached = json.load(manifest_file)
+        if cached.get("fingerprint") == fingerprint:
+            LOGGER.debug("Keyword manifest loaded from %s", cache_file)
+            return cached["keywords"]
+    except (OSError, ValueError, AttributeError):
+        LOGGER.debug("No valid keyword manifest found in %s", cache_file)
+
+    manifest = build_keyword_manifest(
+        package_path, package_name, func_modules, extra_modules, reexports
+    )
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # write in a temporary file first as pabot workers may load the cache concurrently
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_dir, suffix=".tmp", delete=False
+        ) as manifest_file:
+            json.dump({"fingerprint": fingerprint, "keywords": manifest}, manifest_file)
+        os.replace(manifest_file.name, cache_file)
+        LOGGER.debug("Keyword manifest cached in %s", cache_file)
+    except OSError as e:
+        LOGGER.debug("Unable to cache keyword manifest in %s: %s", cache_dir, e)
+
+    return manifest
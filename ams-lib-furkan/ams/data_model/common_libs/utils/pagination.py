@@ -0,0 +1,202 @@
+"""
+Module to iterate lazily over the items of the paged AMS list APIs.
+
+A paging scheme gives the paging parameters of the first page and of the page after a given
+one, and where the items are in a page:
+
+- ``PageNumberPaging``: page number and page size (e.g. ``page``/``size`` of the FOM searches)
+- ``OffsetPaging``: offset of the first row and optional limit (e.g. ``pageStartRow`` of MSC)
+- ``CursorPaging``: the cursor of the last item of a page (e.g. ``lastUpdatedDateTime``)
+
+``paginate`` calls a fetch function with the parameters of every page and yields the items
+one by one, the next page is requested only when the items of the page are consumed. With
+prefetch, the next page is requested in the background while the items of the current page
+are processed, so the network and the processing overlap.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from ams.data_model.common_libs.utils.json_stream import parse_path
+
+# pylint: disable=line-too-long
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+
+
+class _Paging:
+    """Common part of the paging schemes: the items of a page and the pages limit"""
+
+    def __init__(self, items_path=None, id_field=None, max_pages=None):
+        self.items_path = parse_path(items_path)
+        self.id_field = id_field
+        self.max_pages = int(max_pages) if max_pages else None
+
+    def items(self, page):
+        """Returns the items of a decoded page (an empty list for None, e.g. 204 No Content)"""
+        for key in self.items_path:
+            if not isinstance(page, dict):
+                return []
+            page = page.get(key)
+        return page or []
+
+    def first(self):
+        """Returns the paging parameters of the first page"""
+        raise NotImplementedError
+
+    def next(self, params, items):
+        """Returns the paging parameters of the page after the one of params, None after the last page"""
+        raise NotImplementedError
+
+
+class PageNumberPaging(_Paging):
+    """Page number and page size, a page shorter than the size is the last one"""
+
+    def __init__(
+        self,
+        page_param="page",
+        size_param="size",
+        page_size=DEFAULT_PAGE_SIZE,
+        first_page=0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.page_param = page_param
+        self.size_param = size_param
+        self.page_size = int(page_size)
+        self.first_page = int(first_page)
+
+    def first(self):
+        return {self.page_param: self.first_page, self.size_param: self.page_size}
+
+    def next(self, params, items):
+        if len(items) < self.page_size:
+            return None
+        return {**params, self.page_param: params[self.page_param] + 1}
+
+
+class OffsetPaging(_Paging):
+    """
+    Offset of the first item and optional limit. Without limit the server decides the size of
+    the pages and an empty page is the end, otherwise a page shorter than the limit is the last one.
+    """
+
+    def __init__(self, offset_param="offset", limit_param=None, page_size=None, **kwargs):
+        super().__init__(**kwargs)
+        self.offset_param = offset_param
+        self.limit_param = limit_param
+        self.page_size = int(page_size) if page_size else None
+
+    def first(self):
+        params = {self.offset_param: 0}
+        if self.limit_param and self.page_size:
+            params[self.limit_param] = self.page_size
+        return params
+
+    def next(self, params, items):
+        if not items or (self.page_size and len(items) < self.page_size):
+            return None
+        return {**params, self.offset_param: params[self.offset_param] + len(items)}
+
+
+class CursorPaging(_Paging):
+    """
+    Cursor taken from the last item of a page (e.g. its lastUpdatedDateTime), with an optional
+    page size. The server may return the items of the cursor again: give id_field to skip the
+    items already returned by the previous page. The pages stop when the cursor does not move.
+    """
+
+    def __init__(
+        self,
+        cursor_param="lastUpdatedDateTime",
+        cursor_field="lastUpdatedDateTime",
+        start=None,
+        size_param=None,
+        page_size=None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.cursor_param = cursor_param
+        self.cursor_field = cursor_field
+        self.start = start
+        self.size_param = size_param
+        self.page_size = int(page_size) if page_size else None
+
+    def first(self):
+        params = {self.cursor_param: self.start}
+        if self.size_param and self.page_size:
+            params[self.size_param] = self.page_size
+        return params
+
+    def next(self, params, items):
+        if not items or (self.page_size and len(items) < self.page_size):
+            return None
+        cursor = items[-1].get(self.cursor_field) if isinstance(items[-1], dict) else None
+        if cursor is None or cursor == params[self.cursor_param]:
+            LOGGER.warning(
+                "Pages stopped, the cursor %s=%s does not move", self.cursor_param, cursor
+            )
+            return None
+        return {**params, self.cursor_param: cursor}
+
+
+def _fetch_page(fetch, paging, params):
+    return paging.items(fetch(params))
+
+
+def paginate(fetch, paging, prefetch=False):
+    """
+    Yields the items of all the pages, requested on demand.
+
+    Args:
+        fetch (callable): Called with the paging parameters of a page (dict), returns the decoded page.
+        paging (_Paging): The paging scheme of the API.
+        prefetch (bool): If the next page should be requested in the background while the items
+            of the current page are consumed. Default is False.
+
+    Yields:
+        The items of the pages, in order.
+    """
+    executor = (
+        ThreadPoolExecutor(max_workers=1, thread_name_prefix="ams-page")
+        if prefetch
+        else None
+    )
+    try:
+        params = paging.first()
+        items = _fetch_page(fetch, paging, params)
+        pages = 1
+        previous_ids = set()
+        while True:
+            next_params = paging.next(params, items)
+            if paging.max_pages and pages >= paging.max_pages:
+                next_params = None
+            pending = (
+                executor.submit(_fetch_page, fetch, paging, next_params)
+                if executor is not None and next_params is not None
+                else None
+            )
+            LOGGER.debug("Page %s %s: %s items", pages, params, len(items))
+
+            page_ids = set()
+            for item in items:
+                if paging.id_field and isinstance(item, dict):
+                    item_id = item.get(paging.id_field)
+                    page_ids.add(item_id)
+                    if item_id in previous_ids:
+                        continue
+                yield item
+
+            if next_params is None:
+                return
+            params, previous_ids = next_params, page_ids
+            items = (
+                pending.result()
+                if pending is not None
+                else _fetch_page(fetch, paging, params)
+            )
+            pages += 1
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
@@ -0,0 +1,136 @@
+"""
+Module to find the entities of a MDM response valid at a time or during a time range.
+
+The periods of the entities (``startDateTime`` / ``endDateTime``, a missing bound being open) are
+indexed once in a centered interval tree, so that the queries only visit the periods they return
+and a few tree nodes instead of every period of every entity.
+
+An index is a snapshot of the response: it is built by every keyword call and not kept, so that
+the periods edited in place by a test (e.g. with ``Set To Dictionary``) are always taken into
+account and the responses are not kept alive.
+
+The date times are compared as ISO 8601 strings truncated to the second, the time zone is ignored
+(MDM date times are UTC).
+"""
+
+import datetime
+from bisect import bisect_left, bisect_right
+
+# bounds of the periods without start or end
+_OPEN_START = ""
+_OPEN_END = "\uffff"
+
+
+def instant(value):
+    """Returns the comparable form of a date time given as datetime or ISO 8601 string"""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        value = value.isoformat()
+    return str(value).replace(" ", "T")[:19]
+
+
+class _Node:
+    """
+    Node of the interval tree: the periods containing its center, sorted by start and by end.
+    The periods ended before the center are on the left, the ones started after it on the right.
+    """
+
+    def __init__(self, periods):
+        starts = sorted(period[0] for period in periods)
+        self.center = starts[len(starts) // 2]
+        here = []
+        left = []
+        right = []
+        for period in periods:
+            if period[1] < self.center:
+                left.append(period)
+            elif period[0] > self.center:
+                right.append(period)
+            else:
+                here.append(period)
+        self.by_start = sorted(here, key=lambda period: period[0])
+        self.starts = [period[0] for period in self.by_start]
+        self.by_end = sorted(here, key=lambda period: period[1], reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class PeriodIndex:
+    """Interval index over the periods of a list of entities, as they are when it is built"""
+
+    def __init__(self, entities):
+        self.entities = entities
+        periods = []
+        for position, entity in enumerate(entities):
+            if not isinstance(entity, dict):
+                continue
+            for number, period in enumerate(entity.get("periods") or []):
+                if not isinstance(period, dict):
+                    continue
+                start = period.get("startDateTime")
+                end = period.get("endDateTime")
+                end = _OPEN_END if end is None else instant(end)
+                # a period ending before its start is never active, its end only matters
+                start = min(_OPEN_START if start is None else instant(start), end)
+                periods.append((start, end, position, number, period))
+        self.size = len(periods)
+        self._root = _Node(periods) if periods else None
+
+    def _overlapping(self, start, end):
+        """Yields the periods overlapping the range: started before its end and ended after its start"""
+        nodes = [self._root] if self._root is not None and start < end else []
+        while nodes:
+            node = nodes.pop()
+            if node.center >= end:
+                yield from node.by_start[: bisect_left(node.starts, end)]
+                children = (node.left,)
+            else:
+                for period in node.by_end:
+                    if period[1] <= start:
+                        break
+                    yield period
+                children = (node.right,) if node.center < start else (node.left, node.right)
+            nodes.extend(child for child in children if child is not None)
+
+    def _containing(self, at):
+        """Yields the periods started at or before the time and ended after it"""
+        node = self._root
+        while node is not None:
+            if at < node.center:
+                yield from node.by_start[: bisect_right(node.starts, at)]
+                node = node.left
+            else:
+                for period in node.by_end:
+                    if period[1] <= at:
+                        break
+                    yield period
+                node = node.right
+
+    def _select(self, periods):
+        """Returns the entities of the periods with their matching periods, in the order of the entities"""
+        matches = {}
+        for _start, _end, position, number, period in periods:
+            matches.setdefault(position, []).append((number, period))
+        return [
+            {
+                "entity": self.entities[position],
+                "periods": [period for _number, period in sorted(matches[position])],
+            }
+            for position in sorted(matches)
+        ]
+
+    def active_at(self, at):
+        """Returns the entities with a period started and not ended at the time"""
+        return self._select(self._containing(instant(at)))
+
+    def valid_between(self, start=None, end=None):
+        """
+        Returns the entities with a period overlapping the time range [start, end), the range
+        being open when start or end is None (e.g. valid_between(start=now): not ended at now).
+        """
+        return self._select(
+            self._overlapping(
+                _OPEN_START if start is None else instant(start),
+                _OPEN_END if end is None else instant(end),
+            )
+        )
+
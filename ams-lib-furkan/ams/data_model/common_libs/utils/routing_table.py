@@ -0,0 +1,59 @@
+"""
+Module to keep tables derived from the session context, e.g. REST paths with the airport and
+customer placeholders already replaced.
+
+A routing table is built from the values it depends on (e.g. reference airport id and customer
+id) the first time it is read, then returned as is while these values are the same. It is built
+again when they change, and after a new AMS session is opened (``invalidate_routing_tables``).
+"""
+
+import logging
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+_TABLES = []
+
+
+class RoutingTable:
+    """Thread safe table built by build(values), rebuilt when the values change"""
+
+    def __init__(self, name, build):
+        self.name = name
+        self._build = build
+        self._lock = threading.Lock()
+        # (values, table), replaced at once so that readers never see half of it
+        self._table = None
+        self.builds = 0
+        _TABLES.append(self)
+
+    def get(self, values):
+        """Returns the table built for the values, building it first if needed"""
+        table = self._table
+        if table is not None and table[0] == values:
+            return table[1]
+        with self._lock:
+            if self._table is None or self._table[0] != values:
+                self._table = (values, self._build(values))
+                self.builds += 1
+                LOGGER.debug("Routing table %s built for %s", self.name, values)
+            return self._table[1]
+
+    def invalidate(self):
+        """Drops the table, it is built again on the next read"""
+        with self._lock:
+            self._table = None
+
+    def statistics(self):
+        """Returns the number of entries of the table and of builds done"""
+        table = self._table
+        return {
+            "entries": len(table[1]) if table is not None else 0,
+            "builds": self.builds,
+        }
+
+
+def invalidate_routing_tables():
+    """Drops all the routing tables, e.g. when a new AMS session is opened"""
+    for table in list(_TABLES):
+        table.invalidate()
@@ -6,6 +6,7 @@ import os
 import logging
 import yaml
 from protocols import open_session, session_manager
+from ams.data_model.common_libs.clients.http_metrics import PATH_TEMPLATES
 from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
 
 
@@ -121,6 +122,8 @@ class AMSSession:
         end_points = os.path.join(base_path, "../data_store/end_points.yml")
         jmespath_queries = os.path.join(base_path, "../data_store/jmespath_queries.yml")
         self.context_data["end_points"] = self.load_yaml_file(end_points)
+        # the calls are measured per end point, the codes and ids of the paths as {id}
+        PATH_TEMPLATES.register_end_points(self.context_data["end_points"])
         self.context_data["jmespath_queries"] = self.load_yaml_file(jmespath_queries)
 
     def create_environment_context(self):
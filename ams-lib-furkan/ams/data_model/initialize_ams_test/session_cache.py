@@ -0,0 +1,173 @@
+# pylint: disable=line-too-long
+# pylint: disable = protected-access
+
+"""
+Module to cache the AMS session bootstrap across tests.
+
+Opening an AMS session templates the environment file, loads the end points and jmespath
+queries, logs in and may fetch the active configuration, the toggles configuration and the
+component versions. The result (the context data of the protocols session, authenticated
+cookie included) is cached per process for a time to live, so the following tests reuse the
+authenticated session instead of logging in again.
+"""
+
+import json
+import logging
+import threading
+import time
+from protocols import session_manager
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    register_unauthorized_handler,
+)
+from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = 900
+
+# context data keys which belong to the test and are never reused
+_TEST_KEYS = ("test_context",)
+
+# context data keys reloaded from the configuration service when they are invalidated
+CONFIGURATION_KEYS = ("active_configuration", "toggles_configuration")
+
+
+def session_ttl():
+    """Returns the time to live in seconds of a cached session, 0 disables the cache"""
+    return float(get_variable_value("AMS_SESSION_TTL", DEFAULT_SESSION_TTL))
+
+
+def session_cache_key(protocol, test_context):
+    """
+    Returns the key of the session: the protocol, environment, user and the generic context
+    used to template the environment file.
+    """
+    generic_context = (test_context or {}).get("generic_context", {})
+    return (
+        protocol,
+        get_variable_value("ENVIRONMENT"),
+        get_variable_value("MODE"),
+        get_variable_value("USER"),
+        get_variable_value("ORG", "1A"),
+        json.dumps(generic_context, sort_keys=True, default=str),
+    )
+
+
+class CachedSession:
+    """Context data of an opened protocols session, reusable until it expires"""
+
+    def __init__(self, context_data, ttl, session_factory=None):
+        self.context_data = {
+            key: value for key, value in context_data.items() if key not in _TEST_KEYS
+        }
+        self.expires_at = time.monotonic() + ttl
+        self.session_factory = session_factory
+
+    def is_expired(self):
+        """Returns True when the time to live is over"""
+        return time.monotonic() >= self.expires_at
+
+    def restore(self, context_data, test_context):
+        """Resets the context data of the protocols session for a new test"""
+        context_data.clear()
+        context_data.update(self.context_data)
+        context_data["test_context"] = test_context
+
+
+class SessionCache:
+    """Thread safe process wide cache of opened AMS sessions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self.current_key = None
+
+    def get(self, key):
+        """Returns the cached session of the key, None if there is none or it expired"""
+        with self._lock:
+            cached = self._sessions.get(key)
+            if cached is not None and cached.is_expired():
+                LOGGER.info("Cached AMS session expired")
+                del self._sessions[key]
+                cached = None
+            return cached
+
+    def put(self, key, context_data, ttl, session_factory=None):
+        """Caches the context data of the opened session"""
+        with self._lock:
+            self._sessions[key] = CachedSession(context_data, ttl, session_factory)
+            self.current_key = key
+
+    def update(self, key, context_data):
+        """Refreshes the cached context data, keeping the expiry of the session"""
+        with self._lock:
+            cached = self._sessions.get(key)
+            if cached is not None:
+                cached.context_data = {
+                    name: value
+                    for name, value in context_data.items()
+                    if name not in _TEST_KEYS
+                }
+            self.current_key = key
+
+    def discard(self, key=None):
+        """Removes the session of the key (all the sessions by default)"""
+        with self._lock:
+            if key is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(key, None)
+
+    def discard_configurations(self):
+        """Removes the configurations from the cached sessions so they are loaded again"""
+        with self._lock:
+            for cached in self._sessions.values():
+                for name in CONFIGURATION_KEYS:
+                    cached.context_data.pop(name, None)
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+SESSION_CACHE = SessionCache()
+
+
+def is_session_alive(session_key="defaultKey"):
+    """Returns True if the protocols session is still opened and authenticated"""
+    try:
+        security_context = session_manager.sessions._get_security_context_details(
+            session_key
+        )
+        return bool(security_context and security_context.get("header"))
+    except Exception:
+        return False
+
+
+def reauthenticate(session_key="defaultKey"):
+    """
+    Opens the current cached session again after the server answered 401 Unauthorized.
+
+    The reusable context data (configurations, component versions) is kept and the new
+    session replaces the cached one.
+
+    == Return value ==
+    | True if the session was opened again, False if there is no cached session
+    """
+    key = SESSION_CACHE.current_key
+    cached = SESSION_CACHE.get(key) if key is not None else None
+    if session_key != "defaultKey" or cached is None or cached.session_factory is None:
+        return False
+
+    LOGGER.info("Session is not authenticated anymore, login again")
+    test_context = session_manager.sessions._get_session_context_data().get(
+        "test_context"
+    )
+    cached.session_factory(test_context)
+    context_data = session_manager.sessions._get_session_context_data()
+    for name, value in cached.context_data.items():
+        context_data.setdefault(name, value)
+    SESSION_CACHE.put(key, context_data, session_ttl(), cached.session_factory)
+    return True
+
+
+register_unauthorized_handler(reauthenticate)
@@ -0,0 +1,279 @@
+# pylint: disable=line-too-long
+# pylint: disable = protected-access
+
+"""
+Module to log in several AMS users up front and share their sessions between workers.
+
+The default AMS session (``Open Generic Ams Session``) holds one authenticated cookie. A
+session pool logs in more users (or the same user several times) with the same form login
+as the security context of the default session, and gives every login its own session key
+(``pool_0``, ``pool_1``...). The pooled transport resolves these keys to their cookies, so
+concurrent workers send their calls as different operators instead of sharing one cookie.
+
+The sessions are handed out round-robin, logged in again in the background before they get
+too old, and at once when the server answers 401 Unauthorized.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from protocols import session_manager
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    register_security_context_provider,
+    register_unauthorized_handler,
+    unregister_security_context_provider,
+    unregister_unauthorized_handler,
+)
+from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 600
+DEFAULT_LOGIN_TIMEOUT = 60
+
+POOL_KEY_PREFIX = "pool_"
+
+
+def load_pool_users(file_path=None):
+    """
+    Returns the users of a credentials file in the ``.ams_login`` format, every ``user`` line
+    starting a new user:
+
+    user <username>
+    password <password>
+    organization <organization>
+    user <username>
+    ...
+
+    The file is AMS_SESSION_POOL_FILE by default, or ~/.ams_login.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    file_path = file_path or get_variable_value(
+        "AMS_SESSION_POOL_FILE", os.path.join(os.path.expanduser("~"), ".ams_login")
+    )
+    users = []
+    with open(file_path, "r", encoding="utf-8") as fl:
+        for line in fl.readlines():
+            if line.startswith("user "):
+                users.append({"username": line[len("user ") :].strip()})
+            elif users and line.startswith("password "):
+                users[-1]["password"] = line[len("password ") :].strip()
+            elif users and line.startswith("organization "):
+                users[-1]["organization"] = line[len("organization ") :].strip()
+    for user in users:
+        user.setdefault("organization", "1A")
+    LOGGER.debug("Picked %s pool users from %s", len(users), file_path)
+    return users
+
+
+def cookie_login(environment_context, user, timeout=DEFAULT_LOGIN_TIMEOUT):
+    """
+    Logs the user in with the form of the authentication end point and returns the headers of
+    its calls: the generic headers and the session cookie, as for the default AMS session.
+
+    Raises:
+        ValueError: If the login is rejected.
+    """
+    server_url = environment_context.get("server_url")
+    auth_headers = dict(environment_context.get("auth_headers") or {})
+    original_cookie = auth_headers.get("Cookie")
+    response = requests.post(
+        f"{server_url}{environment_context.get('authentication_end_point')}",
+        data={
+            "apt_username": user.get("username"),
+            "apt_password": user.get("password"),
+            "apt_companyId": user.get("organization") or "1A",
+        },
+        headers=auth_headers,
+        verify=False,
+        timeout=timeout,
+        allow_redirects=False,
+    )
+    if response.status_code >= 400 or not response.cookies:
+        raise ValueError(
+            f"Login of {user.get('username')} failed with status {response.status_code}"
+        )
+    session_cookie = "; ".join(
+        f"{cookie.name}={cookie.value}" for cookie in response.cookies
+    )
+    header = {**auth_headers, **(environment_context.get("generic_headers") or {})}
+    header["Cookie"] = (
+        f"{session_cookie};{original_cookie}" if original_cookie else session_cookie
+    )
+    return header
+
+
+class PooledSession:
+    """Security context of a pooled login"""
+
+    def __init__(self, key, user, server_url):
+        self.key = key
+        self.user = user
+        self.server_url = server_url
+        self.header = None
+        self.logged_in_at = None
+
+    def security_context(self):
+        """Returns the security context read by the transport"""
+        return {"server_url": self.server_url, "header": self.header}
+
+
+class SessionPool:
+    """
+    Thread safe pool of logged in sessions, handed out round-robin and logged in again in
+    the background every refresh_interval seconds.
+    """
+
+    def __init__(
+        self,
+        users,
+        environment_context,
+        size=None,
+        refresh_interval=None,
+        login=cookie_login,
+    ):
+        if not users:
+            raise ValueError("No user to log in the session pool")
+        size = int(size or len(users))
+        self.environment_context = environment_context
+        if refresh_interval is None:
+            refresh_interval = get_variable_value(
+                "AMS_SESSION_POOL_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL
+            )
+        self.refresh_interval = float(refresh_interval)
+        self.login = login
+        self.sessions = {
+            f"{POOL_KEY_PREFIX}{index}": PooledSession(
+                f"{POOL_KEY_PREFIX}{index}",
+                users[index % len(users)],
+                environment_context.get("server_url"),
+            )
+            for index in range(size)
+        }
+        self._lock = threading.Lock()
+        self._next_key = itertools.cycle(list(self.sessions))
+        self._stop = threading.Event()
+        self._refresher = None
+        self.logins = 0
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def open(self):
+        """Logs all the sessions in concurrently and starts the background refresh"""
+        with ThreadPoolExecutor(
+            max_workers=min(len(self.sessions), 10), thread_name_prefix="ams-login"
+        ) as executor:
+            list(executor.map(self.refresh, self.sessions))
+        register_security_context_provider(self.security_context)
+        register_unauthorized_handler(self.reauthenticate)
+        if self.refresh_interval > 0:
+            self._refresher = threading.Thread(
+                target=self._refresh_loop, name="ams-session-pool", daemon=True
+            )
+            self._refresher.start()
+        LOGGER.info("Session pool of %s sessions opened", len(self.sessions))
+        return self
+
+    def acquire(self):
+        """Returns the key of the next session, round-robin"""
+        with self._lock:
+            return next(self._next_key)
+
+    def security_context(self, session_key):
+        """Returns the security context of a pooled session, None for other keys"""
+        session = self.sessions.get(session_key)
+        if session is None or session.header is None:
+            return None
+        return session.security_context()
+
+    def refresh(self, session_key):
+        """Logs the session in again"""
+        session = self.sessions[session_key]
+        header = self.login(self.environment_context, session.user)
+        with self._lock:
+            session.header = header
+            session.logged_in_at = time.monotonic()
+            self.logins += 1
+        LOGGER.debug("Session %s logged in as %s", session_key, session.user.get("username"))
+
+    def reauthenticate(self, session_key):
+        """Unauthorized handler: logs a pooled session in again after a 401 Unauthorized"""
+        if session_key not in self.sessions or self._stop.is_set():
+            return False
+        self.refresh(session_key)
+        return True
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval / 10):
+            for session in list(self.sessions.values()):
+                if self._stop.is_set():
+                    return
+                if time.monotonic() - session.logged_in_at < self.refresh_interval:
+                    continue
+                try:
+                    self.refresh(session.key)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    LOGGER.warning("Unable to refresh session %s: %s", session.key, e)
+
+    def statistics(self):
+        """Returns the number of sessions and of logins done (first ones and refreshes)"""
+        with self._lock:
+            return {"sessions": len(self.sessions), "logins": self.logins}
+
+    def close(self):
+        """Stops the background refresh, the keys of the pool are not resolved anymore"""
+        self._stop.set()
+        unregister_security_context_provider(self.security_context)
+        unregister_unauthorized_handler(self.reauthenticate)
+        if self._refresher is not None:
+            self._refresher.join(5)
+        LOGGER.info("Session pool closed")
+
+
+_POOL = {"pool": None}
+
+
+def open_session_pool(users=None, size=None, refresh_interval=None):
+    """
+    Opens the process wide session pool with the environment of the default AMS session,
+    closing the previous one.
+    """
+    close_session_pool()
+    environment_context = session_manager.sessions._get_session_context_data().get(
+        "global_environment_context"
+    )
+    if not environment_context:
+        raise ValueError("Open Generic Ams Session before opening a session pool")
+    pool = SessionPool(
+        users if users is not None else load_pool_users(),
+        environment_context,
+        size=size,
+        refresh_interval=refresh_interval,
+    )
+    _POOL["pool"] = pool.open()
+    return pool
+
+
+def get_session_pool():
+    """Returns the opened session pool
+
+    Raises:
+        ValueError: If no session pool is opened.
+    """
+    if _POOL["pool"] is None:
+        raise ValueError("No session pool opened, use Open Ams Session Pool")
+    return _POOL["pool"]
+
+
+def close_session_pool():
+    """Closes the process wide session pool if one is opened"""
+    pool, _POOL["pool"] = _POOL["pool"], None
+    if pool is not None:
+        pool.close()
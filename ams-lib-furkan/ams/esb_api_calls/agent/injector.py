@@ -228,7 +228,8 @@ def esb_agent_interfaces_descriptor():
         context_data.get("end_points", {}).get("esb", {}).get("interfaces_descriptor")
     )
 
-    kwargs = {}
+    # reference data, revalidated with a conditional GET
+    kwargs = {"cache": True}
 
     response_json = _http_call_and_check(
         path=endpoint, field="success", value=True, **kwargs
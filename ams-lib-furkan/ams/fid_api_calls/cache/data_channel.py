@@ -3,11 +3,10 @@
 import logging
 import threading
 import ssl
-import time
-import copy
 import json
 import base64
 from ams.data_model.common_libs.clients.web_socket_client import WebSocketWrapper
+from ams.fid_api_calls.cache.snapshot import FidsSnapshot
 from ams.data_model.common_libs.utils.airport_data_generator import (
     GenerateAirportData as Gad,
 )
@@ -15,6 +14,55 @@ from ams.data_model.common_libs.utils.airport_data_generator import (
 # pylint: disable=line-too-long
 
 
+class DataChannelSubscription:
+    """
+    Subscription to the rows of a view matching a predicate (or a field value), or to the
+    view being empty when there is neither predicate nor field.
+    """
+
+    def __init__(self, view_name, predicate=None, field=None, value=None):
+        self.view_name = view_name
+        self.field = field
+        self.value = value
+        if predicate is None and field is not None:
+
+            def predicate(item):
+                return item.get(field) == value
+
+        self.predicate = predicate
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+    def evaluate(self, snapshot, touched=None):
+        """
+        Evaluate the subscription, against the touched rows only when given.
+        Returns True (and sets the event) when the subscription matched.
+        """
+        try:
+            if self.predicate is None:
+                if len(snapshot) > 0:
+                    return False
+                self.result = []
+            else:
+                if touched is not None and not any(
+                    self.predicate(row) for row in touched
+                ):
+                    return False
+                if self.field is not None:
+                    result = snapshot.find(self.field, self.value)
+                else:
+                    result = [row for row in snapshot if self.predicate(row)]
+                if not result:
+                    # no match yet, or the touched rows were removed by a later instruction set
+                    return False
+                self.result = result
+        except Exception as e:
+            self.error = e
+        self.event.set()
+        return True
+
+
 class FidsDataChannelWebSocket(WebSocketWrapper):
     """
     This class acts as the data service in Rendering Engine
@@ -44,10 +92,12 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
         self.poll_thread = None
         self.data_request_full = True
         self.initial_data_received = False
+        self.updates_received = 0
 
         self.condition = threading.Condition()
 
         self.snapshots = {}
+        self.subscriptions = {}
         self.rule_context = {}
         self.metadata = {}
         self.register_views = {}
@@ -62,47 +112,77 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
         self.__schedule_data_poll()
         super().start()
 
+    def subscribe(self, view_name, predicate=None, field=None, value=None):
+        """
+        Subscribe to the rows of the view matching the predicate (or where field == value).
+
+        The subscription is evaluated against the current snapshot once, then only against
+        the rows touched by each instruction set. Its event is set as soon as rows match,
+        with all the matching rows of the view as result.
+        Without predicate and field, the subscription matches when the view is empty.
+        """
+        subscription = DataChannelSubscription(view_name, predicate, field, value)
+        with self.condition:
+            snapshot = self.snapshots.get(view_name)
+            if snapshot is None or not subscription.evaluate(snapshot):
+                self.subscriptions.setdefault(view_name, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """
+        Remove the subscription, its event will not be set anymore
+        """
+        with self.condition:
+            subscriptions = self.subscriptions.get(subscription.view_name, [])
+            if subscription in subscriptions:
+                subscriptions.remove(subscription)
+
+    def wait_for_subscription(self, subscription, timeout=120):
+        """
+        Wait for the subscription to match, returns its result or None on timeout.
+        """
+        matched = subscription.event.wait(timeout)
+        self.unsubscribe(subscription)
+        if not matched:
+            return None
+        if subscription.error is not None:
+            raise subscription.error
+        return subscription.result
+
     def wait_for_data(self, view_name, condition, timeout=120):
         """
         Wait for data to be received for a specific view name.
         This method will block until data is received or the timeout is reached.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            with self.condition:
-                if view_name in self.snapshots:
-                    filter_data = list(filter(condition, self.snapshots[view_name]))
-                    if filter_data is not None and len(filter_data) > 0:
-                        return copy.copy(filter_data)  # return copy
-                self.condition.wait(timeout=1)
-        return None
+        return self.wait_for_subscription(
+            self.subscribe(view_name, predicate=condition), timeout
+        )
+
+    def wait_for_field(self, view_name, field, value, timeout=120):
+        """
+        Wait for rows of the view where the field has the value.
+        The index of the field is used when the field has been registered with register_index.
+        """
+        return self.wait_for_subscription(
+            self.subscribe(view_name, field=field, value=value), timeout
+        )
 
     def wait_for_empty_data(self, view_name, timeout=120):
         """
         Wait for data to be received for a specific view name.
         This method will block until data is received or the timeout is reached.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            with self.condition:
-                if view_name in self.snapshots:
-                    if len(self.snapshots[view_name]) == 0:
-                        return []  # return copy
-                self.condition.wait(timeout=1)
-        return None
+        return self.wait_for_subscription(self.subscribe(view_name), timeout)
 
     def wait_for_initial_data(self, timeout=120):
         """
         Wait for initial data to be received for a specific view name.
         This method will block until data is received or the timeout is reached.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            with self.condition:
-                if self.initial_data_received:
-                    return True
-                self.condition.wait(timeout=1)
-        return False
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.initial_data_received, timeout=timeout
+            )
 
     def __schedule_data_poll(self):
         """ "
@@ -119,6 +199,13 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
         """
         Send a data poll message to the web socket
         """
+        if self.__send_data_request():
+            self.__schedule_data_poll()
+
+    def __send_data_request(self):
+        """
+        Send a data request message to the web socket, returns False if it is not connected
+        """
         if self.ws.sock and self.ws.sock.connected:
             message = {
                 "type": "Data",
@@ -130,9 +217,23 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
             self.data_request_full = False
             self.ws.send(json.dumps(message))
             logging.info("Data poll message sent")
-            self.__schedule_data_poll()
-        else:
-            logging.error("Web socket is not connected, cannot send data poll message")
+            return True
+        logging.error("Web socket is not connected, cannot send data poll message")
+        return False
+
+    def request_update(self, timeout=10):
+        """
+        Request the pending updates now instead of waiting for the next data poll.
+        This method will block until the updates are applied or the timeout is reached.
+        """
+        with self.condition:
+            updates_received = self.updates_received
+        if not self.__send_data_request():
+            return False
+        with self.condition:
+            return self.condition.wait_for(
+                lambda: self.updates_received > updates_received, timeout=timeout
+            )
 
     def close(self):
         """
@@ -172,7 +273,14 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
             view_name,
             self.register_views[view_name],
         )
-        self.snapshots[view_name] = []
+        self.snapshots[view_name] = FidsSnapshot()
+
+    def register_index(self, view_name, field):
+        """
+        Index the rows of a registered view by field, so rows can be found by value in O(1).
+        """
+        with self.condition:
+            self.snapshots[view_name].add_index(field)
 
     def register_context(self, context):
         """
@@ -195,7 +303,7 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
         self, bank_name, view_name, data_row_count, table_row_cout, defined_position
     ):
         """register bank to an existing view"""
-        self.snapshots["bankStates"] = []
+        self.snapshots["bankStates"] = FidsSnapshot()
         self.banks[bank_name] = {
             "selectionId": view_name,
             "definedDataRowCount": data_row_count,
@@ -239,58 +347,21 @@ class FidsDataChannelWebSocket(WebSocketWrapper):
         with self.condition:
             for view in payload.get("data", []).keys():
                 current_data = self.snapshots.get(view)
+                touched = []
                 for iset in payload["data"][view]:
-                    self.__apply_deletes(current_data, iset)
-                    self.__apply_moves(current_data, iset)
-                    self.__apply_adds(current_data, iset)
-                    self.__apply_updates(current_data, iset)
-                    self.__apply_post_process(current_data)
+                    touched.extend(current_data.apply_instruction_set(iset))
+                self.__notify_subscriptions(view, current_data, touched)
             if self.initial_data_received is False:
                 self.initial_data_received = True
+            self.updates_received += 1
             self.condition.notify_all()
 
-    def __apply_post_process(self, current_data):
-        """Remove any None values from the list"""
-        while None in current_data:
-            current_data.remove(None)
-
-    def __apply_deletes(self, current_data, iset):
-        deletes = iset.get("D", None)
-        if deletes is not None:
-            for key in deletes:
-                idx = int(key)
-                if 0 <= idx < len(current_data):
-                    current_data[idx] = None
-
-    def __apply_moves(self, current_data, iset):
-        moves = iset.get("M", None)
-        if moves is not None:
-            for new_index, old_index in moves.items():
-                value = current_data[old_index]
-                current_data[old_index] = None
-                self.__list_insert(current_data, int(new_index), value)
-
-    def __apply_adds(self, current_data, iset):
-        adds = iset.get("N", None)
-        if adds is not None:
-            for index in adds:
-                self.__list_insert(current_data, int(index), adds[index])
-
-    def __apply_updates(self, current_data, iset):
-        updates = iset.get("U", None)
-        if updates is not None:
-            if isinstance(updates, list):  # on full requests its a list
-                for index, item in enumerate(updates):
-                    self.__list_insert(current_data, index, item)
-            else:
-                for index in updates:
-                    self.__list_insert(current_data, int(index), updates[index])
-
-    def __list_insert(self, lst, index, value):
-        """
-        Insert a value into a list at a specific index
-        """
-        if len(lst) <= index:
-            # If the index is greater than the length of the list, extend the list
-            lst.extend([None] * ((index + 1) - len(lst)))
-        lst[index] = value
+    def __notify_subscriptions(self, view, snapshot, touched):
+        """Evaluate the subscriptions of the view against the touched rows"""
+        subscriptions = self.subscriptions.get(view)
+        if subscriptions:
+            self.subscriptions[view] = [
+                subscription
+                for subscription in subscriptions
+                if not subscription.evaluate(snapshot, touched)
+            ]
@@ -38,6 +38,7 @@ def fids_open_data_channel(
     selection_rules,
     context=None,
     tables=None,
+    index_fields=None,
 ):
     """
     Open a FIDS data channel WebSocket and register views, tables, and context.
@@ -48,12 +49,14 @@ def fids_open_data_channel(
     | ``selection_rules`` | Dictionary mapping view names to selection rules.                   |
     | ``context``         | (Optional) Additional context to register.                          |
     | ``tables``          | (Optional) List of table objects to register.                       |
+    | ``index_fields``    | (Optional) Fields to index the rows of every view by (e.g. flightKey), finds on these fields are O(1). |
     | ``session_key``     | (Optional) Session key for the connection. Default is "defaultKey". |
 
     Other parameters are passed as couple key=value through ``**kwargs`` (keyword arguments).
 
     === Usage: ===
     | Open FIDS Data Channel    RobotDataChannelTest    monitor_name=RobotDataChannelMonitor    selection_rules={"arrivals": "select Arrivals where $airline.code == 'WN'"}
+    | Open FIDS Data Channel    RobotDataChannelTest    monitor_name=RobotDataChannelMonitor    selection_rules=${rules}    index_fields=flightKey
 
     """
     # pylint: disable = protected-access
@@ -73,8 +76,13 @@ def fids_open_data_channel(
         monitor_id=monitor_name,
     )
 
+    if isinstance(index_fields, str):
+        index_fields = [field.strip(" []\"'") for field in index_fields.split(",")]
+
     for view_name, rule in selection_rules.items():
         ws.register_view(view_name, rule)
+        for field in index_fields or []:
+            ws.register_index(view_name, field)
 
     if tables is not None:
         for table in tables:
@@ -99,7 +107,9 @@ def fids_open_data_channel(
 
 def fids_data_channel_find(ws, selection_rule_name, field, value, timeout=120):
     """
-    Wait for and return the first data item matching the field and value.
+    Wait for and return the data items matching the field and value.
+    The waiter is woken up as soon as an update of the view matches, the rows are found
+    through the index of the field when it is in the ``index_fields`` of the data channel.
 
     | *Arguments*            | *Description*                                  |
     | ``ws``                 | The FidsDataChannelWebSocket instance.         |
@@ -112,9 +122,7 @@ def fids_data_channel_find(ws, selection_rule_name, field, value, timeout=120):
     | Find Data Channel Item    ${data_socket}    selection_rule_name=arrivals    field=flightKey    value=XYZA_1234_DEPARTURE
 
     """
-    return ws.wait_for_data(
-        selection_rule_name, lambda item: item.get(field) == value, timeout
-    )
+    return ws.wait_for_field(selection_rule_name, field, value, timeout)
 
 
 def fids_data_channel_empty(ws, selection_rule_name, timeout=120):
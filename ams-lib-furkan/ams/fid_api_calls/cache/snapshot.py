@@ -0,0 +1,154 @@
+"""Snapshot of a FIDS data channel view, updated from the instruction sets of the data service"""
+
+from itertools import repeat
+
+# pylint: disable=line-too-long
+
+
+class FidsSnapshot(list):
+    """
+    List of the rows of a view as the Rendering Engine data service holds them.
+
+    An instruction set is applied as the Rendering Engine does:
+        - D: the rows at the given indexes are removed
+        - M: {new index: old index} the rows are moved, in order
+        - N: {index: row} the rows are set at the given indexes
+        - U: {index: row} (or a list of rows on full requests) the rows are replaced
+    Deleted and moved rows leave a hole which is removed once the whole instruction set is
+    applied, so applying an instruction set is a single pass over the rows.
+
+    Rows can be indexed by field (e.g. flightKey) with add_index, the indexes are updated
+    with the rows touched by each instruction set.
+    """
+
+    def __init__(self, rows=(), index_fields=()):
+        super().__init__(rows)
+        # field -> value -> {id(row): row}
+        self.indexes = {}
+        for field in index_fields:
+            self.add_index(field)
+
+    def add_index(self, field):
+        """
+        Indexes the rows by the value of the field.
+        """
+        index = {}
+        for row in self:
+            _index_row(index, field, row)
+        self.indexes[field] = index
+
+    def find(self, field, value):
+        """
+        Returns the rows where the field has the value, using the index of the field if any.
+        Rows found through an index are in the order they were received.
+        """
+        index = self.indexes.get(field)
+        if index is not None:
+            try:
+                return list(index.get(value, {}).values())
+            except TypeError:
+                # unhashable values are not indexed
+                pass
+        return [row for row in self if row.get(field) == value]
+
+    def apply_instruction_set(self, iset):
+        """
+        Applies the instruction set to the snapshot.
+
+        Returns:
+            list: The rows added, moved or updated by the instruction set.
+        """
+        holes = False
+        touched = []
+        removed = []
+
+        deletes = iset.get("D")
+        if deletes:
+            length = len(self)
+            for key in deletes:
+                index = int(key)
+                if 0 <= index < length:
+                    if self[index] is not None:
+                        removed.append(self[index])
+                    self[index] = None
+                    holes = True
+
+        moves = iset.get("M")
+        if moves:
+            for new_index, old_index in moves.items():
+                value = self[old_index]
+                self[old_index] = None
+                self._set_rows([(int(new_index), value)], touched, removed)
+            holes = True
+
+        adds = iset.get("N")
+        if adds:
+            holes |= self._set_rows(
+                [(int(index), value) for index, value in adds.items()], touched, removed
+            )
+
+        updates = iset.get("U")
+        if updates:
+            if isinstance(updates, list):  # on full requests its a list
+                holes |= self._set_rows(list(enumerate(updates)), touched, removed)
+            else:
+                holes |= self._set_rows(
+                    [(int(index), value) for index, value in updates.items()],
+                    touched,
+                    removed,
+                )
+
+        if holes:
+            self[:] = [row for row in self if row is not None]
+        if self.indexes:
+            self._update_indexes(touched, removed)
+        return touched
+
+    def _set_rows(self, rows, touched, removed):
+        """
+        Sets the rows at their indexes, extending the snapshot once if needed.
+        Returns True if the snapshot may contain holes.
+        """
+        length = len(self)
+        last_index = max(index for index, _value in rows)
+        extended = last_index >= length
+        if extended:
+            self.extend(repeat(None, last_index + 1 - length))
+        holes = extended
+        for index, value in rows:
+            previous = self[index]
+            if previous is not None and previous is not value:
+                removed.append(previous)
+            self[index] = value
+            if value is None:
+                holes = True
+            else:
+                touched.append(value)
+        return holes
+
+    def _update_indexes(self, touched, removed):
+        touched_ids = {id(row) for row in touched}
+        for field, index in self.indexes.items():
+            for row in removed:
+                if id(row) not in touched_ids:
+                    _unindex_row(index, field, row)
+            for row in touched:
+                _index_row(index, field, row)
+
+
+def _index_row(index, field, row):
+    try:
+        index.setdefault(row.get(field), {})[id(row)] = row
+    except TypeError:
+        pass
+
+
+def _unindex_row(index, field, row):
+    try:
+        rows = index.get(row.get(field))
+    except TypeError:
+        return
+    if rows is not None:
+        rows.pop(id(row), None)
+        if not rows:
+            del index[row.get(field)]
@@ -5,7 +5,6 @@ import threading
 
 import json
 import logging
-import time
 from ams.data_model.common_libs.clients.web_socket_client import WebSocketWrapper
 from ams.data_model.common_libs.utils.airport_data_generator import (
     GenerateAirportData as Gad,
@@ -56,6 +55,14 @@ class FidsCommandChannelWebSocket(WebSocketWrapper):
                 self.commands.append(msg["payload"])
                 self.condition.notify_all()
 
+    def on_open(self, ws):
+        """
+        Wake up the threads waiting for the connection
+        """
+        super().on_open(ws)
+        with self.condition:
+            self.condition.notify_all()
+
     def on_close(self, ws):
         if self.poll_thread is not None and self.poll_thread.is_alive():
             self.poll_thread.cancel()
@@ -65,26 +72,20 @@ class FidsCommandChannelWebSocket(WebSocketWrapper):
         """
         Waits for a command connected to the server
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            with self.condition:
-                if self.connnected:
-                    return True
-                self.condition.wait(timeout=1)
+        with self.condition:
+            if self.condition.wait_for(lambda: self.connnected, timeout=timeout):
+                return True
         return None
 
     def wait_for_command(self, timeout=120):
         """
         Waits for a command to be received from the web socket.
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            with self.condition:
-                if len(self.commands) > 0:
-                    commands = self.commands
-                    self.commands = []  # reset
-                    return commands
-                self.condition.wait(timeout=1)
+        with self.condition:
+            if self.condition.wait_for(lambda: len(self.commands) > 0, timeout=timeout):
+                commands = self.commands
+                self.commands = []  # reset
+                return commands
         return None
 
     def __schedule_cmd_poll(self):
@@ -3,15 +3,56 @@ This module contains the injector to fetch fids backend tables (controllers/layo
 """
 
 import logging
-import protocols.broker
 from protocols import session_manager
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    get_security_context,
+    send_request,
+)
+from ams.data_model.common_libs.clients.http_cache import invalidate_cache
 from ams.data_model.common_libs.utils.airport_data_generator import (
     GenerateAirportData as Gad,
 )
-from .injector_rest import injector as rest_injector
+from .injector_rest import FIDS_ENDPOINTS, _build_rest_details
 
 # pylint: disable=line-too-long
 
+REFERENCE_VIEW_PREFIX = "RefDelegateBean."
+
+
+def _fids_sessions():
+    """
+    Returns the (FIDS session cookie, FIDS tab instance id) of every session key logged in
+    to FIDS during the AMS session
+    """
+    # pylint: disable=protected-access
+    context_data = session_manager.sessions._get_session_context_data()
+    return context_data["test_context"].setdefault("fids_sessions", {})
+
+
+def _add_fids_headers(session_key, fids_session):
+    """
+    Adds the FIDS cookie and tab instance id of the session key to the headers of its
+    security context, e.g. again after a pooled session was logged in again
+    """
+    fids_session_cookie, instance_id = fids_session
+    header = get_security_context(session_key)["header"]
+    cookie = header.get("Cookie")
+    if cookie is None:
+        header["Cookie"] = fids_session_cookie
+    elif fids_session_cookie and fids_session_cookie not in cookie:
+        header["Cookie"] = cookie + "; " + fids_session_cookie
+    header["APT_AEP_INSTANCE_ID"] = instance_id
+
+
+def _fids_call(kwargs, session_key="defaultKey"):
+    """
+    Sends a FIDS call through the pooled REST transport
+    """
+    fids_session = _fids_sessions().get(session_key)
+    if fids_session is not None:
+        _add_fids_headers(session_key, fids_session)
+    return send_request(_build_rest_details(kwargs, session_key), session_key)
+
 
 def fids_login(session_key="defaultKey", **kwargs):
     """
@@ -27,38 +68,25 @@ def fids_login(session_key="defaultKey", **kwargs):
 
     """
     kwargs["endpoint_type"] = "login"
+    _fids_sessions().pop(session_key, None)
 
     instance_id = Gad.generate_correlation_id(32)
     kwargs["headers"] = {"APT_AEP_INSTANCE_ID": instance_id}
-    login_response = protocols.broker.injector(kwargs, session_key, rest_injector)
+    login_response = _fids_call(kwargs, session_key)
 
     # pylint: disable=protected-access
-    rest_details = protocols.session_manager.sessions._get_security_context_details(
-        session_key
-    )
-
-    fids_session_cookie = login_response.headers.get("Set-Cookie")
-
-    context_data = protocols.session_manager.sessions._get_session_context_data()
-    context_data["test_context"]["fids_session_cookie"] = fids_session_cookie
-    context_data["test_context"]["web_sockets"] = []
-
-    # Add the fids jsessionid to the cookie header for all requests
-    if rest_details["header"]["Cookie"] is None:
-        rest_details["header"]["Cookie"] = login_response.headers.get("Set-Cookie")
-    else:
-        rest_details["header"]["Cookie"] = (
-            rest_details["header"]["Cookie"] + "; " + fids_session_cookie
-        )
+    context_data = session_manager.sessions._get_session_context_data()
+    context_data["test_context"].setdefault("web_sockets", [])
 
-    # Add the fids tab instance id to the headers for all requests
-    rest_details["header"]["APT_AEP_INSTANCE_ID"] = instance_id
+    # Add the fids jsessionid to the cookie header and the fids tab instance id to the
+    # headers of all the requests of the session key, pooled sessions included
+    fids_session = (login_response.headers.get("Set-Cookie"), instance_id)
+    _fids_sessions()[session_key] = fids_session
+    _add_fids_headers(session_key, fids_session)
 
     # Lookup which airport the fids server wants back
     kwargs["endpoint_type"] = "functions"
-    functions_response = protocols.broker.injector(
-        kwargs, session_key, rest_injector
-    ).json()
+    functions_response = _fids_call(kwargs, session_key).json()
     context_data["test_context"]["fids_home_airport"] = functions_response["results"][
         "ref_airport_icao"
     ]
@@ -69,28 +97,24 @@ def fids_login(session_key="defaultKey", **kwargs):
 def fids_get_home_airport():
     """Get from the context the home airport the FIDS will not reject"""
     # pylint: disable = protected-access
-    context_data = protocols.session_manager.sessions._get_session_context_data()
+    context_data = session_manager.sessions._get_session_context_data()
     return context_data["test_context"]["fids_home_airport"]
 
 
 def fids_logout(session_key="defaultKey", **kwargs):
     """this also logouts with AAA"""
     kwargs["endpoint_type"] = "logout"
-    protocols.broker.injector(kwargs, session_key, rest_injector)
+    _fids_call(kwargs, session_key)
 
-    # pylint: disable=protected-access
-    rest_details = protocols.session_manager.sessions._get_security_context_details(
-        session_key
-    )
-
-    context_data = protocols.session_manager.sessions._get_session_context_data()
-    fids_session_cookie = context_data["test_context"]["fids_session_cookie"]
+    header = get_security_context(session_key)["header"]
+    fids_session_cookie = _fids_sessions().pop(session_key, (None, None))[0]
 
     # remove fids headers
-    if rest_details["header"]["Cookie"] is not None:
-        rest_details["header"]["Cookie"].replace(fids_session_cookie, "")
+    if header.get("Cookie") is not None and fids_session_cookie:
+        cookie = header["Cookie"].replace("; " + fids_session_cookie, "")
+        header["Cookie"] = cookie.replace(fids_session_cookie, "") or None
 
-    rest_details["header"]["APT_AEP_INSTANCE_ID"] = None
+    header["APT_AEP_INSTANCE_ID"] = None
 
 
 def fids_get_ui_updates(session_key="defaultKey", **kwargs):
@@ -107,7 +131,7 @@ def fids_get_ui_updates(session_key="defaultKey", **kwargs):
 
     """
     kwargs["endpoint_type"] = "updates"
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
 
 
 def fids_close_ui_updates(session_key="defaultKey", **kwargs):
@@ -124,7 +148,7 @@ def fids_close_ui_updates(session_key="defaultKey", **kwargs):
 
     """
     kwargs["endpoint_type"] = "close"
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
 
 
 def __base_get_data(view, fields, session_key="defaultKey", **kwargs):
@@ -134,7 +158,9 @@ def __base_get_data(view, fields, session_key="defaultKey", **kwargs):
     kwargs["endpoint_type"] = "read"
     kwargs["view"] = view
     kwargs["fields"] = fields
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    # the reference views (code tables, languages...) are revalidated with a conditional GET
+    kwargs.setdefault("cache", view.startswith(REFERENCE_VIEW_PREFIX))
+    return _fids_call(kwargs, session_key)
 
 
 def __base_save_data(view, fields, entity, session_key="defaultKey", **kwargs):
@@ -152,7 +178,8 @@ def __base_save_data(view, fields, entity, session_key="defaultKey", **kwargs):
 
     kwargs["entity"] = entity
 
-    response = protocols.broker.injector(kwargs, session_key, rest_injector)
+    response = _fids_call(kwargs, session_key)
+    invalidate_cache(FIDS_ENDPOINTS["read"])
     __add_to_automatic_clean_up(response=response, **kwargs)
     return response
 
@@ -217,7 +244,8 @@ def __base_delete_data(view, fields, entity, session_key="defaultKey", **kwargs)
             entity[field] = kwargs.get(field)
 
     kwargs["entity"] = entity
-    response = protocols.broker.injector(kwargs, session_key, rest_injector)
+    response = _fids_call(kwargs, session_key)
+    invalidate_cache(FIDS_ENDPOINTS["read"])
 
     # remove from the clean up list if successful
     result = fids_get_response_result(response)
@@ -235,7 +263,7 @@ def __base_execute_function(
     kwargs["endpoint_type"] = "execute_function"
     kwargs["function"] = function_name
     kwargs["parameters"] = parameters
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
 
 
 def __integer_parameter(value):
@@ -293,7 +321,7 @@ def web_socket_cleanup():
 
     """
     # pylint: disable = protected-access
-    context_data = protocols.session_manager.sessions._get_session_context_data()
+    context_data = session_manager.sessions._get_session_context_data()
     websockets = context_data["test_context"].get("web_sockets")
     if websockets is not None:
         for item in websockets:
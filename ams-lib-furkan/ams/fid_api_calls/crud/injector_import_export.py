@@ -1,8 +1,7 @@
 """Injector for FIDS import/export keywords"""
 
 import os
-import protocols.broker
-from ams.fid_api_calls.crud.injector_rest import injector as rest_injector
+from ams.fid_api_calls.crud.injector import _fids_call
 
 # pylint: disable=line-too-long
 
@@ -21,7 +20,7 @@ def fids_download_template(session_key="defaultKey", **kwargs):
 
     """
     kwargs["endpoint_type"] = "download_template"
-    response = protocols.broker.injector(kwargs, session_key, rest_injector)
+    response = _fids_call(kwargs, session_key)
     return response
 
 
@@ -47,7 +46,7 @@ def fids_export(views, session_key="defaultKey", **kwargs):
     """
     kwargs["endpoint_type"] = "export"
     kwargs["parameters"] = {"exportViews": views}
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
 
 
 def __base_import_file(
@@ -85,7 +84,7 @@ def __base_import_file(
     kwargs["file_name"] = file_name
     kwargs["content_type"] = content_type
     kwargs["parameters"] = {"persistData": persist_data, "partial": partial}
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
 
 
 def fids_import_template(
@@ -176,4 +175,4 @@ def fids_import_poll(token, session_key="defaultKey", **kwargs):
     """
     kwargs["endpoint_type"] = "import_poll"
     kwargs["parameters"] = {"token": token}
-    return protocols.broker.injector(kwargs, session_key, rest_injector)
+    return _fids_call(kwargs, session_key)
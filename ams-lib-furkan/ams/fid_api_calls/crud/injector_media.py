@@ -1,13 +1,12 @@
 """Injector for FIDS media keywords"""
 
 import os
-import protocols.broker
 from ams.fid_api_calls.crud.injector import (
     __add_to_automatic_clean_up,
     __base_get_data,
     __base_save_data,
     __base_delete_data,
-    rest_injector,
+    _fids_call,
 )
 
 # pylint: disable=line-too-long
@@ -87,7 +86,7 @@ def fids_media_upload(
     kwargs["file_name"] = file_name
     kwargs["content_type"] = content_type
 
-    response = protocols.broker.injector(kwargs, session_key, rest_injector)
+    response = _fids_call(kwargs, session_key)
     kwargs["view"] = MEDIA_VIEW_NAME
     kwargs["fields"] = MEDIA_FIELDS
     __add_to_automatic_clean_up(response, **kwargs)
@@ -33,10 +33,9 @@ FIDS_ENDPOINTS = {
 }
 
 
-@RestInjector
-def injector(kwargs, session_key="defaultKey"):
+def _build_rest_details(kwargs, session_key="defaultKey"):
     """
-    REST injector
+    Builds the REST details of a FIDS call
 
     # arguments can be passed from the main injector.py
     arg1 = kwargs["args1"]
@@ -138,8 +137,18 @@ def injector(kwargs, session_key="defaultKey"):
         "headers": headers,
         "data": payload,
         "files": files,
+        # code tables and other reference views, revalidated with a conditional GET
+        "cache": bool(kwargs.get("cache")) and operation == "GET",
     }
 
     LOGGER.debug("REST Details for the FIDS call: %s", rest_details)
 
     return rest_details
+
+
+@RestInjector
+def injector(kwargs, session_key="defaultKey"):
+    """
+    REST injector
+    """
+    return _build_rest_details(kwargs, session_key)
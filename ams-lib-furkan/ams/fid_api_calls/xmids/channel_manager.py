@@ -0,0 +1,119 @@
+"""
+Long lived FIDS data channels serving the xMIDS queries.
+
+The context of a data channel (e.g. MONITOR.resourceName) is sent once when it registers,
+so there is one channel per context. All the selection rules queried with a context are
+registered as views of its channel, and repeated queries are served from the live
+snapshots instead of opening a new web socket each time.
+"""
+
+# pylint: disable=line-too-long
+
+import json
+import logging
+import threading
+from ams.fid_api_calls.cache.injector import (
+    fids_open_data_channel,
+    fids_close_data_channel,
+)
+from ams.fid_api_calls.crud.injector_rules import fids_selection_rule_get_by_name
+
+LOGGER = logging.getLogger(__name__)
+
+
+class XmidsChannel:
+    """A data channel opened for one context, with the selection rules registered as views"""
+
+    def __init__(self, ws, rules):
+        self.ws = ws
+        # rule name -> selection rule
+        self.rules = rules
+
+    def is_alive(self):
+        """Returns True while the web socket is connected"""
+        return self.ws.is_connected()
+
+
+class XmidsChannelManager:
+    """
+    Opens and reuses the data channels of the xMIDS queries.
+    Selection rules are fetched once by name.
+    """
+
+    def __init__(
+        self, controller_name="ROBOT", monitor_name="ROBOT_XMIDS", refresh_timeout=10
+    ):
+        self.controller_name = controller_name
+        self.monitor_name = monitor_name
+        self.refresh_timeout = refresh_timeout
+        self.lock = threading.Lock()
+        # rule name -> selection rule
+        self.selection_rules = {}
+        # context key -> XmidsChannel
+        self.channels = {}
+
+    def get_selection_rule(self, rule_name, session_key="defaultKey", **kwargs):
+        """Returns the selection rule of the name, fetched once"""
+        rule = self.selection_rules.get(rule_name)
+        if rule is None:
+            response = fids_selection_rule_get_by_name(rule_name, session_key, **kwargs)
+            # if there is an error here the selection rule is not in the system
+            rule = response.json()["results"][0]["fdrClearRule"]
+            self.selection_rules[rule_name] = rule
+        return rule
+
+    def query(self, rule_names, context, session_key="defaultKey", **kwargs):
+        """
+        Returns the snapshots of the selection rules for the context, in the order of the names.
+
+        The channel of the context is opened on the first query. A following query asks the
+        live channel for its pending updates, the channel is only opened again when it has
+        been closed or a selection rule is not registered yet.
+        """
+        key = json.dumps(context, sort_keys=True, default=str)
+        with self.lock:
+            rules = {
+                name: self.get_selection_rule(name, session_key, **kwargs)
+                for name in rule_names
+            }
+            channel = self.channels.get(key)
+            if (
+                channel is not None
+                and channel.is_alive()
+                and all(name in channel.rules for name in rules)
+            ):
+                if not channel.ws.request_update(self.refresh_timeout):
+                    LOGGER.warning(
+                        "No update received on the xMIDS data channel, using the current snapshot"
+                    )
+            else:
+                if channel is not None:
+                    # keep serving the selection rules already registered for the context
+                    fids_close_data_channel(channel.ws)
+                    rules = {**channel.rules, **rules}
+                channel = self.__open_channel(context, rules)
+                self.channels[key] = channel
+            return [channel.ws.get_snapshot(_view_name(name)) for name in rule_names]
+
+    def close(self):
+        """Close all the data channels"""
+        with self.lock:
+            for channel in self.channels.values():
+                fids_close_data_channel(channel.ws)
+            self.channels.clear()
+
+    def __open_channel(self, context, rules):
+        LOGGER.info("Opening xMIDS data channel for %s", context)
+        ws = fids_open_data_channel(
+            controller_name=self.controller_name,
+            monitor_name=self.monitor_name,
+            selection_rules={_view_name(name): rule for name, rule in rules.items()},
+            context=context,
+        )
+        ws.wait_for_initial_data()
+        return XmidsChannel(ws, rules)
+
+
+def _view_name(rule_name):
+    """Returns the view name registered for the selection rule"""
+    return "robot_" + rule_name.lower().replace(" ", "_")
@@ -4,33 +4,52 @@ This module contains the injector to fetch fids backend tables (controllers/layo
 
 import locale
 from functools import cmp_to_key
-from ams.fid_api_calls.cache.injector import (
-    fids_open_data_channel,
-    fids_close_data_channel,
-)
-from ams.fid_api_calls.crud.injector_rules import fids_selection_rule_get_by_name
+from protocols import session_manager
+from ams.fid_api_calls.xmids.channel_manager import XmidsChannelManager
 
 # pylint: disable=line-too-long
 
 
+def __fids_xmids_channel_manager():
+    # pylint: disable = protected-access
+    test_context = session_manager.sessions._get_session_context_data()["test_context"]
+    manager = test_context.get("xmids_channel_manager")
+    if manager is None:
+        manager = XmidsChannelManager()
+        test_context["xmids_channel_manager"] = manager
+    return manager
+
+
+def __fids_xmids_query_cache_by_selection_rule_names(
+    rule_names, context, session_key, **kwargs
+):
+    return __fids_xmids_channel_manager().query(
+        rule_names, context, session_key, **kwargs
+    )
+
+
 def __fids_xmids_query_cache_by_selection_rule_name(
     rule_name, context, session_key, **kwargs
 ):
-    response = fids_selection_rule_get_by_name(rule_name, session_key, **kwargs)
-    # if there is an error here the selection rule is not in the system
-    flights_selection = response.json()["results"][0]["fdrClearRule"]
-
-    selection_rules = {"robot_rule": flights_selection}
-    # use the selection rules to query the cache
-    ws = fids_open_data_channel(
-        controller_name="ROBOT",
-        monitor_name="ROBOT_XMIDS",
-        selection_rules=selection_rules,
-        context=context,
-    )
-    ws.wait_for_initial_data()
-    fids_close_data_channel(ws)
-    return ws.get_snapshot("robot_rule")
+    return __fids_xmids_query_cache_by_selection_rule_names(
+        [rule_name], context, session_key, **kwargs
+    )[0]
+
+
+def fids_xmids_close_channels():
+    """
+    Close the data channels kept open to serve the xMIDS queries.
+    They are also closed by ``Web Socket Cleanup``.
+
+    === Usage: ===
+    | Fids Xmids Close Channels
+
+    """
+    # pylint: disable = protected-access
+    test_context = session_manager.sessions._get_session_context_data()["test_context"]
+    manager = test_context.pop("xmids_channel_manager", None)
+    if manager is not None:
+        manager.close()
 
 
 def fids_cmid_alloctions_get(counter, session_key="defaultKey", **kwargs):
@@ -47,14 +66,9 @@ def fids_cmid_alloctions_get(counter, session_key="defaultKey", **kwargs):
     | Get CMID Allocations    counter=COUNTER1
 
     """
-    dedicated = __fids_xmids_query_cache_by_selection_rule_name(
-        "xMIDS Counter Flights",
-        {"MONITOR.resourceName": counter},
-        session_key,
-        **kwargs
-    )
-    common = __fids_xmids_query_cache_by_selection_rule_name(
-        "xMIDS Counter Common Allocations",
+    # both selection rules are registered on the data channel of the counter
+    dedicated, common = __fids_xmids_query_cache_by_selection_rule_names(
+        ["xMIDS Counter Flights", "xMIDS Counter Common Allocations"],
         {"MONITOR.resourceName": counter},
         session_key,
         **kwargs
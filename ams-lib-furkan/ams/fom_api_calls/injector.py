@@ -2,7 +2,11 @@
 
 import logging
 from protocols import session_manager
-from ams.data_model.common_libs.injectors.injector import _http_call_and_check
+from ams.data_model.common_libs.injectors.injector import (
+    _http_call_and_check,
+    _http_call_pages,
+)
+from ams.data_model.common_libs.utils.pagination import PageNumberPaging
 
 LOGGER = logging.getLogger(__name__)
 
@@ -152,7 +156,54 @@ def fom_v4_visits_searches():
         .get("searches")
     )
 
-    kwargs = {
+    response_json = _http_call_and_check(fom_endpoint, **_visits_searches_kwargs())
+    return response_json
+
+
+def fom_v4_visits_searches_items(page_size=100, prefetch=False):
+    """
+    Iterates over the visits found by the FOM v4 visits search, page by page.
+
+    This function calls the endpoint /fom/rest-services/v4/visits/searches with the query parameters of Fom V4 Visits Searches,
+    plus ``page`` and ``size``. The next page is requested when the visits of the current page are consumed.
+
+    | *Arguments*                      | *Description*                                                                         |
+    |----------------------------------|---------------------------------------------------------------------------------------|
+    | ``page_size``                    | Number of visits per page                                                             |
+    | ``prefetch``                     | If the next page should be requested while the visits of the current page are processed |
+
+    === Usage: ===
+    | ${visits}=    Fom V4 Visits Searches Items    page_size=200
+    | FOR    ${visit}    IN    @{visits}
+    |     Log    ${visit}
+    | END
+
+    === Returns: ===
+    | iterator | The visits (``content`` of every page).
+
+    === Raises: ===
+    | ValueError | If the response status code of a page is not 200 or 204, or if its generalProcessingStatus is not "OK".
+    """
+    context_data = session_manager.sessions._get_session_context_data()
+    fom_endpoint = (
+        context_data.get("end_points", {})
+        .get("fom", {})
+        .get("visits", {})
+        .get("searches")
+    )
+
+    paging = PageNumberPaging(page_size=page_size, items_path="content")
+    return _http_call_pages(
+        fom_endpoint,
+        paging,
+        prefetch=prefetch,
+        check=True,
+        **_visits_searches_kwargs(),
+    )
+
+
+def _visits_searches_kwargs():
+    return {
         "operation": "POST",
         "query_params": {
             "start-date": "20250523T184855Z",
@@ -164,6 +215,3 @@ def fom_v4_visits_searches():
             "fetchTowSourceAttributes": "false",
         },
     }
-
-    response_json = _http_call_and_check(fom_endpoint, **kwargs)
-    return response_json
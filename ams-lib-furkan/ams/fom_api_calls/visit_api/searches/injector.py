@@ -4,6 +4,7 @@ This module contains the injector to get movement id details
 """
 
 import protocols.broker
+from ams.data_model.common_libs.utils.json_stream import loads
 from .injector_rest import injector as rest_injector
 
 
@@ -35,7 +36,7 @@ def fom_searches(flight_number, start_date, end_date):
 
     # TODO VC: put code in helper class
 
-    response_json = response.json()
+    response_json = loads(response.content)
 
     if response_json.get("generalProcessingStatus", "") == "Error":
         message = "-"
@@ -45,4 +46,4 @@ def fom_searches(flight_number, start_date, end_date):
             )
         raise ValueError(f"Error in response from FOM: {message}")
 
-    return response.json()["content"]
+    return response_json["content"]
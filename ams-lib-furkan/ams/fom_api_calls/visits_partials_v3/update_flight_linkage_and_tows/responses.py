@@ -14,22 +14,24 @@ from ams.data_model.common_libs.request_response_handler.response_validator impo
 LOGGER = logging.getLogger(__name__)
 
 
-def validate_visits_partial_response_schema(response):
+def validate_visits_partial_response_schema(response, fields=None):
     """
     Validates the response schema of FOM Visits Partials API call.
 
     | *Arguments*                | *Description*                                                                  |
     | ``response``               | response object from call to Visits Partials API keywords                      |
+    | ``fields``                 | optional list of top level fields to validate (fast path), all by default      |
 
 
     === Usage: ===
     | Validate Visits Partials Response Schema    response=${response}                                           |
+    | Validate Visits Partials Response Schema    response=${response}    fields=${fields}
     """
     response_json = response.json()
     schema_name = "visits_partials_response_schema.json"
 
     try:
-        load_and_validate_response_schema(__file__, schema_name, response_json)
+        load_and_validate_response_schema(__file__, schema_name, response_json, fields)
     except JSONDecodeError as e:
         LOGGER.warning("There is no JSON object in the response: %s", e)
 
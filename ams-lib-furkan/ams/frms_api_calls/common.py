@@ -1,25 +1,42 @@
-import protocols.broker
-from .injector_rest import injector as rest_injector
+from ams.data_model.common_libs.clients.ams_rest_client import send_request
+from ams.data_model.common_libs.utils.json_stream import (
+    iter_response_items,
+    loads,
+    stream_option,
+)
+from .injector_rest import _build_rest_details
 
 # pylint: disable=line-too-long
 
 
-def _frms_call(operation, endpoint, payload=None, content_type="application/json"):
+def _frms_call(
+    operation, endpoint, payload=None, content_type="application/json", stream=None
+):
     args = {
         "operation": operation,
         "headers": {"Content-Type": content_type},
         "path": f"/rm/services{endpoint}",
         "payload": payload,
     }
-    response = protocols.broker.injector(args, "defaultKey", rest_injector)
+    rest_details = _build_rest_details(args)
+    stream = stream_option(stream)
+    if stream:
+        rest_details["stream"] = True
+    response = send_request(rest_details, "defaultKey")
 
     if response.status_code != 200 and response.status_code != 204:
+        response.close()
         raise ValueError(f"Call to {args} failed with status {response.status_code}")
 
     if response.status_code == 204:
+        response.close()
         return None
 
-    response_json = response.json()
+    if stream:
+        # error messages are only returned in objects, not in streamed lists
+        return iter_response_items(response, stream)
+
+    response_json = loads(response.content)
 
     # Check response does not contain error message
     if "messages" in response_json and len(response_json["messages"]) > 0:
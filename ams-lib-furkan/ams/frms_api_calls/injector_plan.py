@@ -4,16 +4,19 @@ from ams.frms_api_calls.common import _frms_call
 # pylint: disable=line-too-long
 
 
-def frms_get_plans():
+def frms_get_plans(stream=False):
     """
     Get FRMS Plans
-                                                    |
+
+    | *Arguments*                       | *Description*                                                        |
+    | ``stream``                        | (Optional) return an iterator over the plans, decoded while the response is received |
 
     === Usage: ===
     | Frms Get Plans
+    | Frms Get Plans    stream=${True}
 
     """
-    return _frms_call("GET", "/plans/list")
+    return _frms_call("GET", "/plans/list", stream=stream)
 
 
 def frms_get_plan_by_id(plan_id):
@@ -7,8 +7,10 @@ LOGGER = logging.getLogger(__name__)
 # pylint: disable=unused-argument, unused-variable, protected-access
 
 
-@RestInjector
-def injector(kwargs, session_key):
+def _build_rest_details(kwargs, session_key="defaultKey"):
+    """
+    Builds the REST details of a FRMS call
+    """
 
     is_form_url_encoded = (
         kwargs.get("headers", {}).get("Content-Type", None)
@@ -28,3 +30,8 @@ def injector(kwargs, session_key):
     LOGGER.debug("REST Details: %s", rest_details)
 
     return rest_details
+
+
+@RestInjector
+def injector(kwargs, session_key):
+    return _build_rest_details(kwargs, session_key)
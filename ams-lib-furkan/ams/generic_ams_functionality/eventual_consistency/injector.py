@@ -0,0 +1,116 @@
+"""This injector module houses the keywords to wait for eventually consistent data"""
+
+from robot.libraries.BuiltIn import BuiltIn
+from robot.utils import timestr_to_secs
+from ams.data_model.common_libs.utils.backoff import (
+    DEFAULT_INITIAL_INTERVAL,
+    DEFAULT_JITTER,
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MULTIPLIER,
+    DEFAULT_TIMEOUT,
+    STATISTICS,
+    BackoffPolicy,
+    wait_until_succeeds,
+)
+from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
+
+# pylint: disable=line-too-long
+
+
+def _seconds(value, variable, default):
+    if value is None:
+        value = get_variable_value(variable, default)
+    return timestr_to_secs(value)
+
+
+def wait_until_ams_keyword_succeeds_with_backoff(
+    keyword,
+    *args,
+    timeout=None,
+    initial_interval=None,
+    max_interval=None,
+    probe=None,
+):
+    """
+    Runs the keyword until it succeeds, waiting longer and longer between the attempts.
+
+    The delay starts at ``initial_interval`` and doubles after every failed attempt, up to
+    ``max_interval``, with a random jitter. The keyword is attempted until ``timeout``.
+    When a ``probe`` is given, this cheap keyword is run first and the keyword is only run
+    once the probe succeeds and returns a true value.
+    The attempts and time of every wait are kept per keyword, see `Get Wait Statistics`.
+
+    | *Arguments*            | *Description*                                                                |
+    | ``keyword``            | Keyword to run.                                                              |
+    | ``*args``              | Arguments of the keyword.                                                    |
+    | ``timeout``            | (Optional) Deadline of the wait. Default is ``AMS_RETRY_TIMEOUT`` (30s).     |
+    | ``initial_interval``   | (Optional) First delay. Default is ``AMS_RETRY_INITIAL_INTERVAL`` (0.5s).    |
+    | ``max_interval``       | (Optional) Maximum delay. Default is ``AMS_RETRY_MAX_INTERVAL`` (5s).        |
+    | ``probe``              | (Optional) List with the probe keyword and its arguments.                    |
+
+    == Return value ==
+    | the result of the keyword
+
+    === Usage: ===
+    | ${visit}    Wait Until Ams Keyword Succeeds With Backoff    Frms Find Visit By Plan Id    ${plan_id}    ${flight_id}    timeout=1 min
+    | ${probe}    Create List    Fom Searches    flight_number=${flight_number}    start_date=${start}    end_date=${end}
+    | ${visit}    Wait Until Ams Keyword Succeeds With Backoff    Fom Find Visit    ${airline}    ${flight_number}    ${start}    ${end}    probe=${probe}
+    """
+    built_in = BuiltIn()
+    policy = BackoffPolicy(
+        initial_interval=_seconds(
+            initial_interval, "AMS_RETRY_INITIAL_INTERVAL", DEFAULT_INITIAL_INTERVAL
+        ),
+        max_interval=_seconds(max_interval, "AMS_RETRY_MAX_INTERVAL", DEFAULT_MAX_INTERVAL),
+        multiplier=DEFAULT_MULTIPLIER,
+        jitter=DEFAULT_JITTER,
+    )
+
+    probe_function = None
+    if probe:
+        probe_keyword, *probe_args = probe
+
+        def probe_function():
+            return built_in.run_keyword(probe_keyword, *probe_args)
+
+    return wait_until_succeeds(
+        lambda: built_in.run_keyword(keyword, *args),
+        probe=probe_function,
+        timeout=_seconds(timeout, "AMS_RETRY_TIMEOUT", DEFAULT_TIMEOUT),
+        policy=policy,
+        name=keyword,
+        # syntax errors and fatal errors are not retried, as with Wait Until Keyword Succeeds
+        retry_error=lambda error: not getattr(error, "dont_continue", False),
+    )
+
+
+def get_wait_statistics():
+    """
+    Returns the attempts and durations of the waits per keyword.
+
+    Every keyword has the following counters:
+    | ``waits``                | number of waits                                      |
+    | ``failures``             | number of waits which reached their timeout          |
+    | ``attempts``             | total number of attempts                             |
+    | ``max_attempts``         | maximum number of attempts of a wait                 |
+    | ``total_time``           | total time of the waits in seconds                   |
+    | ``max_time``             | maximum time of a wait in seconds                    |
+    | ``average_time``         | average time of a wait in seconds                    |
+
+    == Return value ==
+    | dict keyword -> counters
+
+    == Usage ==
+    | ${statistics}=    Get Wait Statistics
+    """
+    return STATISTICS.snapshot()
+
+
+def reset_wait_statistics():
+    """
+    Resets the attempts and durations of the waits.
+
+    == Usage ==
+    | Reset Wait Statistics
+    """
+    STATISTICS.reset()
@@ -0,0 +1,203 @@
+"""This injector module houses the keywords to inspect and manage the pooled HTTP transport"""
+
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    STATISTICS,
+    close_transport,
+)
+from ams.data_model.common_libs.clients.cassette import start_cassette, stop_cassette
+from ams.data_model.common_libs.clients.http_cache import HTTP_CACHE
+from ams.data_model.common_libs.clients.http_metrics import METRICS
+from ams.data_model.common_libs.clients.single_flight import SINGLE_FLIGHT
+from ams.data_model.common_libs.injectors.injector import _http_call_many
+
+
+def get_http_transport_statistics():
+    """
+    Returns the request and connection counters of the pooled HTTP transport per host.
+
+    Every host has the following counters:
+    | ``requests``            | number of requests sent                                  |
+    | ``new_connections``     | number of connections opened (including TLS handshake)   |
+    | ``reused_connections``  | number of requests sent on an already opened connection  |
+
+    == Return value ==
+    | dict host -> counters
+
+    == Usage ==
+    | ${statistics}=    Get Http Transport Statistics
+    """
+    return STATISTICS.snapshot()
+
+
+def get_http_single_flight_statistics():
+    """
+    Returns the number of GETs sent and of identical GETs collapsed into a call already in flight.
+
+    Identical GETs (same session, path, query and headers) sent at the same time by parallel keywords or background threads are sent once, all the callers get the response.
+    Set the ``AMS_HTTP_SINGLE_FLIGHT=0`` environment variable to send all of them.
+
+    | ``executed``    | calls sent                                                         |
+    | ``coalesced``   | calls which waited for an identical call in flight instead of being sent |
+
+    == Return value ==
+    | dict of the counters
+
+    == Usage ==
+    | ${statistics}=    Get Http Single Flight Statistics
+    """
+    return SINGLE_FLIGHT.statistics()
+
+
+def reset_http_transport_statistics():
+    """
+    Resets the request, connection and single flight counters of the pooled HTTP transport.
+
+    == Usage ==
+    | Reset Http Transport Statistics
+    """
+    STATISTICS.reset()
+    SINGLE_FLIGHT.reset()
+
+
+def close_http_transport():
+    """
+    Closes all pooled HTTP connections. A new pool is opened on the next call.
+
+    == Usage ==
+    | Close Http Transport
+    """
+    close_transport()
+
+
+def get_http_metrics_report():
+    """
+    Returns the HTTP calls measured since the start of the run, aggregated per endpoint and per keyword.
+
+    Every endpoint (``method`` and templated ``path``) and keyword has the following values, the latencies are in seconds:
+    | ``count``, ``errors``, ``error_rate``   | number of calls, of failed calls (no response or status code >= 400) and their rate |
+    | ``p50``, ``p95``, ``p99``, ``max``      | latency percentiles and maximum                          |
+    | ``total_time``                          | total latency of the calls                               |
+    | ``request_bytes``, ``response_bytes``   | total size of the request and response bodies            |
+
+    The report is also written as JSON and CSV at the end of the run, see `Write Http Metrics Report`.
+
+    == Return value ==
+    | dict with the ``endpoints`` and ``keywords`` lists, the slowest first
+
+    == Usage ==
+    | ${report}=    Get Http Metrics Report
+    """
+    return METRICS.report()
+
+
+def write_http_metrics_report(directory):
+    """
+    Writes the HTTP metrics report as ams_http_metrics.json, ams_http_metrics.csv (per endpoint)
+    and ams_http_metrics_keywords.csv (per keyword) in the directory.
+
+    It is written automatically at the end of the run in ``AMS_HTTP_METRICS_DIR`` (by default the output directory).
+
+    == Return value ==
+    | path of the JSON report, None if no call was measured
+
+    == Usage ==
+    | Write Http Metrics Report    ${OUTPUT DIR}
+    """
+    return METRICS.write_report(directory)
+
+
+def reset_http_metrics():
+    """
+    Drops the measured HTTP calls.
+
+    == Usage ==
+    | Reset Http Metrics
+    """
+    METRICS.reset()
+
+
+def get_http_cache_statistics():
+    """
+    Returns the counters of the cache of the reference data calls (SDS, CFG configuration application, CDS templates and tags, FIDS reference views, ESB interfaces descriptor).
+
+    | ``entries``          | number of cached responses                                          |
+    | ``hits``             | responses reused without request (no validator, within ``AMS_HTTP_CACHE_TTL``) |
+    | ``revalidations``    | responses reused after a 304 Not Modified                           |
+    | ``misses``           | responses downloaded                                                |
+
+    == Return value ==
+    | dict of the counters
+
+    == Usage ==
+    | ${statistics}=    Get Http Cache Statistics
+    """
+    return HTTP_CACHE.statistics()
+
+
+def invalidate_http_cache(pattern=None):
+    """
+    Drops the cached responses of the reference data calls, the next calls download them again.
+
+    The save and delete keywords invalidate the data they change, this keyword is needed when the data is changed by another way (e.g. the UI or an interface).
+
+    | *Arguments*     | *Description*                                                                  |
+    | ``pattern``     | (Optional) Regular expression matched against the start of the paths. Default is all the cached responses. |
+
+    == Return value ==
+    | number of dropped responses
+
+    == Usage ==
+    | Invalidate Http Cache    /sds/data/v\\\\d+/stand
+    """
+    return HTTP_CACHE.invalidate(pattern)
+
+
+def start_http_cassette(path=None, mode=None):
+    """
+    Records the HTTP calls in a cassette, or replays them from the cassette without sending them to AMS.
+
+    In replay mode a request is matched on its method, templated path (ids replaced by ``{id}``), query and body.
+    A request with no recorded call fails with a connection error.
+    The cassette is also started for the whole run when ``AMS_CASSETTE_MODE`` is set.
+
+    | *Arguments*     | *Description*                                                                  |
+    | ``path``        | (Optional) Cassette file, gzip compressed if it ends with ``.gz``. Default is ``AMS_CASSETTE`` or ``ams_cassette.jsonl.gz``. |
+    | ``mode``        | (Optional) ``record`` or ``replay``. Default is ``AMS_CASSETTE_MODE``.          |
+
+    == Usage ==
+    | Start Http Cassette    ${CURDIR}/cassettes/sds.jsonl.gz    mode=replay
+    """
+    start_cassette(path, mode)
+
+
+def stop_http_cassette():
+    """
+    Saves the recorded HTTP calls and sends the next calls to AMS again.
+
+    == Usage ==
+    | Stop Http Cassette
+    """
+    stop_cassette()
+
+
+def http_call_many(specs, concurrency=None, check=False, return_exceptions=False):
+    """
+    Executes independent HTTP calls concurrently and returns their results in the order of the calls.
+
+    Every call is sent with the security headers and cookies of the session, a response with a
+    status code other than 200 or 204 fails the call; 204 returns None.
+
+    | *Arguments*             | *Description*                                                                  |
+    | ``specs``               | List of calls: a path, or a dictionary with the ``path`` and the arguments of the call (``path_params``, ``query_params``, ``operation``, ``payload``, ``json_response``). |
+    | ``concurrency``         | (Optional) Maximum number of calls in flight. Default is ``AMS_HTTP_POOL_SIZE``. |
+    | ``check``               | (Optional) Also fail a call when its ``generalProcessingStatus`` (or the ``field`` of the call) is not ``OK`` (or its ``value``). Default is False. |
+    | ``return_exceptions``   | (Optional) Return the error of a failed call in its place instead of failing. Default is False. |
+
+    == Return value ==
+    | list of the responses, in the order of the calls
+
+    == Usage ==
+    | ${specs}=    Create List    /configuration/admin/rest/v1/configuration/list    /versions
+    | ${results}=    Http Call Many    ${specs}    concurrency=5
+    """
+    return _http_call_many(specs, concurrency, check, return_exceptions)
@@ -1,6 +1,8 @@
 """This injector module houses all functions for teardown setup"""
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from protocols import session_manager
 from ams.frms_api_calls.injector_plan import frms_delete_plans
 from ams.frms_api_calls.injector_rule import frms_delete_rules
@@ -14,13 +16,109 @@ from ams.vip_api_calls.leg_periods.delete_leg_period.responses import (
 from ams.fom_api_calls.movement_partial_v3.delete_flight.injector import (
     fom_v3_movements_delete,
 )
-
+from ams.data_model.common_libs.utils.generic_helpers import get_variable_value
 
 LOGGER = logging.getLogger(__name__)
 
+DEFAULT_CLEANUP_WORKERS = 8
+
+# entity types cleaned up first, in this order. Other entity types are SDS entities and are
+# cleaned up afterwards, the last created type first as it may reference the previous ones.
+# This order is only an approximation: the failed SDS and FIDS deletes are tried again once
+# all the other entities were deleted
+CLEANUP_ORDER = ["movement", "leg_period", "bre_rule", "frms_plan", "frms_rule", "fids"]
+
+
+def _cleanup_workers():
+    """Returns the number of parallel deletes, set with the AMS_CLEANUP_WORKERS variable"""
+    return max(
+        int(get_variable_value("AMS_CLEANUP_WORKERS", DEFAULT_CLEANUP_WORKERS)), 1
+    )
+
+
+def _delete_all(delete_function, items):
+    """
+    Deletes all the items in parallel on a bounded thread pool.
+
+    Failures do not stop the other deletes, they are returned so that they can be logged
+    from the main thread (Robot Framework ignores messages logged by other threads).
+
+    == Return value ==
+    | list of (item, exception or None), in the order of the items
+    """
+
+    def delete(item):
+        try:
+            delete_function(item)
+        except Exception as e:
+            return item, e
+        return item, None
+
+    if len(items) <= 1:
+        return [delete(item) for item in items]
+    with ThreadPoolExecutor(
+        max_workers=min(_cleanup_workers(), len(items)),
+        thread_name_prefix="ams-cleanup",
+    ) as executor:
+        return list(executor.map(delete, items))
+
+
+def _log_failures(label, results):
+    """Logs the failed deletes, returns the number of failures"""
+    failures = 0
+    for item, error in results:
+        if error is not None:
+            failures += 1
+            LOGGER.warning(
+                "Automatic data cleanup - Failed for %s %s: %s", label, item, error
+            )
+    return failures
+
+
+def _failed(results):
+    """Returns the (item, exception) of the failed deletes"""
+    return [(item, error) for item, error in results if error is not None]
+
+
+def _delete_sds_entities(entity_type, entity_ids):
+    """Deletes the SDS entities, returns the (id, exception) of the failed deletes"""
+    return _failed(
+        _delete_all(lambda entity_id: sds_delete(entity_type, entity_id), entity_ids)
+    )
+
+
+def _cleanup_order(data_to_clean_up):
+    """
+    Returns the entity types to clean up, in dependency order.
+    """
+    ordered = [
+        entity_type for entity_type in CLEANUP_ORDER if entity_type in data_to_clean_up
+    ]
+    ordered.extend(
+        entity_type
+        for entity_type in reversed(list(data_to_clean_up))
+        if entity_type not in CLEANUP_ORDER
+    )
+    return ordered
+
 
 def automatic_data_cleanup():
+    """
+    Deletes all the data created by the test and registered for automatic clean up.
+
+    Entity types are cleaned up one after the other in dependency order (movements before
+    leg periods, FIDS children before parents, ...). The entities of each type are deleted
+    in parallel; the number of parallel deletes can be set with the ``AMS_CLEANUP_WORKERS``
+    variable (default 8). A failed delete does not stop the clean up. The failed SDS deletes,
+    e.g. of an entity still referenced by an entity of a type cleaned up later, are tried
+    again once at the end, the ones failing again are logged.
+
+    == Return value ==
+    | dict entity type -> {"count", "failed", "duration"}
 
+    == Usage ==
+    | Test Teardown    automatic_data_cleanup
+    """
     LOGGER.info(
         "============================== Automatic data cleanup =============================="
     )
@@ -28,26 +126,60 @@ def automatic_data_cleanup():
     context_data = session_manager.sessions._get_session_context_data()
     data_to_clean_up = context_data["test_context"]["data_to_clean_up"]
 
-    for entity_type, ids in data_to_clean_up.items():
+    summary = {}
+    # entity type -> ids of the SDS entities to delete again
+    retries = {}
+    for entity_type in _cleanup_order(data_to_clean_up):
+        ids = data_to_clean_up[entity_type]
+        start = time.perf_counter()
+        failed = 0
         try:
             LOGGER.info("Automatic data cleanup - %s: %s", entity_type, ids)
             if entity_type == "movement":
-                fom_cleanup_movements(ids)
+                failed = fom_cleanup_movements(ids)
             elif entity_type == "leg_period":
-                vip_cleanup_leg_periods(ids)
+                failed = vip_cleanup_leg_periods(ids)
             elif entity_type == "bre_rule":
-                cds_cleanup_rules(ids)
+                failed = cds_cleanup_rules(ids)
             elif entity_type == "frms_plan":
                 frms_delete_plans(ids)
             elif entity_type == "frms_rule":
                 frms_delete_rules(ids)
             elif entity_type == "fids":
-                fids_cleanup_entities(ids)
+                failed = fids_cleanup_entities(ids)
             else:
-                for item_id in ids:
-                    sds_delete(entity_type, item_id)
+                failures = _delete_sds_entities(entity_type, ids)
+                if failures:
+                    retries[entity_type] = [entity_id for entity_id, _error in failures]
+                failed = len(failures)
         except Exception as e:
+            failed = len(ids)
             LOGGER.warning("Automatic data cleanup - Failed for %s: %s", entity_type, e)
+        summary[entity_type] = {
+            "count": len(ids),
+            "failed": failed,
+            "duration": round(time.perf_counter() - start, 3),
+        }
+
+    for entity_type, ids in retries.items():
+        start = time.perf_counter()
+        LOGGER.info("Automatic data cleanup - %s again: %s", entity_type, ids)
+        failures = _delete_sds_entities(entity_type, ids)
+        _log_failures(entity_type, failures)
+        summary[entity_type]["failed"] = len(failures)
+        summary[entity_type]["duration"] = round(
+            summary[entity_type]["duration"] + time.perf_counter() - start, 3
+        )
+
+    for entity_type, timing in summary.items():
+        LOGGER.info(
+            "Automatic data cleanup - %s: %s deleted, %s failed in %.3fs",
+            entity_type,
+            timing["count"] - timing["failed"],
+            timing["failed"],
+            timing["duration"],
+        )
+    return summary
 
 
 def fom_cleanup_movements(movement_ids):
@@ -55,45 +187,37 @@ def fom_cleanup_movements(movement_ids):
     Deletes all the movement data in Operations.
 
     == Return value ==
-    | None
+    | number of movements which failed to be deleted
 
     == Usage ==
     | fom_cleanup_movements    ["C_CPA_1400__20250424_ARRIVAL_XYZA"]
 
     """
-    for movement_id in movement_ids:
-        try:
-            fom_v3_movements_delete(movement_id)
-        except Exception as e:
-            LOGGER.warning(
-                "Automatic data cleanup - Failed for movement %s: %s", movement_id, e
-            )
+    results = _delete_all(fom_v3_movements_delete, movement_ids)
+    return _log_failures("movement", results)
 
 
 def vip_cleanup_leg_period(leg_period_id):
     vip_cleanup_leg_periods([leg_period_id])
 
 
+def _delete_leg_period(leg_period_id):
+    response = delete_leg_period(leg_period_id)
+    validate_delete_leg_period_general_processing(response)
+
+
 def vip_cleanup_leg_periods(leg_period_ids):
     """
     Deletes all the flight data in Planning.
 
     == Return value ==
-    | None
+    | number of leg periods which failed to be deleted
 
     == Usage ==
     | vip_cleanup_leg_periods    [leg_period_id]
     """
-    for leg_period_id in leg_period_ids:
-        try:
-            response = delete_leg_period(leg_period_id)
-            validate_delete_leg_period_general_processing(response)
-        except Exception as e:
-            LOGGER.warning(
-                "Automatic data cleanup - Failed for leg period %s: %s",
-                leg_period_id,
-                e,
-            )
+    results = _delete_all(_delete_leg_period, leg_period_ids)
+    return _log_failures("leg period", results)
 
 
 def cds_cleanup_rules(rule_ids):
@@ -101,36 +225,55 @@ def cds_cleanup_rules(rule_ids):
     Deletes all BRE rules.
 
     == Return value ==
-    | None
+    | number of rules which failed to be deleted
 
     == Usage ==
     | cds_cleanup_rules    [rule_id]
     """
-    for rule_id in rule_ids:
-        try:
-            cds_v1_delete_rule(rule_id)
-        except Exception as e:
-            LOGGER.warning(
-                "Automatic data cleanup - Failed for BRE rule %s: %s",
-                rule_id,
-                e,
-            )
+    results = _delete_all(cds_v1_delete_rule, rule_ids)
+    return _log_failures("BRE rule", results)
+
+
+def _delete_fids_entity(item):
+    __base_delete_data(item["view"], item["fields"], item["entity"], skip_clean_up=True)
 
 
 def fids_cleanup_entities(entities):
-    """Cleans up fids entities"""
-    for item in entities:
-        try:
-            __base_delete_data(
-                item["view"], item["fields"], item["entity"], skip_clean_up=True
-            )
-        except Exception as e:
-            # ignore errors here so it goes through all of the list
-            LOGGER.error(
-                "Failed to clean up FIDS entity %s %s: %s",
-                item["view"],
-                item["entity"],
-                str(e),
-            )
-        else:
-            LOGGER.info("Successfully cleaned up FIDS entity %s", item["entity"])
+    """
+    Cleans up fids entities.
+
+    Entities are grouped by view and the views are cleaned up in the reverse order of
+    creation, so children are deleted before their parents. The entities of a view are
+    deleted in parallel. The failed deletes, e.g. of a parent whose child view was first
+    created before it, are tried again once all the views were cleaned up.
+
+    == Return value ==
+    | number of entities which failed to be deleted
+    """
+    views = {}
+    for item in reversed(entities):
+        views.setdefault(item["view"], []).append(item)
+
+    retries = {}
+    for view, items in views.items():
+        for item, error in _delete_all(_delete_fids_entity, items):
+            if error is not None:
+                # ignore errors here so it goes through all of the list
+                retries.setdefault(view, []).append(item)
+            else:
+                LOGGER.info("Successfully cleaned up FIDS entity %s", item["entity"])
+
+    failures = 0
+    for items in retries.values():
+        for item, error in _delete_all(_delete_fids_entity, items):
+            if error is not None:
+                failures += 1
+                LOGGER.error(
+                    "Failed to clean up FIDS entity %s %s: %s",
+                    item["view"],
+                    item["entity"],
+                    str(error),
+                )
+            else:
+                LOGGER.info("Successfully cleaned up FIDS entity %s", item["entity"])
+    return failures
@@ -6,7 +6,26 @@
 import os
 import logging
 from protocols import session_manager
+from ams.data_model.common_libs.clients.single_flight import SINGLE_FLIGHT
+from ams.data_model.common_libs.utils.entity_store import (
+    SDS_STORE,
+    SESSION_SCOPE,
+    store_scope,
+)
+from ams.data_model.common_libs.utils.routing_table import invalidate_routing_tables
 from ams.data_model.initialize_ams_test.create_ams_session import AMSSession
+from ams.data_model.initialize_ams_test.session_pool import (
+    close_session_pool,
+    get_session_pool,
+    load_pool_users,
+    open_session_pool,
+)
+from ams.data_model.initialize_ams_test.session_cache import (
+    SESSION_CACHE,
+    is_session_alive,
+    session_cache_key,
+    session_ttl,
+)
 from ams.data_model.common_libs.utils.generic_helpers import initialize_test_context
 from ams.initalize_ams_test.component_versions import (
     get_component_versions_from_json,
@@ -50,6 +69,12 @@ def open_generic_ams_session(protocol, current_directory, test_name=None, **kwar
     | ``context_file``           | data file name having the contextual data |
     | ``load_active_conf``       | Optional. If True, the function will call `_get_active_configuration` to load the active configuration. Defaults to False if not provided. |
     | ``load_toggles_conf``      | Optional. If True, the function will call `_get_toggles_configuration` to load the active 1A configuration for toggles. Defaults to False if not provided. |
+    | ``refresh_session``        | Optional. If True, login again and reload the configurations instead of reusing the cached session. Defaults to False if not provided. |
+
+    The opened session (authenticated cookie, environment context, end points, configurations
+    and component versions) is cached and reused by the following tests for ``AMS_SESSION_TTL``
+    seconds (default 900, 0 disables the cache). A new session is opened when the cached one
+    expired or when the server answers 401 Unauthorized.
 
     == Return value ==
     | None
@@ -82,16 +107,36 @@ def open_generic_ams_session(protocol, current_directory, test_name=None, **kwar
     else:
         test_context = initialize_context()
 
-    session = AMSSession(
-        protocol=protocol,
-        test_context=test_context,
-    )
-    session.create_ams_session()
+    def open_session(test_context_):
+        AMSSession(protocol=protocol, test_context=test_context_).create_ams_session()
+
+    ttl = session_ttl() if protocol == "REST" else 0
+    cache_key = session_cache_key(protocol, test_context)
+    if _parse_bool(kwargs.get("refresh_session", False)):
+        SESSION_CACHE.discard(cache_key)
+    cached_session = SESSION_CACHE.get(cache_key) if ttl > 0 else None
+
+    # the cached context is only valid for the protocols session it was opened with
+    if (
+        cached_session is not None
+        and SESSION_CACHE.current_key == cache_key
+        and is_session_alive()
+    ):
+        LOGGER.info("Reusing cached AMS session.")
+        cached_session.restore(
+            session_manager.sessions._get_session_context_data(), test_context
+        )
+    else:
+        open_session(test_context)
+        cached_session = None
+        # the SDS entities loaded with the previous session are loaded again
+        if store_scope() == SESSION_SCOPE:
+            SDS_STORE.invalidate()
+    # the SDS paths are resolved again with the airport and customer of this session
+    invalidate_routing_tables()
 
     # Parse load_active_conf to boolean
-    load_active_conf = kwargs.get("load_active_conf", False)
-    if isinstance(load_active_conf, str):
-        load_active_conf = load_active_conf.lower() in ["true", "1", "yes"]
+    load_active_conf = _parse_bool(kwargs.get("load_active_conf", False))
 
     # Check if load_active_conf is True
     if load_active_conf:
@@ -101,9 +146,7 @@ def open_generic_ams_session(protocol, current_directory, test_name=None, **kwar
         LOGGER.info("Skipping loading active configuration.")
 
     # Parse load_active_conf to boolean
-    load_toggles_conf = kwargs.get("load_toggles_conf", False)
-    if isinstance(load_toggles_conf, str):
-        load_toggles_conf = load_toggles_conf.lower() in ["true", "1", "yes"]
+    load_toggles_conf = _parse_bool(kwargs.get("load_toggles_conf", False))
 
     # Check if load_toggles_conf is True
     if load_toggles_conf:
@@ -114,6 +157,90 @@ def open_generic_ams_session(protocol, current_directory, test_name=None, **kwar
 
     get_component_versions()
 
+    # cache the session with what has been loaded for the following tests
+    if ttl > 0:
+        context_data = session_manager.sessions._get_session_context_data()
+        if cached_session is None:
+            SESSION_CACHE.put(cache_key, context_data, ttl, open_session)
+        else:
+            SESSION_CACHE.update(cache_key, context_data)
+
+
+def clear_ams_session_cache():
+    """
+    Removes all the cached AMS sessions, the next `Open Generic Ams Session` logs in again.
+
+    == Return value ==
+    | None
+
+    == Usage ==
+    | Clear Ams Session Cache
+    """
+    SESSION_CACHE.discard()
+
+
+def open_ams_session_pool(users_file=None, size=None, refresh_interval=None):
+    """
+    Logs several users in up front and shares their sessions between concurrent workers.
+
+    Every login gets its own session key (``pool_0``, ``pool_1``...) to pass as ``session_key`` to the keywords,
+    so parallel workers act as different operators instead of sharing the cookie of the default session.
+    The environment is the one of the default session: call `Open Generic Ams Session` first.
+
+    | *Arguments*              | *Description*                                                                |
+    | ``users_file``           | Optional. Credentials in the ``.ams_login`` format, a ``user`` line starts every user. Defaults to ``AMS_SESSION_POOL_FILE`` or ~/.ams_login. |
+    | ``size``                 | Optional. Number of sessions, the users are logged in round-robin. Defaults to the number of users. |
+    | ``refresh_interval``     | Optional. Seconds after which a session is logged in again in the background. Defaults to ``AMS_SESSION_POOL_REFRESH_INTERVAL`` or 600, 0 disables the refresh. |
+
+    A session rejected with 401 Unauthorized is logged in again at once.
+
+    == Return value ==
+    | list of the session keys of the pool
+
+    == Usage ==
+    | ${keys}=    Open Ams Session Pool    users_file=${CURDIR}/operators.txt    size=10
+    | ${key}=    Get Pooled Session Key
+    | Fids Login    session_key=${key}
+    """
+    pool = open_session_pool(
+        load_pool_users(users_file),
+        size=size,
+        refresh_interval=refresh_interval,
+    )
+    return list(pool.sessions)
+
+
+def get_pooled_session_key():
+    """
+    Returns the key of the next session of the pool, round-robin.
+
+    == Return value ==
+    | session key to pass as ``session_key``
+
+    == Usage ==
+    | ${key}=    Get Pooled Session Key
+    """
+    return get_session_pool().acquire()
+
+
+def close_ams_session_pool():
+    """
+    Stops the background refresh of the session pool, its session keys are not valid anymore.
+
+    == Return value ==
+    | None
+
+    == Usage ==
+    | Close Ams Session Pool
+    """
+    close_session_pool()
+
+
+def _parse_bool(value):
+    if isinstance(value, str):
+        return value.lower() in ["true", "1", "yes"]
+    return bool(value)
+
 
 def get_component_versions(session_key="defaultKey", **kwargs):
     """
@@ -134,14 +261,35 @@ def get_component_versions(session_key="defaultKey", **kwargs):
         )
         return
 
-    # user
-    endpoint = "/versions/"
     server_url = (
         session_manager.sessions._get_session_context_data()
         .get("global_environment_context")
         .get("internal_server_url")
     )
 
+    # the sessions opened at the same time by parallel setups fetch the versions once
+    versions = SINGLE_FLIGHT.do(
+        ("component_versions", server_url),
+        lambda: _fetch_component_versions(server_url),
+        dict,
+    )
+
+    # lookup the overrides from
+    overrides = (
+        session_manager.sessions._get_session_context_data()
+        .get("global_environment_context")
+        .get("component_versions", {})
+    )
+
+    # Put versions in the context
+    context_data["component_versions"] = {**versions, **overrides}
+
+
+def _fetch_component_versions(server_url):
+    """Returns the versions of the components and of the ESB repos from the versions tool"""
+    # user
+    endpoint = "/versions/"
+
     versions = {}
     try:
         compeont_versions = requests.get(
@@ -176,12 +324,4 @@ def get_component_versions(session_key="defaultKey", **kwargs):
         # until /versions is deployed everywhere it will fail with 404
         LOGGER.info("ignore failure of the /versions call")
 
-    # lookup the overrides from
-    overrides = (
-        session_manager.sessions._get_session_context_data()
-        .get("global_environment_context")
-        .get("component_versions", {})
-    )
-
-    # Put versions in the context
-    context_data["component_versions"] = {**versions, **esb_versions, **overrides}
+    return {**versions, **esb_versions}
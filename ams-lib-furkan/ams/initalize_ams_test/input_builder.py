@@ -4,9 +4,11 @@
 """
 This module contains helper functions used for ams tests initialization
 """
+
 import logging
 from protocols import session_manager
 from ams.data_model.common_libs.injectors.injector import _http_call
+from ams.data_model.common_libs.utils.generic_helpers import get_settings_index
 
 LOGGER = logging.getLogger(__name__)
 
@@ -77,6 +79,8 @@ def _get_configuration(
             # Store the active configuration in context_data
             context_data[context_key] = active_configuration
             LOGGER.info("Active configuration stored in context_data.")
+            # index the settings once for the precondition keywords
+            get_settings_index(context_key)
 
         else:
             LOGGER.warning(
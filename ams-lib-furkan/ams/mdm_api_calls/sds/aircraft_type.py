@@ -4,7 +4,13 @@ Keywords for interacting with the SDS for aircraft type-related operations.
 
 import logging
 from ams.commons import get_customer_id
-from .injector import _sds_call, _sds_save, _find_match, _find_conflicting
+from .injector import (
+    _sds_call,
+    _sds_save,
+    _find_match,
+    _find_conflicting,
+    _stored,
+)
 
 # pylint: disable=line-too-long
 
@@ -81,9 +87,14 @@ def sds_save_aircraft_type(iata, icao="ZZZZ", force_creation=False):
     """
     LOGGER.info("Save aircraft type %s/%s", iata, icao)
 
-    find_match = _find_match(sds_get_aircraft_types_by_iata_icao, iata, icao)
+    find_match = _find_match(
+        _stored(sds_get_aircraft_types_by_iata_icao, "aircraftType", "6", iata=iata, icao=icao),
+        iata,
+        icao,
+    )
     find_conflicting = _find_conflicting(
-        (sds_get_aircraft_types_by_iata, iata), (sds_get_aircraft_types_by_icao, icao)
+        (_stored(sds_get_aircraft_types_by_iata, "aircraftType", "6", iata=iata), iata),
+        (_stored(sds_get_aircraft_types_by_icao, "aircraftType", "6", icao=icao), icao),
     )
 
     data = {
@@ -4,7 +4,13 @@ Keywords for interacting with the SDS for airline-related operations.
 
 import logging
 from ams.commons import get_customer_id
-from .injector import _sds_call, _sds_save, _find_match, _find_conflicting
+from .injector import (
+    _sds_call,
+    _sds_save,
+    _find_match,
+    _find_conflicting,
+    _stored,
+)
 
 # pylint: disable=line-too-long
 
@@ -72,9 +78,14 @@ def sds_save_airline(iata, icao="ZZZ", force_creation=False):
     """
     LOGGER.info("Save airline %s/%s", iata, icao)
 
-    find_match = _find_match(sds_get_airlines_by_iata_icao, iata, icao)
+    find_match = _find_match(
+        _stored(sds_get_airlines_by_iata_icao, "airline", "4", iata=iata, icao=icao),
+        iata,
+        icao,
+    )
     find_conflicting = _find_conflicting(
-        (sds_get_airlines_by_iata, iata), (sds_get_airlines_by_icao, icao)
+        (_stored(sds_get_airlines_by_iata, "airline", "4", iata=iata), iata),
+        (_stored(sds_get_airlines_by_icao, "airline", "4", icao=icao), icao),
     )
 
     data = {
@@ -2,21 +2,43 @@
 This module contain the injectors for SDS operations
 """
 
+import json
 import logging
-import protocols.broker
-
-
-from ams.commons import get_customer_id, get_ref_airport_id
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# get_customer_id and get_ref_airport_id are keywords of the library
+# pylint: disable-next=unused-import
+from ams.commons import get_context, get_customer_id, get_ref_airport_id
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    get_transport,
+    send_request,
+)
+from ams.data_model.common_libs.clients.http_cache import invalidate_cache
+from ams.data_model.common_libs.clients.http_metrics import PATH_TEMPLATES, percentile
 from ams.data_model.common_libs.request_response_handler.request_generator import (
     PayloadGenerator,
 )
-from ams.data_model.common_libs.utils.generic_helpers import add_data_to_clean_up
-from .injector_rest import injector as rest_injector
+from ams.data_model.common_libs.utils.entity_store import SDS_STORE, store_scope
+from ams.data_model.common_libs.utils.generic_helpers import (
+    add_data_to_clean_up,
+    get_variable_value,
+)
+from ams.data_model.common_libs.utils.json_stream import (
+    iter_response_items,
+    loads,
+    stream_option,
+)
+from ams.data_model.common_libs.utils.routing_table import RoutingTable
+from .injector_rest import _build_rest_details
 
 # pylint: disable=line-too-long
 
 LOGGER = logging.getLogger(__name__)
 
+BENCHMARK_REPORT_NAME = "sds_read_benchmark"
+
 DEFAULT_ENDPOINTS = {
     "get": "/{id}",
     "list": "",
@@ -108,6 +130,24 @@ ENTITIES = {
     },
 }
 
+LATEST_VERSIONS = {
+    entity_type: max(versions) for entity_type, versions in ENTITIES.items()
+}
+
+
+def _register_path_templates():
+    """Measures the SDS calls per service, the codes and ids of the paths being placeholders"""
+    for entity_type, versions in ENTITIES.items():
+        for version, endpoints in versions.items():
+            base = f"/sds/data/v{version}/{entity_type}"
+            PATH_TEMPLATES.register(base)
+            for endpoint in {**DEFAULT_ENDPOINTS, **endpoints}.values():
+                for template in endpoint if isinstance(endpoint, list) else [endpoint]:
+                    PATH_TEMPLATES.register(f"{base}{template}")
+
+
+_register_path_templates()
+
 
 ##
 # Generic services
@@ -203,21 +243,23 @@ def sds_count(entity_type, version="latest"):
     return _sds_call("GET", entity_type, version, endpoint)
 
 
-def sds_list(entity_type, version="latest"):
+def sds_list(entity_type, version="latest", stream=None):
     """
     List SDS entities
 
     | *Arguments*                        | *Description*                                                                                         |
     | ``entity_type``                    | entity type ("aircraft", "aircraftType", "stand", "gate"...)                                          |
     | ``version``                        | version of the REST service (by default, call latest version)                                         |
+    | ``stream``                         | (Optional) path of the list in the response (True for the response itself), the list is then decoded while it is received and an iterator over its items is returned |
 
     === Usage: ===
     | sds_list     stand
     | sds_list     stand  3
+    | sds_list     stand  stream=${True}
     """
     version = _get_version(entity_type, version)
     endpoint = _get_endpoint(entity_type, version, "list")
-    return _sds_call("GET", entity_type, version, endpoint)
+    return _sds_call("GET", entity_type, version, endpoint, stream=stream)
 
 
 def _sds_save(entity_type, data, find_match, find_conflicting, force_creation=False):
@@ -241,6 +283,26 @@ def _find_match(get_func, *args, **kwargs):
     return entities[0] if entities else None
 
 
+def _stored(get_func, entity_type, version, **criteria):
+    """
+    Returns a function answering get_func from the SDS store: the entities of the type matching
+    the criteria (index=value, e.g. iata="ZZ"), the list of the version being loaded once.
+    get_func is called instead when the store is disabled.
+    """
+
+    def find(*args, **kwargs):
+        if store_scope() is None:
+            return get_func(*args, **kwargs)
+        list_version = _get_version(entity_type, version)
+        return SDS_STORE.find(
+            _store_key(entity_type, list_version),
+            lambda: sds_list(entity_type, list_version, stream=True),
+            **criteria,
+        )
+
+    return find
+
+
 def _find_conflicting(*get_fun_arg):
     """
     Find conflicting entities using (function, argument) tuples.
@@ -272,11 +334,14 @@ def sds_save(entity_type, data, version="latest"):
     entity = gen_payload.construct_generic_payload()
 
     saved_entity = _sds_call("POST", entity_type, version, endpoint, entity)
+    _invalidate_cache(entity_type)
 
     assert (
         saved_entity is not None and saved_entity["id"] is not None
     ), f"Failed to create entity {entity_type}"
 
+    _store_put(entity_type, saved_entity)
+
     LOGGER.info("Entity '%s' saved: %s", entity_type, saved_entity["id"])
 
     add_data_to_clean_up(entity_type, saved_entity["id"])
@@ -303,29 +368,296 @@ def sds_delete(entity_type, entity_id, version="latest"):
     endpoint = _get_endpoint(entity_type, version, "delete").replace("{id}", entity_id)
 
     response = _sds_call("DELETE", entity_type, version, endpoint)
+    _invalidate_cache(entity_type)
+    SDS_STORE.remove(lambda key: key[0] == entity_type, entity_id)
 
     LOGGER.info("Entity '%s' deleted: %s", entity_type, entity_id)
 
     return response
 
 
+def get_sds_store_statistics():
+    """
+    Returns the counters of the in-memory SDS store used by the save keywords to find the existing entities.
+
+    | ``keys``      | number of loaded entity lists (per entity type, version and customer) |
+    | ``entities``  | number of loaded entities                                             |
+    | ``hits``      | lookups answered without request                                      |
+    | ``loads``     | entity lists loaded                                                   |
+
+    === Usage: ===
+    | ${statistics}=    Get Sds Store Statistics
+    """
+    return SDS_STORE.statistics()
+
+
+def clear_sds_store(entity_type=None):
+    """
+    Drops the entities of the in-memory SDS store, the next lookup loads them again.
+    Use it when the SDS data is changed another way than with the sds keywords.
+
+    | *Arguments*                        | *Description*                                                     |
+    | ``entity_type``                    | (Optional) entity type to drop, all of them by default            |
+
+    === Usage: ===
+    | Clear Sds Store
+    | Clear Sds Store    airline
+    """
+    if entity_type is None:
+        return SDS_STORE.invalidate()
+    return SDS_STORE.invalidate(lambda key: key[0] == entity_type)
+
+
+def sds_save_many(
+    entity_type, items, version="latest", concurrency=None, return_errors=False
+):
+    """
+    Save several SDS entities of a type concurrently
+
+    The payloads are rendered first, then saved on a bounded pool of parallel calls (or with one call
+    when the entity type has a bulk save endpoint, ``save_many`` in ENTITIES). The saved entities are
+    registered for the automatic clean up, as with sds_save.
+
+    | *Arguments*                        | *Description*                                                                                         |
+    | ``entity_type``                    | entity type ("aircraft", "aircraftType", "stand", "gate"...)                                          |
+    | ``items``                          | list of the data used to populate the Jinja template of every entity                                  |
+    | ``version``                        | version of the REST service (by default, call latest version)                                         |
+    | ``concurrency``                    | maximum number of calls in flight (by default, the pool size of the HTTP transport)                   |
+    | ``return_errors``                  | if the failed saves should be returned in the results instead of raising an error                     |
+
+    Every result is a dict with ``entity`` (the saved entity, None if it failed), ``id``, ``error`` (None if it succeeded)
+    and ``elapsed`` (seconds), in the order of the items.
+
+    === Usage: ===
+    | ${results}=    sds_save_many     stand  ${stands}
+    | ${results}=    sds_save_many     stand  ${stands}  concurrency=4  return_errors=${True}
+    """
+    start = time.perf_counter()
+    version = _get_version(entity_type, version)
+    payloads = [
+        PayloadGenerator(
+            item, f"payloads/{entity_type}.jinja", __file__
+        ).construct_generic_payload()
+        for item in items
+    ]
+    LOGGER.info("Save %s entities '%s'", len(payloads), entity_type)
+
+    routes = SDS_ROUTES.get(_route_values())
+    bulk_endpoint = routes.get((entity_type, version, "save_many"))
+    if bulk_endpoint is not None:
+        results = _save_bulk(entity_type, version, bulk_endpoint, payloads)
+    else:
+        endpoint = routes[(entity_type, version, "save")]
+        results = _run_many(
+            lambda payload: _save_entity(entity_type, version, endpoint, payload),
+            payloads,
+            concurrency,
+        )
+    _invalidate_cache(entity_type)
+
+    results = [
+        {
+            "entity": entity,
+            "id": entity["id"] if entity else None,
+            "error": error,
+            "elapsed": elapsed,
+        }
+        for entity, error, elapsed in results
+    ]
+    for result in results:
+        if result["error"] is None:
+            add_data_to_clean_up(entity_type, result["id"])
+            _store_put(entity_type, result["entity"])
+    return _check_many(
+        entity_type, "save", results, return_errors, time.perf_counter() - start
+    )
+
+
+def sds_delete_many(
+    entity_type, entity_ids, version="latest", concurrency=None, return_errors=False
+):
+    """
+    Delete several SDS entities of a type concurrently
+
+    | *Arguments*                        | *Description*                                                                                         |
+    | ``entity_type``                    | entity type ("aircraft", "aircraftType", "stand", "gate"...)                                          |
+    | ``entity_ids``                     | list of the entity ids                                                                                |
+    | ``version``                        | version of the REST service (by default, call latest version)                                         |
+    | ``concurrency``                    | maximum number of calls in flight (by default, the pool size of the HTTP transport)                   |
+    | ``return_errors``                  | if the failed deletes should be returned in the results instead of raising an error                   |
+
+    Every result is a dict with ``id``, ``error`` (None if it succeeded) and ``elapsed`` (seconds), in the order of the ids.
+
+    === Usage: ===
+    | ${results}=    sds_delete_many     stand  ${stand_ids}
+    """
+    start = time.perf_counter()
+    version = _get_version(entity_type, version)
+    endpoint = _get_endpoint(entity_type, version, "delete")
+    LOGGER.info("Delete %s entities '%s'", len(entity_ids), entity_type)
+
+    results = _run_many(
+        lambda entity_id: _sds_call(
+            "DELETE", entity_type, version, endpoint.replace("{id}", entity_id)
+        ),
+        entity_ids,
+        concurrency,
+    )
+    _invalidate_cache(entity_type)
+
+    results = [
+        {"id": entity_id, "error": error, "elapsed": elapsed}
+        for entity_id, (_response, error, elapsed) in zip(entity_ids, results)
+    ]
+    for result in results:
+        if result["error"] is None:
+            SDS_STORE.remove(lambda key: key[0] == entity_type, result["id"])
+    return _check_many(
+        entity_type, "delete", results, return_errors, time.perf_counter() - start
+    )
+
+
+def _save_entity(entity_type, version, endpoint, payload):
+    saved_entity = _sds_call("POST", entity_type, version, endpoint, payload)
+    if saved_entity is None or saved_entity.get("id") is None:
+        raise ValueError(f"Failed to create entity {entity_type}")
+    return saved_entity
+
+
+def _save_bulk(entity_type, version, endpoint, payloads):
+    """Saves the payloads with one call of the bulk endpoint, which returns the saved entities"""
+    start = time.perf_counter()
+    try:
+        saved_entities = _sds_call(
+            "POST", entity_type, version, endpoint, f"[{','.join(payloads)}]"
+        )
+        if saved_entities is None or len(saved_entities) != len(payloads):
+            raise ValueError(f"Failed to create the entities {entity_type}")
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        elapsed = time.perf_counter() - start
+        return [(None, str(e), elapsed)] * len(payloads)
+    elapsed = time.perf_counter() - start
+    return [(entity, None, elapsed) for entity in saved_entities]
+
+
+def _run_many(function, items, concurrency=None):
+    """
+    Calls the function with every item on a bounded thread pool.
+
+    == Return value ==
+    | list of (result or None, error message or None, elapsed seconds), in the order of the items
+    """
+
+    def run(item):
+        start = time.perf_counter()
+        try:
+            result = function(item)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return None, str(e), time.perf_counter() - start
+        return result, None, time.perf_counter() - start
+
+    if len(items) <= 1:
+        return [run(item) for item in items]
+    concurrency = max(int(concurrency or get_transport().pool_size), 1)
+    with ThreadPoolExecutor(
+        max_workers=min(concurrency, len(items)), thread_name_prefix="ams-sds"
+    ) as executor:
+        return list(executor.map(run, items))
+
+
+def _check_many(entity_type, action, results, return_errors, elapsed):
+    """Logs the results from the main thread, raises the errors unless return_errors"""
+    failed = [result for result in results if result["error"] is not None]
+    LOGGER.info(
+        "Entities '%s' %s: %s succeeded, %s failed in %.3fs",
+        entity_type,
+        action,
+        len(results) - len(failed),
+        len(failed),
+        elapsed,
+    )
+    if failed and not return_errors:
+        raise ValueError(
+            f"Failed to {action} {len(failed)} entities {entity_type}: {failed[0]['error']}"
+        )
+    return results
+
+
 ##
 # Test keywords
 ##
-def sds_test_all_read_endpoints():
+def sds_benchmark_read_endpoints(
+    concurrency=None, repeat=1, entity_types=None, output_dir=None, fail_on_errors=True
+):
     """
-    Test all available read-only SDS endpoints
+    Benchmark all available read-only SDS endpoints
+
+    Every entity type and version of ENTITIES is read by id (with an unknown id) and listed, ``repeat`` times, on a
+    bounded pool of parallel calls. The reads are not served from the HTTP cache. The latencies, response sizes and
+    failures are aggregated per entity type, version and read, logged as a table and written as JSON to
+    ``sds_read_benchmark.json``, so that the runs can be compared with a baseline.
+
+    | *Arguments*                        | *Description*                                                                                         |
+    | ``concurrency``                    | maximum number of calls in flight (by default, the pool size of the HTTP transport)                   |
+    | ``repeat``                         | number of times every endpoint is read                                                                |
+    | ``entity_types``                   | (Optional) list of the entity types to read, all of them by default                                   |
+    | ``output_dir``                     | directory of the JSON report (by default AMS_SDS_BENCHMARK_DIR, or the Robot output directory)        |
+    | ``fail_on_errors``                 | if an error is raised at the end when reads failed                                                    |
+
+    A read by id answered 404 Not Found succeeds, the id does not exist. Other reads succeed with 200 or 204.
+
+    Every row of the report has ``entity_type``, ``version``, ``read`` ("get" or "list"), ``count``, ``errors``,
+    ``p50``, ``p95``, ``p99`` and ``max`` (seconds), ``bytes`` (mean response size) and ``failures`` (distinct messages).
 
     === Usage: ===
-    | sds_test_all_read_endpoints
+    | ${report}=    Sds Benchmark Read Endpoints
+    | ${report}=    Sds Benchmark Read Endpoints    concurrency=8    repeat=5    entity_types=${{["stand", "gate"]}}
     """
-    for entity_key, entity in ENTITIES.items():
-        for version in entity.keys():
-            LOGGER.info("Call - Get %s v%s", entity_key, str(version))
-            sds_get_by_id(entity_key, "DUMMY", version)
-
-            LOGGER.info("Call - List %s v%s", entity_key, str(version))
-            sds_list(entity_key, version)
+    start = time.perf_counter()
+    routes = SDS_ROUTES.get(_route_values())
+    reads = []
+    for entity_type in entity_types or ENTITIES:
+        for version in ENTITIES[entity_type]:
+            get_endpoint = routes[(entity_type, version, "get")]
+            if isinstance(get_endpoint, list):
+                get_endpoint = next(
+                    (ep for ep in get_endpoint if "{id}" in ep), get_endpoint[0]
+                )
+            reads.append(
+                (entity_type, version, "get", get_endpoint.replace("{id}", "DUMMY"))
+            )
+            reads.append(
+                (entity_type, version, "list", routes[(entity_type, version, "list")])
+            )
+    reads = reads * int(repeat)
+    LOGGER.info("Benchmark %s SDS reads", len(reads))
+
+    results = _run_many(lambda read: _timed_read(*read), reads, concurrency)
+    report = {
+        "concurrency": int(concurrency or get_transport().pool_size),
+        "repeat": int(repeat),
+        "elapsed": round(time.perf_counter() - start, 4),
+        "rows": _benchmark_rows(reads, results),
+    }
+    report["calls"] = len(reads)
+    report["errors"] = sum(row["errors"] for row in report["rows"])
+
+    LOGGER.info(
+        "SDS reads: %s calls, %s failed in %.3fs\n%s",
+        report["calls"],
+        report["errors"],
+        report["elapsed"],
+        _benchmark_table(report["rows"]),
+    )
+    json_path = _write_benchmark(report, output_dir)
+    LOGGER.info("SDS read benchmark written to %s", json_path)
+    if report["errors"] and fail_on_errors:
+        failed = next(row for row in report["rows"] if row["errors"])
+        raise ValueError(
+            f"{report['errors']} SDS reads failed, e.g. {failed['entity_type']} v{failed['version']} "
+            f"{failed['read']}: {failed['failures'][0]}"
+        )
+    return report
 
 
 ##
@@ -333,45 +665,162 @@ def sds_test_all_read_endpoints():
 ##
 def _get_version(entity_type, version_str):
     if version_str == "latest":
-        return max(ENTITIES[entity_type].keys())
+        return LATEST_VERSIONS[entity_type]
     return int(version_str)
 
 
+def _build_routes(values):
+    """
+    Resolves the endpoints of all the entity types, versions and service types for a reference
+    airport id and customer id.
+    """
+    airport_id, customer_id = values
+
+    def resolve(endpoint):
+        return endpoint.replace("{airportId}", airport_id).replace(
+            "{customerId}", customer_id
+        )
+
+    routes = {}
+    for entity_type, versions in ENTITIES.items():
+        for version, endpoints in versions.items():
+            for service_type, endpoint in {**DEFAULT_ENDPOINTS, **endpoints}.items():
+                if isinstance(endpoint, list):
+                    routes[(entity_type, version, service_type)] = [
+                        resolve(ep) for ep in endpoint
+                    ]
+                else:
+                    routes[(entity_type, version, service_type)] = resolve(endpoint)
+    return routes
+
+
+SDS_ROUTES = RoutingTable("sds", _build_routes)
+
+
+def _route_values():
+    """Returns the reference airport id and customer id of the session, read at once"""
+    generic_context = get_context()["test_context"]["generic_context"]
+    return generic_context["ref_airport_full"], generic_context["customer_id"]
+
+
 def _get_endpoint(entity_type, version, service_type):
     """
     Get the endpoint for a given entity type, version, and service type.
     """
-    endpoint = ENTITIES[entity_type][version].get(service_type, None)
+    return SDS_ROUTES.get(_route_values())[(entity_type, version, service_type)]
 
-    if endpoint is None:
-        endpoint = DEFAULT_ENDPOINTS[service_type]
 
-    if isinstance(endpoint, list):
-        return [
-            ep.replace("{airportId}", get_ref_airport_id()).replace(
-                "{customerId}", get_customer_id()
-            )
-            for ep in endpoint
-        ]
-
-    return endpoint.replace("{airportId}", get_ref_airport_id()).replace(
-        "{customerId}", get_customer_id()
+def _timed_read(entity_type, version, read, endpoint):
+    """Reads an endpoint without the HTTP cache, returns the size of the response"""
+    rest_details = _build_rest_details(
+        {"operation": "GET", "path": f"/sds/data/v{version}/{entity_type}{endpoint}"}
+    )
+    response = send_request(rest_details, "defaultKey")
+    try:
+        accepted = (200, 204, 404) if read == "get" else (200, 204)
+        if response.status_code not in accepted:
+            raise ValueError(f"Call failed with status {response.status_code}")
+        return len(response.content or b"")
+    finally:
+        response.close()
+
+
+def _benchmark_rows(reads, results):
+    """Aggregates the results of the reads per entity type, version and read"""
+    groups = {}
+    for (entity_type, version, read, _endpoint), result in zip(reads, results):
+        groups.setdefault((entity_type, version, read), []).append(result)
+    rows = []
+    for (entity_type, version, read), group in groups.items():
+        latencies = sorted(elapsed for _size, _error, elapsed in group)
+        sizes = [size for size, error, _elapsed in group if error is None]
+        failures = [error for _size, error, _elapsed in group if error is not None]
+        rows.append(
+            {
+                "entity_type": entity_type,
+                "version": version,
+                "read": read,
+                "count": len(group),
+                "errors": len(failures),
+                "p50": round(percentile(latencies, 0.50), 4),
+                "p95": round(percentile(latencies, 0.95), 4),
+                "p99": round(percentile(latencies, 0.99), 4),
+                "max": round(latencies[-1], 4),
+                "bytes": round(sum(sizes) / len(sizes)) if sizes else None,
+                "failures": sorted(set(failures)),
+            }
+        )
+    return rows
+
+
+def _benchmark_table(rows):
+    """Returns the rows as a text table"""
+    lines = [
+        f"{'entity':<26} {'v':>2} {'read':<4} {'count':>5} {'errors':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'bytes':>9}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['entity_type']:<26} {row['version']:>2} {row['read']:<4} {row['count']:>5} {row['errors']:>6} "
+            f"{row['p50']:>8.4f} {row['p95']:>8.4f} {row['p99']:>8.4f} {row['max']:>8.4f} {row['bytes'] if row['bytes'] is not None else '-':>9}"
+        )
+    return "\n".join(lines)
+
+
+def _write_benchmark(report, output_dir=None):
+    """Writes the report as JSON, returns its path"""
+    directory = (
+        output_dir
+        or get_variable_value("AMS_SDS_BENCHMARK_DIR")
+        or get_variable_value("OUTPUT DIR", os.curdir)
     )
+    os.makedirs(directory, exist_ok=True)
+    json_path = os.path.join(directory, f"{BENCHMARK_REPORT_NAME}.json")
+    with open(json_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    return json_path
+
+
+def _store_key(entity_type, version):
+    """Returns the key of the entities of a type in the SDS store"""
+    return (entity_type, int(version), _route_values()[1])
+
+
+def _store_put(entity_type, entity):
+    """Adds a saved entity to the loaded lists of its type, in all versions"""
+    customer_id = _route_values()[1]
+    for version in ENTITIES.get(entity_type, {}):
+        SDS_STORE.put((entity_type, version, customer_id), entity)
+
+
+def _invalidate_cache(entity_type):
+    """Drops the cached responses of the entity type, in all versions"""
+    invalidate_cache(rf"/sds/data/v\d+/{entity_type}([/?]|$)")
 
 
-def _sds_call(operation, entity_type, version, endpoint, payload=None):
+def _sds_call(operation, entity_type, version, endpoint, payload=None, stream=None):
+    stream = stream_option(stream)
     args = {
         "operation": operation,
         "path": f"/sds/data/v{version}/{entity_type}{endpoint}",
         "payload": payload,
     }
-    response = protocols.broker.injector(args, "defaultKey", rest_injector)
+    rest_details = _build_rest_details(args)
+    if stream:
+        rest_details["stream"] = True
+    elif operation == "GET":
+        # reference data, revalidated with a conditional GET
+        rest_details["cache"] = True
+    response = send_request(rest_details, "defaultKey")
 
     if response.status_code != 200 and response.status_code != 204:
+        response.close()
         raise ValueError(f"Call to {args} failed with status {response.status_code}")
 
     if response.status_code == 204:
+        response.close()
         return None
 
-    response_json = response.json()
+    if stream:
+        return iter_response_items(response, stream)
+    response_json = loads(response.content)
     return response_json
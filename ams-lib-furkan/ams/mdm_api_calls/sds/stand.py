@@ -1,6 +1,6 @@
 import logging
 from ams.commons import get_customer_id
-from .injector import _sds_call, _sds_save, _find_match
+from .injector import _sds_call, _sds_save, _find_match, _stored
 
 
 LOGGER = logging.getLogger(__name__)
@@ -31,7 +31,9 @@ def sds_save_stand(name, force_creation=False):
     | Sds Save Stand    STD01   force_creation=True
     | Sds Save Stand    STD01
     """
-    find_match = _find_match(sds_get_stand_by_name, name)
+    find_match = _find_match(
+        _stored(sds_get_stand_by_name, "stand", "4", name=name), name
+    )
     data = {
         "customerId": get_customer_id(),
         "name": name,
@@ -4,7 +4,7 @@ Keywords for interacting with the SDS for terminal-related operations.
 
 import logging
 from ams.commons import get_customer_id
-from .injector import sds_save, _sds_call, sds_get_by_code
+from .injector import sds_save, _sds_call, sds_get_by_code, _stored
 
 # pylint: disable=line-too-long
 
@@ -47,7 +47,8 @@ def sds_save_terminal(code):
     === Usage: ===
     | Sds Save Terminal    code=T1
     """
-    existing_terminal = sds_get_terminal_by_code(code)
+    find_terminal = _stored(sds_get_terminal_by_code, "terminal", "latest", code=code)
+    existing_terminal = find_terminal(code)
 
     if len(existing_terminal) > 0:
         existing_terminal = existing_terminal[0]
@@ -1,10 +1,15 @@
 """Injector module to handle GET http calls from MSC"""
 
 import logging
-from ams.data_model.common_libs.injectors.injector import _http_call
+from ams.data_model.common_libs.injectors.injector import _http_call, _http_call_pages
 from ams.data_model.common_libs.request_response_handler.request_generator import (
     PayloadGenerator,
 )
+from ams.data_model.common_libs.utils.pagination import (
+    CursorPaging,
+    OffsetPaging,
+    paginate,
+)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -12,7 +17,10 @@ LOGGER = logging.getLogger(__name__)
 
 
 def msc_v2_get_list_alert(
-    last_updated_date_time="20250527T182238Z", max_no_of_alerts=3000, displayable="Y"
+    last_updated_date_time="20250527T182238Z",
+    max_no_of_alerts=3000,
+    displayable="Y",
+    stream=None,
 ):
     """
     Executes a HTTP GET call to retrieve MSC v2 list alert.
@@ -25,6 +33,7 @@ def msc_v2_get_list_alert(
     | ``last_updated_date_time``       | Last updated date and time                                                            |
     | ``max_no_of_alerts``             | Max number of alerts returned by the request                                          |
     | ``displayable``                  | Displayable alerts                                                                    |
+    | ``stream``                       | (Optional) path of the list of alerts in the response, an iterator over the alerts is then returned, decoded while the response is received |
 
     === Usage: ===
     | ${response}   MSC V2 Get List Alert
@@ -42,12 +51,59 @@ def msc_v2_get_list_alert(
             "lastUpdatedDateTime": last_updated_date_time,
             "maxNoOfAlerts": max_no_of_alerts,
             "displayable": displayable,
-        }
+        },
+        "stream": stream,
     }
 
     return _http_call(msc_endpoint, **kwargs)
 
 
+def msc_v2_get_list_alert_items(
+    last_updated_date_time="20250527T182238Z",
+    max_no_of_alerts=3000,
+    displayable="Y",
+    prefetch=False,
+):
+    """
+    Iterates over the MSC v2 alerts updated since a date, page by page.
+
+    This function calls the endpoint /messagestore/messagestoreService/rest/v2/alert/listAlert with ``max_no_of_alerts`` alerts per page.
+    The next page starts at the ``lastUpdatedDateTime`` of the last alert of the page, the alerts already returned are skipped.
+
+    | *Arguments*                      | *Description*                                                                         |
+    |----------------------------------|---------------------------------------------------------------------------------------|
+    | ``last_updated_date_time``       | Last updated date and time of the first page                                          |
+    | ``max_no_of_alerts``             | Max number of alerts per page                                                         |
+    | ``displayable``                  | Displayable alerts                                                                    |
+    | ``prefetch``                     | If the next page should be requested while the alerts of the current page are processed |
+
+    === Usage: ===
+    | ${alerts}   MSC V2 Get List Alert Items    max_no_of_alerts=500
+
+    === Returns: ===
+    | iterator | The alerts of all the pages.
+
+    === Raises: ===
+    | ValueError | If the response status code of a page is not 200 or 204.
+    """
+    msc_endpoint = "/messagestore/messagestoreService/rest/v2/alert/listAlert"
+
+    paging = CursorPaging(
+        cursor_param="lastUpdatedDateTime",
+        cursor_field="lastUpdatedDateTime",
+        start=last_updated_date_time,
+        size_param="maxNoOfAlerts",
+        page_size=max_no_of_alerts,
+        id_field="alertId",
+    )
+    return _http_call_pages(
+        msc_endpoint,
+        paging,
+        prefetch=prefetch,
+        query_params={"displayable": displayable},
+    )
+
+
 def msc_v2_get_list_alert_count(
     last_updated_date_time="20250527T182238Z", displayable="Y"
 ):
@@ -624,6 +680,42 @@ def msc_v3_post_list_message(filters):
     return _http_call(msc_endpoint, **kwargs)
 
 
+def msc_v3_post_list_message_items(filters, prefetch=False):
+    """
+    Iterates over the MSC v3 messages corresponding to the Filters provided, page by page.
+
+    This function calls the endpoint /messagestore/messagestoreService/rest/v3/messageServiceV3/listMessageByFilter
+    with a growing ``pageStartRow``, until a page has no message.
+
+    | *Arguments*                      | *Description*                                                                         |
+    |----------------------------------|---------------------------------------------------------------------------------------|
+    | ``filters``                      | A dict containing the filter criteria, ``pageStartRow`` is set for every page         |
+    | ``prefetch``                     | If the next page should be requested while the messages of the current page are processed |
+
+    === Usage: ===
+    | ${messages}    MSC V3 Post List Message Items    filters=${filters}
+
+    === Returns: ===
+    | iterator | The messages (``mscMessageDTOList`` of every page).
+
+    === Raises: ===
+    | ValueError | If the response status code of a page is not 200 or 204.
+    """
+    msc_endpoint = (
+        "/messagestore/messagestoreService/rest/v3/messageServiceV3/listMessageByFilter"
+    )
+
+    def fetch(params):
+        gen_payload = PayloadGenerator(
+            {**filters, **params}, "payloads/v3_list_message_filter.jinja", __file__
+        )
+        payload = gen_payload.construct_generic_payload()
+        return _http_call(msc_endpoint, operation="POST", payload=payload)
+
+    paging = OffsetPaging(offset_param="pageStartRow", items_path="mscMessageDTOList")
+    return paginate(fetch, paging, prefetch=prefetch)
+
+
 def msc_v2_get_add_star(apt_correlation_ids):
     """
     Executes a HTTP GET call to add a Star to the list of messages corresponding to the apt_correlation_ids provided.
@@ -0,0 +1,452 @@
+"""
+Local stand-in of the AMS endpoints used by ams-lib, to benchmark the library without a shared
+test environment.
+
+The stand-in keeps the saved entities in memory and serves generated lists of configurable
+size, with a configurable latency per request:
+
+- FOM v3 movements (adhoc, partials, internal id, delete), visits and v4 visit searches
+- SDS save / get / list / count / delete of any entity type and version
+- VIP leg periods, FRMS plans and rules, MSC list endpoints
+- FIDS login, functions, data read / save / delete, updates, close and the
+  ``/fids/ng/cli/ws/data`` web socket data channel
+- the health readiness and versions endpoints
+
+Usage:
+    python -m tests.benchmarks.ams_stand_in [--port 8080] [--latency 0.01] [--list-size 1000] [--item-size 200]
+
+or from Python::
+
+    with AmsStandIn(latency=0.005, list_size=5000) as stand_in:
+        ... stand_in.url ...
+"""
+
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import random
+import re
+import struct
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# pylint: disable=line-too-long
+
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_WS_TEXT, _WS_CLOSE, _WS_PING, _WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+OK = {"generalProcessingStatus": "OK"}
+
+
+class StandInRequest:
+    """Request received by a route: method, path, query, raw body, content type and path parameters"""
+
+    def __init__(self, method, path, query, body, params, content_type=""):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.body = body
+        self.params = params
+        self.content_type = content_type or ""
+
+    def json(self):
+        """Returns the decoded JSON body, None without body"""
+        return json.loads(self.body) if self.body else None
+
+    def form(self):
+        """Returns the decoded form (x-www-form-urlencoded) body"""
+        return {
+            key: values[0]
+            for key, values in parse_qs(self.body.decode("utf-8")).items()
+        }
+
+
+class AmsStandIn:
+    """
+    In memory AMS stand-in served on a local port.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on, 0 for a free port.
+        latency (float): Seconds waited before answering every request and data message.
+        list_size (int): Number of items of the generated lists.
+        item_size (int): Size in characters of the padding of every generated item.
+        updates_per_poll (int): Rows updated in every data message of the web socket.
+        seed (int): Seed of the generated data.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        list_size=100,
+        item_size=200,
+        updates_per_poll=10,
+        seed=0,
+    ):
+        self.latency = latency
+        self.list_size = list_size
+        self.item_size = item_size
+        self.updates_per_poll = updates_per_poll
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        # collection -> id -> entity
+        self.store = {}
+        # collection -> generated items, generated once
+        self.generated = {}
+        self.requests = 0
+        self.routes = []
+        self.__register_routes()
+        self.server = ThreadingHTTPServer((host, port), _handler(self))
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        """Returns the url of the stand-in, used as the server url of the sessions"""
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves the requests in a background thread"""
+        self.thread = threading.Thread(
+            target=self.server.serve_forever, name="ams-stand-in", daemon=True
+        )
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving and closes the port"""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *_args):
+        self.stop()
+
+    # -- data --
+
+    def generate_item(self, index, **fields):
+        """Returns a generated item of item_size characters of padding"""
+        return {
+            "id": str(uuid.UUID(int=self.rng.getrandbits(128))),
+            "index": index,
+            "name": f"ITEM{index:06d}",
+            "padding": "x" * self.item_size,
+            **fields,
+        }
+
+    def generate_list(self, size=None, **fields):
+        """Returns size (default list_size) generated items"""
+        return [
+            self.generate_item(index, **fields)
+            for index in range(self.list_size if size is None else size)
+        ]
+
+    def save(self, collection, entity):
+        """Stores the entity, with a new id if it has none, and returns it"""
+        entity = dict(entity or {})
+        entity.setdefault("id", str(uuid.uuid4()))
+        with self.lock:
+            self.store.setdefault(collection, {})[str(entity["id"])] = entity
+        return entity
+
+    def get(self, collection, entity_id):
+        """Returns the stored entity, None if it does not exist"""
+        with self.lock:
+            return self.store.get(collection, {}).get(str(entity_id))
+
+    def delete(self, collection, entity_id):
+        """Removes the stored entity, returns False if it does not exist"""
+        with self.lock:
+            return self.store.get(collection, {}).pop(str(entity_id), None) is not None
+
+    def entities(self, collection):
+        """Returns the stored entities of the collection followed by list_size generated ones"""
+        with self.lock:
+            stored = list(self.store.get(collection, {}).values())
+            generated = self.generated.get(collection)
+        if generated is None:
+            generated = self.generated.setdefault(collection, self.generate_list())
+        return stored + generated
+
+    # -- routes --
+
+    def route(self, method, pattern, handler):
+        """Registers the handler of the method on the path pattern (a regular expression)"""
+        self.routes.append((method, re.compile(f"^{pattern}$"), handler))
+
+    def dispatch(self, method, path, query, body, content_type=""):
+        """Returns the status, JSON body and headers of the request"""
+        with self.lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+        for route_method, pattern, handler in self.routes:
+            match = pattern.match(path)
+            if match and route_method == method:
+                request = StandInRequest(
+                    method, path, query, body, match.groupdict(), content_type
+                )
+                result = handler(request)
+                if isinstance(result, tuple):
+                    return result + ({},) * (3 - len(result))
+                return 200, result, {}
+        return (
+            404,
+            {"messages": [{"severity": "ERROR", "text": f"No stand-in for {method} {path}"}]},
+            {},
+        )
+
+    def __register_routes(self):
+        self.route("GET", r"/\w+/(agent/monitor|admin)/health/readiness", lambda _r: {"status": "UP"})
+        self.route("GET", r"/versions/?", lambda _r: {})
+
+        # FOM
+        movements = "/fom/rest-services/v3/movements"
+        self.route("POST", f"{movements}/adhoc", lambda r: {**OK, "movement": self.save("movement", r.json())})
+        self.route("POST", f"{movements}/partials", lambda r: OK)
+        self.route("PUT", f"{movements}/partials/(?P<id>[^/]+)", lambda r: OK)
+        self.route("POST", f"{movements}/partials/(?P<id>[^/]+)", lambda r: OK)
+        self.route("GET", f"{movements}/internal-id/(?P<id>[^/]+)", self.__get_movement)
+        self.route("DELETE", f"{movements}/(?P<id>[^/]+)", lambda r: (204, None) if self.delete("movement", r.params["id"]) else OK)
+        visits = "/fom/rest-services/v3/visits"
+        self.route("POST", f"{visits}/adhoc", lambda r: {**OK, "visit": self.save("visit", r.json())})
+        self.route("POST", f"{visits}/(movement|partials/movement|additionalsources)", lambda r: OK)
+        self.route("PUT", f"{visits}/partials/movement", lambda r: OK)
+        self.route("POST", "/fom/rest-services/v4/visits/searches", lambda r: {**OK, "content": self.entities("visit")})
+
+        # SDS
+        sds = r"/sds/data/v(?P<version>\d+)/(?P<entity>[A-Za-z]+)"
+        self.route("POST", f"{sds}(/save)?", self.__sds_save)
+        self.route("PUT", f"{sds}(/save)?", self.__sds_save)
+        self.route("GET", f"{sds}(/list(/[^/]+)?)?", lambda r: self.entities(r.params["entity"]))
+        self.route("GET", f"{sds}/count(/[^/]+)?", lambda r: len(self.entities(r.params["entity"])))
+        self.route("GET", f"{sds}/build", lambda r: self.get(r.params["entity"], r.query.get("id") or r.query.get("dataId")) or (204, None))
+        self.route("GET", f"{sds}/(get/)?(?P<id>[^/]+)", self.__sds_get)
+        # searches (name, code, externalId...) find nothing
+        self.route("GET", f"{sds}/.+", lambda r: [])
+        self.route("DELETE", f"{sds}(/delete)?(/(?P<id>[^/]+))?", self.__sds_delete)
+
+        # VIP
+        leg_periods = "/vip/rest-services/v1/legperiods"
+        self.route("POST", f"{leg_periods}/manual", lambda r: self.save("legperiod", r.json()))
+        self.route("GET", f"{leg_periods}/all", lambda r: self.entities("legperiod"))
+        self.route("DELETE", f"{leg_periods}/all/(?P<id>[^/]+)", lambda r: (204, None) if self.delete("legperiod", r.params["id"]) else (404, None))
+
+        # FRMS
+        for kind, create in (("plans", "create"), ("rules", "save")):
+            self.route("GET", f"/rm/services/{kind}/list", lambda r, kind=kind: self.entities(kind))
+            self.route("GET", f"/rm/services/{kind}/find/(?P<id>[^/]+)", lambda r, kind=kind: self.get(kind, r.params["id"]) or (404, None))
+            self.route("POST", f"/rm/services/{kind}/{create}", lambda r, kind=kind: self.save(kind, r.form() if r.content_type.startswith("application/x-www-form-urlencoded") else r.json()))
+            self.route("POST", f"/rm/services/{kind}/delete(/secure)?", lambda r, kind=kind: self.__delete_all(kind, r.json() or []))
+        self.route("GET", "/rm/services/rules/update-priority/(?P<id>[^/]+)/(?P<priority>\\d+)", lambda r: self.get("rules", r.params["id"]) or {})
+
+        # MSC
+        self.route("GET", "/messagestore/messagestoreService/rest/v\\d+/.*[Cc]ount.*", lambda r: {"count": self.list_size})
+        self.route("GET", "/messagestore/messagestoreService/rest/v\\d+/.*", lambda r: {"data": self.entities("msc")})
+        self.route("POST", "/messagestore/messagestoreService/rest/v\\d+/.*", lambda r: {"data": self.entities("msc")})
+
+        # FIDS
+        self.route("POST", "/fids/api/login", lambda r: (200, {"results": {}}, {"Set-Cookie": "FIDS_SESSION=stand-in; Path=/"}))
+        self.route("GET", "/fids/api/logout", lambda r: {})
+        self.route("GET", "/fids/api/functions", lambda r: {"results": {"ref_airport_icao": "XXXX"}})
+        self.route("GET", "/fids/api/data/?", lambda r: {"results": self.entities(f"fids_{r.query.get('view', '')}")})
+        self.route("POST", "/fids/api/putdata", self.__fids_put_data)
+        self.route("GET", "/fids/api/updates", lambda r: {"results": {}})
+        self.route("POST", "/fids/api/(closedata|executefunction)", lambda r: {"results": {}})
+
+    def __get_movement(self, request):
+        movement = self.get("movement", request.params["id"])
+        return {**OK, "movement": movement or self.generate_item(0)}
+
+    def __delete_all(self, collection, entity_ids):
+        for entity_id in entity_ids:
+            self.delete(collection, entity_id)
+        return 204, None
+
+    def __sds_save(self, request):
+        return self.save(request.params["entity"], request.json())
+
+    def __sds_get(self, request):
+        return self.get(request.params["entity"], request.params["id"]) or (204, None)
+
+    def __sds_delete(self, request):
+        entity_id = request.params.get("id") or request.query.get("id")
+        self.delete(request.params["entity"], entity_id)
+        return 204, None
+
+    def __fids_put_data(self, request):
+        body = request.json() or {}
+        collection = f"fids_{request.query.get('view', '')}"
+        entity = body.get("payload") or {}
+        key = request.query.get("fields", "id").split(",")[0]
+        if body.get("action") == "D":
+            self.delete(collection, entity.get(key))
+            return {"results": []}
+        entity.setdefault(key, str(uuid.uuid4()))
+        entity["id"] = entity[key]
+        return {"results": [self.save(collection, entity)]}
+
+    # -- FIDS data channel --
+
+    def data_channel(self, connection):
+        """Serves the FIDS data channel messages of a web socket connection"""
+        views = []
+        rows = {}
+        for message in connection.messages():
+            message = json.loads(message)
+            if message.get("type") == "Register":
+                views = list(message.get("payload", {}).get("views", {}))
+            elif message.get("type") == "Data":
+                if self.latency:
+                    time.sleep(self.latency)
+                data = {}
+                for view in views:
+                    if message.get("full") == "true" or view not in rows:
+                        rows[view] = self.generate_list(view=view)
+                        data[view] = [{"U": rows[view]}]
+                    else:
+                        updated = self.rng.sample(range(len(rows[view])), min(self.updates_per_poll, len(rows[view])))
+                        data[view] = [{"U": {str(index): {**rows[view][index], "updated": time.time()} for index in updated}}]
+                connection.send(json.dumps({"type": "Data", "payload": {"data": data, "metaData": {}}}))
+
+
+class WebSocketConnection:
+    """Server side of a web socket (RFC 6455) over the socket of a HTTP request"""
+
+    def __init__(self, rfile, wfile):
+        self.rfile = rfile
+        self.wfile = wfile
+        self.lock = threading.Lock()
+
+    def messages(self):
+        """Yields the text messages received until the connection is closed"""
+        fragments = []
+        while True:
+            header = self.rfile.read(2)
+            if len(header) < 2:
+                return
+            opcode = header[0] & 0x0F
+            length = header[1] & 0x7F
+            if length == 126:
+                length = struct.unpack("!H", self.rfile.read(2))[0]
+            elif length == 127:
+                length = struct.unpack("!Q", self.rfile.read(8))[0]
+            mask = self.rfile.read(4) if header[1] & 0x80 else b"\0\0\0\0"
+            payload = bytes(
+                byte ^ key for byte, key in zip(self.rfile.read(length), itertools.cycle(mask))
+            )
+            if opcode == _WS_CLOSE:
+                self.send(payload, _WS_CLOSE)
+                return
+            if opcode == _WS_PING:
+                self.send(payload, _WS_PONG)
+                continue
+            if opcode == _WS_PONG:
+                continue
+            fragments.append(payload)
+            if header[0] & 0x80:
+                yield b"".join(fragments).decode("utf-8")
+                fragments = []
+
+    def send(self, message, opcode=_WS_TEXT):
+        """Sends a message, not masked as the server"""
+        payload = message.encode("utf-8") if isinstance(message, str) else message
+        length = len(payload)
+        if length < 126:
+            header = struct.pack("!BB", 0x80 | opcode, length)
+        elif length < 65536:
+            header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+        else:
+            header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+        with self.lock:
+            self.wfile.write(header + payload)
+            self.wfile.flush()
+
+
+def _handler(stand_in):
+    class StandInHandler(BaseHTTPRequestHandler):
+        """Dispatches the requests to the routes of the stand-in"""
+
+        protocol_version = "HTTP/1.1"
+        # the headers and the body are two writes on a kept alive connection, without
+        # TCP_NODELAY the body waits for the delayed ACK of the client (~40 ms per call)
+        disable_nagle_algorithm = True
+
+        def log_message(self, *_args):  # pylint: disable=arguments-differ
+            pass
+
+        def _serve(self):
+            parsed = urlparse(self.path)
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            status, payload, headers = stand_in.dispatch(
+                self.command, parsed.path, query, body, self.headers.get("Content-Type")
+            )
+            content = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(content)
+
+        def do_GET(self):  # pylint: disable=invalid-name
+            """Serves a GET or upgrades the FIDS data channel to a web socket"""
+            if self.headers.get("Upgrade", "").lower() != "websocket":
+                self._serve()
+                return
+            if urlparse(self.path).path != "/fids/ng/cli/ws/data":
+                self.send_error(404)
+                return
+            accept = base64.b64encode(
+                hashlib.sha1((self.headers["Sec-WebSocket-Key"] + _WS_GUID).encode("ascii")).digest()
+            ).decode("ascii")
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept)
+            self.end_headers()
+            self.wfile.flush()
+            stand_in.data_channel(WebSocketConnection(self.rfile, self.wfile))
+            self.close_connection = True
+
+        do_POST = do_PUT = do_DELETE = _serve
+
+    return StandInHandler
+
+
+def main(argv=None):
+    """Serves the stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--list-size", type=int, default=100, help="items of the generated lists")
+    parser.add_argument("--item-size", type=int, default=200, help="padding characters per item")
+    parser.add_argument("--updates-per-poll", type=int, default=10, help="rows updated per data message")
+    args = parser.parse_args(argv)
+    stand_in = AmsStandIn(
+        args.host, args.port, args.latency, args.list_size, args.item_size, args.updates_per_poll
+    )
+    print(f"AMS stand-in listening on {stand_in.url}")
+    try:
+        stand_in.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
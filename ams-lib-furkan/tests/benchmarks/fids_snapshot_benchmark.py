@@ -0,0 +1,143 @@
+"""
+Benchmark of the FIDS data channel snapshot against the previous implementation.
+
+Replays instruction streams against both implementations, checks they produce the same
+snapshots and prints the time spent by each of them.
+
+Usage:
+    python -m tests.benchmarks.fids_snapshot_benchmark [recorded_messages.jsonl ...]
+
+A recorded stream is a file with one data channel message per line, as received by the
+web socket (``{"type": "Data", "payload": {"data": {...}}}``) or only its payload. Without
+recorded streams a synthetic stream of a large view is generated.
+"""
+
+import json
+import random
+import sys
+import time
+
+from ams.fid_api_calls.cache.snapshot import FidsSnapshot
+
+# pylint: disable=line-too-long
+
+
+def legacy_apply_instruction_set(current_data, iset):
+    """Previous implementation of FidsDataChannelWebSocket.apply_updates for one instruction set"""
+
+    def list_insert(lst, index, value):
+        if len(lst) <= index:
+            lst.extend([None] * ((index + 1) - len(lst)))
+        lst[index] = value
+
+    deletes = iset.get("D", None)
+    if deletes is not None:
+        for key in deletes:
+            idx = int(key)
+            if 0 <= idx < len(current_data):
+                current_data[idx] = None
+    moves = iset.get("M", None)
+    if moves is not None:
+        for new_index, old_index in moves.items():
+            value = current_data[old_index]
+            current_data[old_index] = None
+            list_insert(current_data, int(new_index), value)
+    adds = iset.get("N", None)
+    if adds is not None:
+        for index in adds:
+            list_insert(current_data, int(index), adds[index])
+    updates = iset.get("U", None)
+    if updates is not None:
+        if isinstance(updates, list):
+            for index, item in enumerate(updates):
+                list_insert(current_data, index, item)
+        else:
+            for index in updates:
+                list_insert(current_data, int(index), updates[index])
+    while None in current_data:
+        current_data.remove(None)
+
+
+def generate_stream(rows=5000, instruction_sets=500, seed=0):
+    """
+    Generates the instruction sets of a view of ``rows`` rows. Every instruction set deletes
+    2% of the rows, moves 1% of the rows into deleted positions, adds new rows in half of the
+    free positions and at the end of the view, and updates 2% of the rows.
+    """
+    rng = random.Random(seed)
+    keys = iter(range(1, sys.maxsize))
+
+    def row():
+        return {"flightKey": next(keys), "dat": rng.random()}
+
+    stream = [{"U": [row() for _ in range(rows)]}]
+    changes = max(rows // 50, 2)
+    for _ in range(instruction_sets):
+        deletes = rng.sample(range(rows), changes)
+        kept = rng.sample(sorted(set(range(rows)) - set(deletes)), changes // 2)
+        moves = dict(zip(map(str, deletes), kept))
+        free = deletes[len(moves) :] + kept
+        rng.shuffle(free)
+        adds = {str(index): row() for index in free[: len(free) // 2]}
+        adds.update(
+            {str(rows + offset): row() for offset in range(len(free) - len(adds))}
+        )
+        updates = {str(index): row() for index in rng.sample(range(rows), changes)}
+        stream.append(
+            {
+                "D": {str(index): {} for index in deletes},
+                "M": moves,
+                "N": adds,
+                "U": updates,
+            }
+        )
+    return {"synthetic": stream}
+
+
+def load_recorded_streams(paths):
+    """Loads the instruction sets per view of recorded data channel messages"""
+    streams = {}
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as recorded_file:
+            for line in recorded_file:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                payload = message.get("payload", message)
+                for view, isets in payload.get("data", {}).items():
+                    streams.setdefault(view, []).extend(isets)
+    return streams
+
+
+def replay(streams, apply, snapshot_factory):
+    """Replays the streams, returns the final snapshots and the time spent"""
+    snapshots = {view: snapshot_factory() for view in streams}
+    start = time.perf_counter()
+    for view, stream in streams.items():
+        for iset in stream:
+            apply(snapshots[view], iset)
+    return snapshots, time.perf_counter() - start
+
+
+def main(paths):
+    """Runs the benchmark and prints the results"""
+    streams = load_recorded_streams(paths) if paths else generate_stream()
+    legacy_snapshots, legacy_time = replay(streams, legacy_apply_instruction_set, list)
+    snapshots, snapshot_time = replay(
+        streams, FidsSnapshot.apply_instruction_set, FidsSnapshot
+    )
+    for view, snapshot in snapshots.items():
+        assert list(snapshot) == legacy_snapshots[view], f"Snapshots differ for {view}"
+
+    instruction_sets = sum(len(stream) for stream in streams.values())
+    print(
+        f"{instruction_sets} instruction sets on {len(streams)} views, "
+        f"{sum(len(snapshot) for snapshot in snapshots.values())} rows at the end"
+    )
+    print(f"previous implementation: {legacy_time:.3f}s")
+    print(f"FidsSnapshot:            {snapshot_time:.3f}s")
+    print(f"speed up:                x{legacy_time / max(snapshot_time, 1e-9):.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
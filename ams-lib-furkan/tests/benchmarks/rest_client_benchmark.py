@@ -0,0 +1,147 @@
+"""
+Benchmark of the hot paths of ams-lib against the local AMS stand-in.
+
+Starts the stand-in (see ams_stand_in) on a free port, points the pooled transport at it and
+measures the throughput of:
+
+- small generic HTTP calls (_http_call), the per call overhead of the library
+- SDS lists decoded at once and streamed (_sds_call)
+- independent calls sent concurrently (_http_call_many)
+- FIDS data channel updates requested and applied (FidsDataChannelWebSocket)
+
+Usage:
+    python -m tests.benchmarks.rest_client_benchmark [--iterations 200] [--latency 0] [--list-size 5000] [--item-size 200]
+
+The protocols session is replaced by the url of the stand-in, the numbers measure the
+library, the HTTP client and the loopback only.
+"""
+
+import argparse
+import threading
+import time
+from unittest.mock import patch
+
+from ams.data_model.common_libs.clients.ams_rest_client import close_transport
+from ams.data_model.common_libs.injectors.injector import _http_call, _http_call_many
+from ams.fid_api_calls.cache.data_channel import FidsDataChannelWebSocket
+from ams.mdm_api_calls.sds.injector import _sds_call
+
+from .ams_stand_in import AmsStandIn
+
+# pylint: disable=line-too-long, protected-access
+
+HEALTH = "/sds/agent/monitor/health/readiness"
+
+
+def measure(name, calls, run):
+    """Runs the calls, prints and returns their throughput"""
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(
+        f"{name:<40} {calls:>6} calls {elapsed:>8.3f}s "
+        f"{calls / elapsed:>9.1f} calls/s {1000 * elapsed / calls:>8.3f} ms/call"
+    )
+    return calls / elapsed
+
+
+def bench_http_call(iterations):
+    """Small generic calls, one after the other"""
+
+    def run():
+        for _ in range(iterations):
+            _http_call(HEALTH)
+
+    return measure("http call (small response)", iterations, run)
+
+
+def bench_sds_list(iterations, stream):
+    """Large SDS lists, decoded at once or streamed"""
+
+    def run():
+        for _ in range(iterations):
+            items = _sds_call("GET", "stand", "4", "/list", stream=stream)
+            for _item in items:
+                pass
+
+    name = "sds list (streamed)" if stream else "sds list (decoded at once)"
+    return measure(name, iterations, run)
+
+
+def bench_http_call_many(iterations):
+    """Independent calls sent concurrently"""
+    return measure(
+        "http call many (concurrent)",
+        iterations,
+        lambda: _http_call_many([HEALTH] * iterations, check=False),
+    )
+
+
+def bench_data_channel(url, iterations):
+    """Data channel updates requested and applied one after the other"""
+    ws = FidsDataChannelWebSocket(
+        url.replace("http://", "ws://"),
+        "XXXX",
+        "ROBOT_BENCHMARK",
+        "ROBOT",
+        logging_trace=False,
+        data_poll_interval=0,
+    )
+    ws.register_view("benchmark", "select * from benchmark")
+    thread = threading.Thread(target=ws.start, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 30
+        while not ws.is_connected():
+            assert time.monotonic() < deadline, "Data channel not connected"
+            time.sleep(0.01)
+        # the first data request may be received before the views are registered
+        while not ws.get_snapshot("benchmark"):
+            assert ws.request_update(timeout=30), "No initial data received"
+
+        def run():
+            for _ in range(iterations):
+                assert ws.request_update(timeout=30), "No update received"
+
+        return measure("fids data channel update", iterations, run)
+    finally:
+        ws.close()
+        thread.join(5)
+
+
+def main(argv=None):
+    """Runs the benchmarks and prints the results"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", 1)[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request of the stand-in")
+    parser.add_argument("--list-size", type=int, default=5000, help="items of the SDS lists")
+    parser.add_argument("--item-size", type=int, default=200, help="padding characters per item")
+    args = parser.parse_args(argv)
+
+    with AmsStandIn(
+        latency=args.latency, list_size=args.list_size, item_size=args.item_size
+    ) as stand_in, patch(
+        "ams.data_model.common_libs.clients.ams_rest_client.session_manager"
+    ) as mock_session_manager:
+        mock_session_manager.sessions._get_security_context_details.return_value = {
+            "server_url": stand_in.url,
+            "header": {},
+        }
+        print(
+            f"AMS stand-in on {stand_in.url}: latency {args.latency}s, "
+            f"lists of {args.list_size} items of {args.item_size} characters"
+        )
+        try:
+            bench_http_call(args.iterations)
+            list_iterations = max(args.iterations // 20, 1)
+            bench_sds_list(list_iterations, stream=False)
+            bench_sds_list(list_iterations, stream=True)
+            bench_http_call_many(args.iterations)
+            bench_data_channel(stand_in.url, args.iterations)
+        finally:
+            close_transport()
+        print(f"{stand_in.requests} requests served")
+
+
+if __name__ == "__main__":
+    main()
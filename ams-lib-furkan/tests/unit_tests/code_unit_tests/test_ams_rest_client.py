@@ -0,0 +1,75 @@
+"""Unit tests for the pooled REST transport"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+import pytest
+
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    STATISTICS,
+    RestTransport,
+)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        body = b'{"cookie": "' + self.headers.get("Cookie", "").encode("utf-8") + b'"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Set-Cookie", "JSESSIONID=server")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_connections_are_reused(server_url):
+    security_context = {"server_url": server_url, "header": {"Cookie": "user=1"}}
+    transport = RestTransport(pool_size=2, timeout=5)
+    STATISTICS.reset()
+    with patch(
+        "ams.data_model.common_libs.clients.ams_rest_client.session_manager"
+    ) as mock_session_manager:
+        mock_session_manager.sessions._get_security_context_details.return_value = (
+            security_context
+        )
+        for _ in range(5):
+            response = transport.send(
+                {"operation": "GET", "path": "/test", "expected_status_code": "200"}
+            )
+            # only the cookie of the security context is sent
+            assert response.json() == {"cookie": "user=1"}
+    transport.close()
+
+    statistics = STATISTICS.snapshot()["127.0.0.1"]
+    assert statistics["requests"] == 5
+    assert statistics["new_connections"] == 1
+    assert statistics["reused_connections"] == 4
+
+
+def test_unexpected_status_code(server_url):
+    transport = RestTransport(pool_size=1, timeout=5)
+    with patch(
+        "ams.data_model.common_libs.clients.ams_rest_client.session_manager"
+    ) as mock_session_manager:
+        mock_session_manager.sessions._get_security_context_details.return_value = {
+            "server_url": server_url,
+            "header": {},
+        }
+        with pytest.raises(AssertionError):
+            transport.send({"path": "/test", "expected_status_code": "201"})
+    transport.close()
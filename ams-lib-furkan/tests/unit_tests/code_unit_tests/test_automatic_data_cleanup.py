@@ -0,0 +1,101 @@
+"""Unit tests for the automatic data cleanup"""
+
+from unittest.mock import patch
+
+from ams.generic_ams_functionality.teardown_setup import injector as teardown
+
+MODULE = "ams.generic_ams_functionality.teardown_setup.injector"
+
+
+def test_cleanup_order_and_summary():
+    data_to_clean_up = {
+        "stand": ["STD1", "STD2", "STD3"],
+        "leg_period": ["LP1"],
+        "fids": [
+            {"view": "parent", "fields": ["id"], "entity": {"id": 1}},
+            {"view": "child", "fields": ["id"], "entity": {"id": 2}},
+            {"view": "child", "fields": ["id"], "entity": {"id": 3}},
+        ],
+        "movement": ["MVT1", "MVT2"],
+        "gate": ["GAT1"],
+    }
+    calls = []
+
+    def sds_delete(entity_type, entity_id):
+        calls.append(entity_type)
+        if entity_id == "STD2":
+            raise AssertionError("not found")
+
+    with patch(f"{MODULE}.session_manager") as mock_session_manager, patch(
+        f"{MODULE}.sds_delete", side_effect=sds_delete
+    ), patch(
+        f"{MODULE}.fom_v3_movements_delete",
+        side_effect=lambda _: calls.append("movement"),
+    ), patch(
+        f"{MODULE}._delete_leg_period",
+        side_effect=lambda _: calls.append("leg_period"),
+    ), patch(
+        f"{MODULE}._delete_fids_entity",
+        side_effect=lambda item: calls.append(item["view"]),
+    ):
+        mock_session_manager.sessions._get_session_context_data.return_value = {
+            "test_context": {"data_to_clean_up": data_to_clean_up}
+        }
+        summary = teardown.automatic_data_cleanup()
+
+    # movements before leg periods, FIDS children before parents,
+    # SDS entity types in the reverse order of creation
+    assert calls == [
+        "movement",
+        "movement",
+        "leg_period",
+        "child",
+        "child",
+        "parent",
+        "gate",
+        "stand",
+        "stand",
+        "stand",
+        # the failed delete is tried again once
+        "stand",
+    ]
+    assert list(summary) == ["movement", "leg_period", "fids", "gate", "stand"]
+    assert summary["stand"]["count"] == 3
+    assert summary["stand"]["failed"] == 1
+    assert summary["movement"]["failed"] == 0
+
+
+def test_failed_deletes_tried_again_after_the_other_types():
+    # the parents were first registered after their children
+    data_to_clean_up = {
+        "gate": ["GAT1"],
+        "stand": ["STD1"],
+        "fids": [
+            {"view": "child", "fields": ["id"], "entity": {"id": 1}},
+            {"view": "parent", "fields": ["id"], "entity": {"id": 2}},
+        ],
+    }
+    deleted = []
+
+    def sds_delete(entity_type, entity_id):
+        # the gate is referenced by the stand
+        if entity_type == "gate" and "STD1" not in deleted:
+            raise AssertionError("gate still referenced")
+        deleted.append(entity_id)
+
+    def delete_fids_entity(item):
+        if item["view"] == "parent" and 1 not in deleted:
+            raise AssertionError("parent still referenced")
+        deleted.append(item["entity"]["id"])
+
+    with patch(f"{MODULE}.session_manager") as mock_session_manager, patch(
+        f"{MODULE}.sds_delete", side_effect=sds_delete
+    ), patch(f"{MODULE}._delete_fids_entity", side_effect=delete_fids_entity):
+        mock_session_manager.sessions._get_session_context_data.return_value = {
+            "test_context": {"data_to_clean_up": data_to_clean_up}
+        }
+        summary = teardown.automatic_data_cleanup()
+
+    assert deleted == [1, 2, "STD1", "GAT1"]
+    assert summary["gate"]["failed"] == 0
+    assert summary["fids"]["failed"] == 0
@@ -0,0 +1,100 @@
+"""Unit tests for the eventual consistency waits"""
+
+import pytest
+
+from ams.data_model.common_libs.utils.backoff import (
+    STATISTICS,
+    BackoffPolicy,
+    wait_until_succeeds,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_policy_delays():
+    policy = BackoffPolicy(initial_interval=1, max_interval=5, multiplier=2, jitter=0)
+    assert [policy.delay(attempt) for attempt in range(5)] == [1, 2, 4, 5, 5]
+
+    policy = BackoffPolicy(initial_interval=1, max_interval=5, multiplier=2, jitter=0.5)
+    assert all(0.5 <= policy.delay(0) <= 1 for _ in range(100))
+
+
+def test_fetch_retried_after_probe():
+    clock = _Clock()
+    probes = []
+    fetches = []
+
+    def probe():
+        probes.append(clock.now)
+        return len(probes) >= 3
+
+    def fetch():
+        fetches.append(clock.now)
+        if len(fetches) < 2:
+            raise ValueError("not yet")
+        return "visit"
+
+    STATISTICS.reset()
+    result = wait_until_succeeds(
+        fetch,
+        probe=probe,
+        timeout=60,
+        policy=BackoffPolicy(initial_interval=1, jitter=0),
+        name="Find Visit",
+        sleep=clock.sleep,
+        clock=clock,
+    )
+
+    assert result == "visit"
+    # the fetch is not called until the probe succeeded
+    assert len(probes) == 4 and len(fetches) == 2
+    assert clock.sleeps == [1, 2, 4]
+    statistics = STATISTICS.snapshot()["Find Visit"]
+    assert statistics["waits"] == 1
+    assert statistics["attempts"] == 2
+    assert statistics["max_time"] == 7
+
+
+def test_deadline():
+    clock = _Clock()
+
+    def fetch():
+        raise ValueError("not found")
+
+    STATISTICS.reset()
+    with pytest.raises(AssertionError, match="after 5 attempt\\(s\\): not found"):
+        wait_until_succeeds(
+            fetch,
+            timeout=10,
+            policy=BackoffPolicy(initial_interval=1, max_interval=4, jitter=0),
+            sleep=clock.sleep,
+            clock=clock,
+        )
+    # the last attempt is made at the deadline
+    assert clock.sleeps == [1, 2, 4, 3]
+    assert STATISTICS.snapshot()["fetch"]["failures"] == 1
+
+
+def test_error_not_retried():
+    class FatalError(Exception):
+        dont_continue = True
+
+    def fetch():
+        raise FatalError("syntax error")
+
+    with pytest.raises(FatalError):
+        wait_until_succeeds(
+            fetch,
+            retry_error=lambda error: not getattr(error, "dont_continue", False),
+        )
@@ -0,0 +1,125 @@
+"""Unit tests for the HTTP cassettes"""
+
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from ams.data_model.common_libs.clients import cassette
+from ams.data_model.common_libs.clients.cassette import (
+    CassetteListener,
+    CassetteMiss,
+    active_cassette,
+    request_key,
+    start_cassette,
+    stop_cassette,
+)
+
+
+def _response(request, status, content):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    response.headers["Content-Type"] = "application/json"
+    response.request = request
+    response.url = request.url
+    return response
+
+
+def test_request_key():
+    assert request_key("get", "https://ams/fom/v3/movements/123?b=2&a=1") == (
+        "GET|/fom/v3/movements/{id}|a=1&b=2|"
+    )
+    multipart = request_key(
+        "POST", "https://ams/x", b"--abc\r\ndata--abc--", "multipart/form-data; boundary=abc"
+    )
+    assert multipart == request_key(
+        "POST", "https://ams/x", b"--def\r\ndata--def--", "multipart/form-data; boundary=def"
+    )
+    assert request_key("POST", "https://ams/x", '{"a": 1}') != request_key(
+        "POST", "https://ams/x", '{"a": 2}'
+    )
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    bodies = {"/items/1": b'{"id": 1}', "/items/2": b'{"id": 2}', "/bin": b"\xff\x00"}
+
+    def send(request, **_kwargs):
+        return _response(request, 200, bodies[requests.utils.urlparse(request.url).path])
+
+    with patch("requests.adapters.HTTPAdapter.send", side_effect=send) as mock_send:
+        start_cassette(path, "record")
+        with requests.Session() as session:
+            for item in ("/items/1", "/items/2", "/bin"):
+                session.get(f"https://ams{item}")
+        stop_cassette()
+        assert mock_send.call_count == 3
+
+        start_cassette(path, "replay")
+        try:
+            with requests.Session() as session:
+                # same templated path, the exact path is served first
+                assert session.get("https://other/items/2").json() == {"id": 2}
+                assert session.get("https://other/items/1").json() == {"id": 1}
+                assert session.get("https://other/items/2").json() == {"id": 2}
+                assert session.get("https://other/bin").content == b"\xff\x00"
+                chunks = session.get("https://other/items/1", stream=True).iter_content(2)
+                assert b"".join(chunks) == b'{"id": 1}'
+                with pytest.raises(CassetteMiss):
+                    session.post("https://other/items/1", json={})
+        finally:
+            stop_cassette()
+        assert mock_send.call_count == 3
+
+    assert requests.Session.send is cassette._ORIGINAL_SEND
+
+
+def test_record_twice(tmp_path, monkeypatch):
+    path = str(tmp_path / "cassette.jsonl.gz")
+    body = {"value": b'{"run": 1}'}
+
+    def send(request, **_kwargs):
+        return _response(request, 200, body["value"])
+
+    def record(*items):
+        start_cassette(path, "record")
+        with requests.Session() as session:
+            for item in items:
+                session.get(f"https://ams{item}")
+        stop_cassette()
+
+    with patch("requests.adapters.HTTPAdapter.send", side_effect=send):
+        record("/items/1")
+        # a new run of the process replaces the previous recording
+        monkeypatch.setattr(cassette, "_RECORDED_PATHS", set())
+        body["value"] = b'{"run": 2}'
+        record("/items/1")
+        # the recordings of the same run are appended
+        record("/items/2")
+
+    recorded = start_cassette(path, "replay")
+    try:
+        assert len(recorded) == 2
+        with requests.Session() as session:
+            assert session.get("https://ams/items/1").json() == {"run": 2}
+            assert session.get("https://ams/items/2").json() == {"run": 2}
+    finally:
+        stop_cassette()
+
+
+def test_listener_started_with_the_first_suite(tmp_path, monkeypatch):
+    monkeypatch.setenv("AMS_CASSETTE_MODE", "record")
+    monkeypatch.setenv("AMS_CASSETTE", str(tmp_path / "cassette.jsonl.gz"))
+    listener = CassetteListener()
+    # child suites of a directory run, the top level suite is not seen
+    listener.start_suite("Level 2", {"id": "s1-s1"})
+    started = active_cassette()
+    assert started is not None
+    listener.end_suite("Level 2", {"id": "s1-s1"})
+    listener.start_suite("Level 3", {"id": "s1-s2"})
+    assert active_cassette() is started
+    listener.end_suite("Level 3", {"id": "s1-s2"})
+    listener.close()
+    assert active_cassette() is None
+    assert requests.Session.send is cassette._ORIGINAL_SEND
@@ -4,6 +4,11 @@
 import unittest
 import json
 from ams.fid_api_calls.cache.data_channel import FidsDataChannelWebSocket
+from ams.fid_api_calls.cache.snapshot import FidsSnapshot
+from tests.benchmarks.fids_snapshot_benchmark import (
+    generate_stream,
+    legacy_apply_instruction_set,
+)
 
 
 class TestFidsDataChannel(unittest.TestCase):
@@ -116,6 +121,68 @@ class TestFidsDataChannel(unittest.TestCase):
 
         ws.close()
 
+    def test_snapshot_matches_previous_implementation(self):
+        """The snapshot gives the same rows as the previous implementation on generated streams."""
+        for seed in range(5):
+            stream = generate_stream(rows=60, instruction_sets=40, seed=seed)[
+                "synthetic"
+            ]
+            legacy_snapshot = []
+            snapshot = FidsSnapshot()
+            for iset in stream:
+                legacy_apply_instruction_set(legacy_snapshot, iset)
+                snapshot.apply_instruction_set(iset)
+                self.assertEqual(list(snapshot), legacy_snapshot)
+
+    def test_snapshot_index(self):
+        """Rows are found through the index of the field after adds, updates, deletes and moves."""
+        snapshot = FidsSnapshot(index_fields=["flightKey"])
+        snapshot.apply_instruction_set(
+            {"N": {"0": {"flightKey": 1}, "1": {"flightKey": 2}}}
+        )
+        self.assertEqual(snapshot.find("flightKey", 2), [{"flightKey": 2}])
+
+        snapshot.apply_instruction_set({"U": {"0": {"flightKey": 3, "dat": 1}}})
+        self.assertEqual(snapshot.find("flightKey", 1), [])
+        self.assertEqual(snapshot.find("flightKey", 3), [{"flightKey": 3, "dat": 1}])
+
+        snapshot.apply_instruction_set({"M": {"0": 1}})
+        self.assertEqual(list(snapshot), [{"flightKey": 2}])
+        self.assertEqual(snapshot.find("flightKey", 2), [{"flightKey": 2}])
+        self.assertEqual(snapshot.find("flightKey", 3), [])
+
+    def test_subscriptions(self):
+        """Subscriptions are resolved by the updates touching matching rows."""
+        ws = FidsDataChannelWebSocket(
+            url="wss://none.test/data/channel",
+            monitor_id="TEST",
+            cli_id="TEST",
+            home_airport="XXXX",
+        )
+        ws.register_view("viewTest", "Select Test_Data")
+        ws.register_index("viewTest", "flightKey")
+
+        found = ws.subscribe("viewTest", field="flightKey", value=2)
+        empty = ws.subscribe("viewTest")
+        self.assertTrue(empty.event.is_set())
+        self.assertEqual(ws.wait_for_subscription(empty, timeout=0), [])
+
+        ws.apply_updates(json.loads("""{"data":{"viewTest":[{"N":{"0":{"flightKey":1}}}]}}"""))
+        self.assertFalse(found.event.is_set())
+
+        ws.apply_updates(json.loads("""{"data":{"viewTest":[{"N":{"1":{"flightKey":2}}}]}}"""))
+        self.assertEqual(ws.wait_for_subscription(found, timeout=0), [{"flightKey": 2}])
+        self.assertEqual(ws.subscriptions["viewTest"], [])
+
+        self.assertIsNone(ws.wait_for_field("viewTest", "flightKey", 5, timeout=0))
+        self.assertEqual(
+            ws.wait_for_data("viewTest", lambda item: item["flightKey"] > 1, timeout=0),
+            [{"flightKey": 2}],
+        )
+        self.assertTrue(ws.wait_for_initial_data(timeout=0))
+
+        ws.close()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+"""Unit tests for the FIDS login of pooled sessions"""
+
+from unittest.mock import MagicMock, patch
+
+from ams.data_model.common_libs.clients.ams_rest_client import get_security_context
+from ams.data_model.initialize_ams_test.session_pool import SessionPool
+from ams.fid_api_calls.crud import injector
+
+MODULE = "ams.fid_api_calls.crud"
+
+ENVIRONMENT_CONTEXT = {"server_url": "https://ams.test"}
+
+
+def fake_login(_environment_context, user):
+    return {"Cookie": f"session={user['username']}"}
+
+
+class FakeFids:
+    """Answers the FIDS calls and keeps the headers each call was sent with"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, rest_details, session_key):
+        header = get_security_context(session_key)["header"]
+        self.calls.append((rest_details["path"], session_key, dict(header)))
+        response = MagicMock()
+        response.headers = {"Set-Cookie": f"JSESSIONID={session_key}"}
+        response.json.return_value = {"results": {"ref_airport_icao": "EBBR"}}
+        return response
+
+
+def test_fids_login_on_a_pooled_session():
+    default_header = {"Cookie": "session=default"}
+    context_data = {"test_context": {}}
+    fids = FakeFids()
+    pool = SessionPool(
+        [{"username": "a"}], ENVIRONMENT_CONTEXT, refresh_interval=0, login=fake_login
+    ).open()
+    try:
+        with patch(f"{MODULE}.injector.session_manager") as session_manager, patch(
+            f"{MODULE}.injector_rest.session_manager", session_manager
+        ), patch(f"{MODULE}.injector.send_request", fids):
+            session_manager.sessions._get_session_context_data.return_value = (
+                context_data
+            )
+            session_manager.sessions._get_security_context_details.return_value = {
+                "header": default_header
+            }
+            injector.fids_login(session_key="pool_0")
+
+            header = get_security_context("pool_0")["header"]
+            assert header["Cookie"] == "session=a; JSESSIONID=pool_0"
+            assert header["APT_AEP_INSTANCE_ID"]
+            # the default session is left as is
+            assert default_header == {"Cookie": "session=default"}
+            assert context_data["test_context"]["fids_home_airport"] == "EBBR"
+
+            # the FIDS cookie is kept when the pooled session is logged in again
+            pool.refresh("pool_0")
+            injector.fids_get_ui_updates(session_key="pool_0")
+            _path, session_key, sent_header = fids.calls[-1]
+            assert session_key == "pool_0"
+            assert sent_header["Cookie"] == "session=a; JSESSIONID=pool_0"
+            assert sent_header["APT_AEP_INSTANCE_ID"] == header["APT_AEP_INSTANCE_ID"]
+
+            injector.fids_logout(session_key="pool_0")
+            header = get_security_context("pool_0")["header"]
+            assert header["Cookie"] == "session=a"
+            assert header["APT_AEP_INSTANCE_ID"] is None
+            assert not context_data["test_context"]["fids_sessions"]
+    finally:
+        pool.close()
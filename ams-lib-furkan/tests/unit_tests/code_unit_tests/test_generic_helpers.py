@@ -6,6 +6,10 @@ from ams.data_model.common_libs.utils.generic_helpers import (
     construct_default_params,
     construct_attributes,
     initialize_test_context,
+    find_matching_setting,
+    find_matching_setting_with_criteria,
+    find_matching_toggle,
+    invalidate_settings_index,
 )
 
 
@@ -62,3 +66,82 @@ class TestGenericHelpers:
             match=f'Test Data context file "{test_data_file_path}" does not exist',
         ):
             initialize_test_context(test_data_file_path)
+
+
+class TestSettingsIndex:
+    def setup_method(self):
+        self.context_data = {
+            "active_configuration": {
+                "settings": [
+                    {"applicationName": "APP", "parameterName": "P1", "value": 1},
+                    {
+                        "applicationName": "APP",
+                        "parameterName": "P2",
+                        "criteria": [],
+                        "children": [
+                            {
+                                "criteria": [{"name": "AIRLINE", "value": "6X"}],
+                                "children": [{"criteria": [{"name": "GATE"}]}],
+                            }
+                        ],
+                    },
+                    {"applicationName": "APP", "parameterName": "P1", "value": 2},
+                ]
+            },
+            "toggles_configuration": {
+                "settings": [
+                    {
+                        "applicationName": "APP",
+                        "children": [{"parameterName": "T1", "value": True}],
+                    }
+                ]
+            },
+        }
+        invalidate_settings_index()
+        self.patcher = patch(
+            "ams.data_model.common_libs.utils.generic_helpers.session_manager"
+        )
+        self.mock_session_manager = self.patcher.start()
+        self.mock_session_manager.sessions._get_session_context_data.return_value = (
+            self.context_data
+        )
+
+    def teardown_method(self):
+        self.patcher.stop()
+
+    def test_find_matching_setting(self):
+        # the first matching setting wins
+        assert find_matching_setting("P1", "APP")["value"] == 1
+        assert find_matching_setting("P3", "APP", skip_when_not_found=False) is None
+
+    def test_find_matching_setting_with_criteria(self):
+        result = find_matching_setting_with_criteria(
+            "P2", "APP", '[{"value": "6X", "name": "AIRLINE"}]'
+        )
+        assert result["children"][0]["criteria"] == [{"name": "GATE"}]
+        assert find_matching_setting_with_criteria("P2", "APP", [{"name": "GATE"}]) == {
+            "criteria": [{"name": "GATE"}]
+        }
+        assert (
+            find_matching_setting_with_criteria(
+                "P2", "APP", [{"name": "STAND"}], skip_when_not_found=False
+            )
+            is None
+        )
+
+    def test_find_matching_toggle(self):
+        assert find_matching_toggle("T1", "APP")["value"] is True
+        assert find_matching_toggle("T2", "APP", skip_when_not_found=False) is None
+
+    def test_index_is_rebuilt_when_configuration_changes(self):
+        assert find_matching_setting("P1", "APP")["value"] == 1
+        self.context_data["active_configuration"] = {
+            "settings": [{"applicationName": "APP", "parameterName": "P1", "value": 3}]
+        }
+        assert find_matching_setting("P1", "APP")["value"] == 3
+        self.context_data["active_configuration"]["settings"][0]["value"] = 4
+        self.context_data["active_configuration"]["settings"].insert(
+            0, {"applicationName": "APP", "parameterName": "P1", "value": 5}
+        )
+        invalidate_settings_index()
+        assert find_matching_setting("P1", "APP")["value"] == 5
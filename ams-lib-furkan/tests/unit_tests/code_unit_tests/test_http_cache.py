@@ -0,0 +1,85 @@
+"""Unit tests for the conditional GET cache"""
+
+from unittest.mock import MagicMock, patch
+
+from ams.data_model.common_libs.clients.ams_rest_client import RestTransport
+from ams.data_model.common_libs.clients.http_cache import HTTP_CACHE, HttpCache
+
+MODULE = "ams.data_model.common_libs.clients.ams_rest_client"
+
+
+def _response(status, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status
+    response.content = content
+    response.headers = headers or {}
+    response.encoding = "utf-8"
+    response.url = "http://ams.test/sds/data/v4/stand/list"
+    return response
+
+
+def _send(transport, session, rest_details):
+    with patch(f"{MODULE}.session_manager") as mock_session_manager, patch.object(
+        transport, "get_session", return_value=session
+    ):
+        mock_session_manager.sessions._get_security_context_details.return_value = {
+            "server_url": "http://ams.test",
+            "header": {},
+        }
+        return transport.send(rest_details)
+
+
+def test_revalidated_with_validators():
+    HTTP_CACHE.reset()
+    session = MagicMock()
+    session.request.side_effect = [
+        _response(200, b"[1, 2]", {"ETag": '"v1"'}),
+        _response(304),
+        _response(200, b"[1]", {"ETag": '"v2"'}),
+        _response(200, b"[1]", {"ETag": '"v2"'}),
+    ]
+    transport = RestTransport(pool_size=1, timeout=1)
+    details = {"operation": "GET", "path": "/sds/data/v4/stand/list", "cache": True}
+
+    assert _send(transport, session, details).content == b"[1, 2]"
+    # not modified, the cached body is reused
+    assert _send(transport, session, details).content == b"[1, 2]"
+    assert session.request.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+
+    HTTP_CACHE.invalidate(r"/sds/data/v\d+/stand([/?]|$)")
+    assert _send(transport, session, details).content == b"[1]"
+    assert "If-None-Match" not in session.request.call_args.kwargs["headers"]
+    assert HTTP_CACHE.statistics() == {
+        "entries": 1,
+        "hits": 0,
+        "revalidations": 1,
+        "misses": 2,
+    }
+
+    # calls not marked as cached are always sent
+    _send(transport, session, {"operation": "GET", "path": "/sds/data/v4/stand/list"})
+    assert session.request.call_count == 4
+    HTTP_CACHE.reset()
+
+
+def test_ttl_without_validators():
+    now = [0.0]
+    cache = HttpCache(ttl=10, clock=lambda: now[0])
+    key = cache.key(
+        "defaultKey", {"path": "/cds/services/v1/rules/tags", "params": {"b": 2, "a": 1}}
+    )
+    assert key == ("defaultKey", "/cds/services/v1/rules/tags", "a=1&b=2")
+
+    assert cache.lookup(key) == (None, False)
+    cache.resolve(key, None, _response(200, b"{}"))
+    entry, fresh = cache.lookup(key)
+    assert fresh and cache.hit(entry).content == b"{}"
+
+    now[0] = 11
+    entry, fresh = cache.lookup(key)
+    assert entry is not None and not fresh
+    assert entry.conditional_headers() == {}
+
+    # an error drops the cached response
+    cache.resolve(key, entry, _response(500))
+    assert cache.lookup(key) == (None, False)
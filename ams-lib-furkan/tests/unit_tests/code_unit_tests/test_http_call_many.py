@@ -0,0 +1,72 @@
+"""Unit tests for the concurrent HTTP calls"""
+
+import json
+import threading
+import time
+from unittest.mock import MagicMock, patch
+import pytest
+
+from ams.data_model.common_libs.injectors.injector import _http_call_many
+
+MODULE = "ams.data_model.common_libs.injectors.injector"
+
+
+def _response(status_code, body=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(body).encode("utf-8")
+    return response
+
+
+def test_results_in_order_and_concurrent():
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def send_request(rest_details, _session_key):
+        with lock:
+            in_flight.append(rest_details["path"])
+            max_in_flight.append(len(in_flight))
+        # the first calls answer last
+        time.sleep(0.05 if rest_details["path"].endswith("/0") else 0.01)
+        with lock:
+            in_flight.remove(rest_details["path"])
+        if rest_details["path"].endswith("/3"):
+            return _response(204)
+        return _response(200, {"path": rest_details["path"]})
+
+    specs = [
+        "/items/0",
+        ("/items/{id}", {"path_params": {"id": 1}}),
+        {"path": "/items/2", "query_params": {"page": 1}},
+        "/items/3",
+    ]
+    with patch(f"{MODULE}.send_request", side_effect=send_request):
+        results = _http_call_many(specs, concurrency=2)
+
+    assert results == [
+        {"path": "/items/0"},
+        {"path": "/items/1"},
+        {"path": "/items/2"},
+        None,
+    ]
+    assert max(max_in_flight) == 2
+
+
+def test_failures():
+    def send_request(rest_details, _session_key):
+        if rest_details["path"] == "/error":
+            return _response(500)
+        return _response(200, {"generalProcessingStatus": "KO"})
+
+    with patch(f"{MODULE}.send_request", side_effect=send_request):
+        with pytest.raises(ValueError, match="/error failed with status 500"):
+            _http_call_many(["/ok", "/error"], concurrency=2)
+
+        results = _http_call_many(
+            ["/ok", "/error"], concurrency=2, check=True, return_exceptions=True
+        )
+        assert all(isinstance(result, ValueError) for result in results)
+        assert "generalProcessingStatus=KO" in str(results[0])
+
+        assert _http_call_many([]) == []
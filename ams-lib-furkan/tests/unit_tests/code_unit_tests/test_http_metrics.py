@@ -0,0 +1,166 @@
+"""Unit tests for the HTTP metrics"""
+
+import csv
+import json
+import os
+from unittest.mock import MagicMock, patch
+
+from ams.data_model.common_libs.clients.ams_rest_client import RestTransport
+from ams.data_model.common_libs.clients.http_metrics import (
+    MAX_LATENCY_SAMPLES,
+    HttpMetrics,
+    HttpMetricsListener,
+    METRICS,
+    PathTemplates,
+    percentile,
+    template_path,
+)
+
+
+def test_template_path():
+    assert (
+        template_path("/fom/rest-services/v3/movements/internal-id/123?x=1")
+        == "/fom/rest-services/v3/movements/internal-id/{id}"
+    )
+    assert (
+        template_path("/rm/services/plans/find/5940b6e8-63cd-42a4-9438-9e6445ae716a")
+        == "/rm/services/plans/find/{id}"
+    )
+    assert template_path("/sds/data/v3/stand/list") == "/sds/data/v3/stand/list"
+
+
+def test_registered_path_templates():
+    templates = PathTemplates()
+    templates.register_end_points(
+        {
+            "mdm": {
+                "stand": {"stand": "/sds/data/v4/stand", "count": "/sds/data/v4/stand/count"},
+                "airline": {"byCode": "/sds/data/v4/airline/byCode"},
+            },
+            "fom": {"movements": {"internal_id": "/fom/rest-services/v3/movements/internal-id/{id}"}},
+        }
+    )
+    templates.register("/sds/data/v2/stand/{customerId}/{airportId}/{id}")
+    templates.register("/sds/data/v3/airline/build?id={id}")
+
+    assert templates.match("/sds/data/v4/stand/count") == "/sds/data/v4/stand/count"
+    # codes without digits are parameters of the end point
+    assert templates.match("/sds/data/v4/airline/byCode/ZZ") == "/sds/data/v4/airline/byCode/{id}"
+    assert templates.match("/sds/data/v4/stand/A1") == "/sds/data/v4/stand/{id}"
+    # fixed segments of the templates are not parameters
+    templates.register("/sds/data/v3/stand/list/{airportId}")
+    assert templates.match("/sds/data/v4/stand/list") == "/sds/data/v4/stand/list"
+    assert (
+        templates.match("/sds/data/v2/stand/CUST/APT_NCE/STD1?x=1")
+        == "/sds/data/v2/stand/{customerId}/{airportId}/{id}"
+    )
+    assert templates.match("/sds/data/v3/airline/build") == "/sds/data/v3/airline/build"
+    assert (
+        templates.match("/fom/rest-services/v3/movements/internal-id/ABC")
+        == "/fom/rest-services/v3/movements/internal-id/{id}"
+    )
+    assert templates.match("/cfg/unknown/NCE") is None
+
+
+def test_memory_bounded_by_endpoints():
+    metrics = HttpMetrics()
+    for index in range(MAX_LATENCY_SAMPLES * 3):
+        metrics.record("GET", "/sds/data/v4/stand/list", 200, index / 1000)
+    (aggregate,) = metrics._endpoints.values()
+    assert len(aggregate.latencies) == MAX_LATENCY_SAMPLES
+    (stand,) = metrics.report()["endpoints"]
+    assert stand["count"] == MAX_LATENCY_SAMPLES * 3
+    assert stand["max"] == 2.999
+    assert 1.2 < stand["p50"] < 1.8
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([3], 0.95) == 3
+    assert percentile([], 0.5) is None
+
+
+def test_report_per_endpoint_and_keyword(tmp_path):
+    metrics = HttpMetrics()
+    listener = HttpMetricsListener(metrics)
+    listener.start_keyword("ams.Sds List", {})
+    for latency in (0.05, 0.1, 0.2, 0.3):
+        metrics.record("get", "/sds/data/v3/stand/list", 200, latency, 0, 1000)
+    listener.start_keyword("ams.Http Call", {})
+    metrics.record(
+        "GET", "/x/1", 500, 1.0, path_template="/x/{conf_id}", request_bytes=10
+    )
+    listener.end_keyword("ams.Http Call", {})
+    listener.end_keyword("ams.Sds List", {})
+    metrics.record("POST", "/y", None, 0.5)
+
+    report = metrics.report()
+    endpoints = {(row["method"], row["path"]): row for row in report["endpoints"]}
+    stand = endpoints[("GET", "/sds/data/v3/stand/list")]
+    assert stand["count"] == 4
+    assert stand["p50"] == 0.1 and stand["max"] == 0.3
+    assert stand["response_bytes"] == 4000
+    assert endpoints[("GET", "/x/{conf_id}")]["error_rate"] == 1
+    assert endpoints[("POST", "/y")]["errors"] == 1
+    # the slowest endpoint first
+    assert report["endpoints"][0]["path"] == "/x/{conf_id}"
+
+    keywords = {row["keyword"]: row for row in report["keywords"]}
+    assert keywords["ams.Sds List"]["count"] == 4
+    assert keywords["ams.Http Call"]["count"] == 1
+    assert keywords[""]["count"] == 1
+
+    json_path = metrics.write_report(str(tmp_path))
+    with open(json_path, encoding="utf-8") as file:
+        assert json.load(file) == report
+    with open(os.path.join(tmp_path, "ams_http_metrics.csv"), encoding="utf-8") as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 3 and rows[0]["path"] == "/x/{conf_id}"
+    assert os.path.isfile(os.path.join(tmp_path, "ams_http_metrics_keywords.csv"))
+
+
+def test_transport_calls_are_measured():
+    response = MagicMock()
+    response.status_code = 204
+    response.content = b""
+    response.request.body = b'{"a": 1}'
+    session = MagicMock()
+    session.request.return_value = response
+    transport = RestTransport(pool_size=1, timeout=1)
+    METRICS.reset()
+    with patch(
+        "ams.data_model.common_libs.clients.ams_rest_client.session_manager"
+    ) as mock_session_manager, patch.object(
+        transport, "get_session", return_value=session
+    ):
+        mock_session_manager.sessions._get_security_context_details.return_value = {
+            "server_url": "http://ams.test",
+            "header": {},
+        }
+        transport.send(
+            {"operation": "PUT", "path": "/items/12", "path_template": "/items/{id}"}
+        )
+    endpoints = METRICS.report()["endpoints"]
+    assert len(endpoints) == 1
+    assert endpoints[0]["method"] == "PUT"
+    assert endpoints[0]["path"] == "/items/{id}"
+    assert endpoints[0]["errors"] == 0
+    assert endpoints[0]["request_bytes"] == 8
+
+
+def test_report_written_when_the_execution_ends(tmp_path):
+    metrics = HttpMetrics()
+    listener = HttpMetricsListener(metrics)
+    metrics.record("GET", "/sds/data/v3/stand/list", 200, 0.1)
+    with patch(
+        "ams.data_model.common_libs.clients.http_metrics._report_directory",
+        return_value=str(tmp_path),
+    ):
+        # child suites of a directory run, the top level suite is not seen
+        listener.start_suite("Level 2", {"id": "s1-s1"})
+        listener.start_suite("Level 3", {"id": "s1-s2"})
+        assert not os.listdir(tmp_path)
+        listener.close()
+    assert os.path.isfile(os.path.join(tmp_path, "ams_http_metrics.json"))
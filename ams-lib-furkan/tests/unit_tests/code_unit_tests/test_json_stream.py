@@ -0,0 +1,101 @@
+"""Unit tests for the incremental JSON decoding"""
+
+import json
+from unittest.mock import MagicMock, patch
+import pytest
+
+from ams.data_model.common_libs.utils.json_stream import (
+    iter_json_array,
+    iter_response_items,
+    loads,
+    parse_path,
+    stream_option,
+)
+from ams.mdm_api_calls.sds.injector import sds_list
+
+DOCUMENT = {
+    "meta": {"filters": [1, 2, {"text": "]}"}], "count": 3},
+    "total": 12.5,
+    "content": [
+        {"id": index, "name": 'é"}]' * (index % 3), "values": [index, 1.5e3, None, True]}
+        for index in range(50)
+    ],
+    "tail": None,
+}
+
+
+def _chunks(document, size):
+    data = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    return [data[index : index + size] for index in range(0, len(data), size)]
+
+
+def test_parse_path():
+    assert parse_path(True) == []
+    assert parse_path(None) == []
+    assert parse_path("content") == ["content"]
+    assert parse_path("data.alerts[*]") == ["data", "alerts"]
+
+
+def test_stream_option():
+    # the arguments of the keywords are strings when given by Robot Framework
+    for value in (None, False, "", "False", "false", "None", "0"):
+        assert stream_option(value) is None
+    for value in (True, "True", "yes"):
+        assert stream_option(value) is True
+    assert stream_option("content") == "content"
+
+
+def test_list_not_streamed_with_false_string():
+    response = MagicMock(status_code=200, content=b'[{"id": 1}]')
+    module = "ams.mdm_api_calls.sds.injector"
+    with patch(f"{module}._get_endpoint", return_value=""), patch(
+        f"{module}.send_request", return_value=response
+    ) as mock_send_request:
+        assert sds_list("stand", 3, stream="False") == [{"id": 1}]
+    assert "stream" not in mock_send_request.call_args[0][0]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 65536])
+def test_items_decoded_from_chunks(size):
+    assert list(iter_json_array(_chunks(DOCUMENT, size), "content")) == DOCUMENT["content"]
+    assert list(iter_json_array(_chunks(DOCUMENT, size), "meta.filters")) == [
+        1,
+        2,
+        {"text": "]}"},
+    ]
+
+
+def test_root_list():
+    assert list(iter_json_array([b"[ 1 , 22 ,", b"333]"])) == [1, 22, 333]
+    # a number split between two chunks
+    assert list(iter_json_array([b"[1", b"2", b"3]"])) == [123]
+    assert list(iter_json_array([b" [ ] "])) == []
+
+
+def test_numbers_split_in_any_place():
+    assert list(iter_json_array([b"[1, -2.", b"5, 3]"])) == [1, -2.5, 3]
+    document = b'[-2.5, 1e3, 6.02E+23, -1.5e-7, 0, {"x": -12.75}, true]'
+    chunks = [document[index : index + 1] for index in range(len(document))]
+    assert list(iter_json_array(chunks)) == json.loads(document)
+
+
+@pytest.mark.parametrize(
+    "document, path",
+    [(b'{"a": 1}', "b"), (b'{"a": 1}', "a"), (b"{}", "a"), (b'{"a": [1, 2', "a")],
+)
+def test_invalid_path_or_document(document, path):
+    with pytest.raises(ValueError):
+        list(iter_json_array([document], path))
+
+
+def test_response_released():
+    response = MagicMock()
+    response.iter_content.return_value = iter(_chunks(DOCUMENT, 100))
+    items = iter_response_items(response, "content")
+    assert next(items) == DOCUMENT["content"][0]
+    items.close()
+    response.close.assert_called_once()
+
+
+def test_loads():
+    assert loads(json.dumps(DOCUMENT).encode("utf-8")) == DOCUMENT
@@ -0,0 +1,149 @@
+"""Unit tests for the keyword manifest used to load keywords lazily"""
+
+import os
+import pathlib
+import subprocess
+import sys
+
+from ams.data_model.common_libs.utils.keyword_manifest import (
+    build_keyword_manifest,
+    load_keyword_manifest,
+)
+
+
+def create_package(root):
+    """Create a small package with a functionality folder"""
+    package_path = root / "fakepkg"
+    (package_path / "feature" / "sub").mkdir(parents=True)
+    (package_path / "__init__.py").write_text("")
+    (package_path / "helpers.py").write_text(
+        'def shared(value, flag=False):\n    """Shared helper"""\n    return value\n'
+    )
+    (package_path / "feature" / "__init__.py").write_text("")
+    (package_path / "feature" / "sub" / "__init__.py").write_text("")
+    (package_path / "feature" / "sub" / "injector.py").write_text(
+        "import logging\n"
+        "from json import dumps\n"
+        "from fakepkg.helpers import shared\n"
+        "from ..other import *\n"
+        "LOGGER = logging.getLogger(__name__)\n"
+        "def my_keyword(name, timeout=120, *args, session_key='defaultKey', **kwargs):\n"
+        '    """My keyword doc"""\n'
+        "def _private(data=dict()):\n"
+        "    pass\n"
+        "class Helper:\n"
+        "    pass\n"
+    )
+    (package_path / "feature" / "broken.py").write_text("def broken(:\n")
+    return package_path
+
+
+def test_build_keyword_manifest(tmp_path):
+    package_path = create_package(tmp_path)
+    manifest = build_keyword_manifest(str(package_path), "fakepkg", ["feature"])
+
+    assert manifest["my_keyword"]["module"] == "fakepkg.feature.sub.injector"
+    assert manifest["my_keyword"]["keyword"] is True
+    assert manifest["my_keyword"]["doc"] == "My keyword doc"
+    assert manifest["my_keyword"]["args"] == [
+        "name",
+        ["timeout", 120],
+        "*args",
+        ["session_key", "defaultKey"],
+        "**kwargs",
+    ]
+    # imported names resolve to the module defining them, they are not keywords
+    assert manifest["shared"]["module"] == "fakepkg.helpers"
+    assert manifest["shared"]["args"] == ["value", ["flag", False]]
+    assert manifest["shared"]["keyword"] is False
+    # private functions and classes are reachable but are not Robot keywords
+    assert manifest["_private"]["keyword"] is False
+    assert manifest["_private"]["args"] == ["data=dict()"]
+    assert manifest["Helper"]["keyword"] is False
+    # names imported from outside the package and variables are ignored
+    assert "dumps" not in manifest
+    assert "LOGGER" not in manifest
+    # modules with syntax errors are skipped
+    assert "broken" not in manifest
+
+    # unless they are re-exported
+    manifest = build_keyword_manifest(
+        str(package_path), "fakepkg", ["feature"], reexports=["shared"]
+    )
+    assert manifest["shared"]["keyword"] is True
+
+
+def test_load_keyword_manifest_uses_cache(tmp_path):
+    package_path = create_package(tmp_path)
+    cache_dir = tmp_path / "cache"
+    manifest = load_keyword_manifest(
+        str(package_path), "fakepkg", ["feature"], cache_dir=str(cache_dir)
+    )
+    assert os.path.isfile(cache_dir / "keyword_manifest_fakepkg.json")
+
+    cached = load_keyword_manifest(
+        str(package_path), "fakepkg", ["feature"], cache_dir=str(cache_dir)
+    )
+    assert cached == manifest
+
+    # changing a source file invalidates the cache
+    injector = package_path / "feature" / "sub" / "injector.py"
+    injector.write_text("def another_keyword():\n    pass\n")
+    os.utime(injector, ns=(0, 0))
+    rebuilt = load_keyword_manifest(
+        str(package_path), "fakepkg", ["feature"], cache_dir=str(cache_dir)
+    )
+    assert "another_keyword" in rebuilt
+    assert "my_keyword" not in rebuilt
+
+
+def test_ams_keywords_are_imported_lazily():
+    import ams
+
+    library = ams.AmsLibrary()
+    assert "sds_save" in library.get_keyword_names()
+    assert library.get_keyword_arguments("sds_save") == [
+        "entity_type",
+        "data",
+        ("version", "latest"),
+    ]
+    assert ams._KEYWORD_MANIFEST["sds_save"]["module"] == (
+        "ams.mdm_api_calls.sds.injector"
+    )
+
+
+def test_ams_listeners_are_imported_lazily():
+    # the listeners import the HTTP clients on their first event, not with the library
+    code = (
+        "import sys, ams; ams.AmsLibrary(); "
+        "print(sorted(name for name in ('requests', "
+        "'ams.data_model.common_libs.clients.cassette', "
+        "'ams.data_model.common_libs.clients.http_metrics') if name in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+# keywords removed on purpose since the baseline, with the keyword replacing them
+REPLACED_KEYWORDS = {"sds_test_all_read_endpoints": "sds_benchmark_read_endpoints"}
+
+
+def test_ams_keywords_match_the_baseline():
+    import ams
+
+    baseline = (
+        (pathlib.Path(__file__).parent / "baseline_keywords.txt").read_text().split()
+    )
+    keywords = set(ams.AmsLibrary().get_keyword_names())
+    missing = [
+        name
+        for name in baseline
+        if name not in keywords and REPLACED_KEYWORDS.get(name) not in keywords
+    ]
+    assert not missing
+    assert "get_ref_airport_id" in keywords
+    # helpers imported by the injectors are not keywords
+    for helper in ("loads", "send_request", "paginate", "open_session_pool"):
+        assert helper not in keywords
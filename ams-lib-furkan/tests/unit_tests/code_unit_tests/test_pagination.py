@@ -0,0 +1,93 @@
+"""Unit tests for the paged list iterators"""
+
+import threading
+from unittest.mock import patch
+
+from ams.data_model.common_libs.injectors.injector import _http_call_pages
+from ams.data_model.common_libs.utils.pagination import (
+    CursorPaging,
+    OffsetPaging,
+    PageNumberPaging,
+    paginate,
+)
+
+MODULE = "ams.data_model.common_libs.injectors.injector"
+
+
+def test_page_number_lazy_until_short_page():
+    rows = list(range(25))
+    requested = []
+
+    def fetch(params):
+        requested.append(params)
+        start = params["page"] * params["size"]
+        return {"content": rows[start : start + params["size"]]}
+
+    items = paginate(fetch, PageNumberPaging(page_size=10, items_path="content"))
+    assert not requested
+    assert next(items) == 0
+    assert requested == [{"page": 0, "size": 10}]
+
+    assert [0] + list(items) == rows
+    assert [params["page"] for params in requested] == [0, 1, 2]
+
+
+def test_offset_until_empty_page():
+    rows = list(range(7))
+
+    def fetch(params):
+        start = params["pageStartRow"]
+        return {"mscMessageDTOList": rows[start : start + 3]}
+
+    paging = OffsetPaging(offset_param="pageStartRow", items_path="mscMessageDTOList")
+    assert list(paginate(fetch, paging)) == rows
+
+
+def test_cursor_skips_items_returned_again():
+    alerts = [{"alertId": i, "lastUpdatedDateTime": f"T{i // 2}"} for i in range(6)]
+
+    def fetch(params):
+        # the alerts updated at or after the cursor
+        matching = [
+            alert
+            for alert in alerts
+            if params["lastUpdatedDateTime"] is None
+            or alert["lastUpdatedDateTime"] >= params["lastUpdatedDateTime"]
+        ]
+        return matching[: params["maxNoOfAlerts"]]
+
+    paging = CursorPaging(size_param="maxNoOfAlerts", page_size=3, id_field="alertId")
+    assert [alert["alertId"] for alert in paginate(fetch, paging)] == list(range(6))
+
+
+def test_prefetch_requests_next_page_in_background():
+    requested = threading.Event()
+
+    def fetch(params):
+        if params["page"] == 1:
+            requested.set()
+            return [2]
+        return [0, 1]
+
+    items = paginate(fetch, PageNumberPaging(page_size=2), prefetch=True)
+    assert next(items) == 0
+    # the second page is requested while the first one is consumed
+    assert requested.wait(5)
+    assert list(items) == [1, 2]
+
+
+def test_http_call_pages_adds_paging_to_query():
+    pages = [{"content": [1, 2]}, {"content": [3]}]
+    with patch(f"{MODULE}._http_call", side_effect=pages) as mock_http_call:
+        items = _http_call_pages(
+            "/fom/rest-services/v4/visits/searches",
+            PageNumberPaging(page_size=2, items_path="content"),
+            operation="POST",
+            query_params={"best-time": "true"},
+        )
+        assert list(items) == [1, 2, 3]
+
+    assert mock_http_call.call_args_list[1].kwargs == {
+        "query_params": {"best-time": "true", "page": 1, "size": 2},
+        "operation": "POST",
+    }
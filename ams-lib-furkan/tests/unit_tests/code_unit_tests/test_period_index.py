@@ -0,0 +1,97 @@
+"""Unit tests for the period validity index"""
+
+import copy
+import datetime
+from unittest.mock import patch
+
+from ams.commons import (
+    get_resource_id,
+    get_resource_name,
+    get_resource_name_and_id,
+    get_valid_resources,
+)
+from ams.data_model.common_libs.utils.period_index import PeriodIndex
+
+MODULE = "ams.commons"
+
+NOW = datetime.datetime(2025, 6, 1, 12, 0, 0)
+
+STANDS = [
+    {
+        "id": "STD1",
+        "name": "A1",
+        "periods": [
+            {"periodId": "P1", "startDateTime": "2025-01-01T00:00:00.000Z", "endDateTime": "2025-03-01T00:00:00.000Z"},
+            {"periodId": "P2", "startDateTime": "2025-03-01T00:00:00.000Z", "endDateTime": None},
+        ],
+    },
+    {
+        "id": "STD2",
+        "name": "A2",
+        "periods": [
+            {"periodId": "P3", "startDateTime": "2024-01-01T00:00:00.000Z", "endDateTime": "2025-06-01T11:00:00.000Z"},
+        ],
+    },
+    {
+        "id": "STD3",
+        "name": "A3",
+        "periods": [
+            {"periodId": "P4", "startDateTime": "2025-07-01T00:00:00.000Z", "endDateTime": None},
+        ],
+    },
+    {"id": "STD4", "name": "A4", "periods": []},
+]
+
+
+def _ids(matches):
+    return [match["entity"]["id"] for match in matches]
+
+
+def test_active_at_and_valid_between():
+    index = PeriodIndex(STANDS)
+    assert index.size == 4
+    assert _ids(index.active_at("2025-02-01T00:00:00.000Z")) == ["STD1", "STD2"]
+    # the end of a period is excluded
+    assert _ids(index.active_at("2025-06-01T11:00:00")) == ["STD1"]
+    assert _ids(index.active_at(datetime.datetime(2025, 8, 1))) == ["STD1", "STD3"]
+    assert _ids(index.valid_between("2025-05-01T00:00:00", "2025-07-02T00:00:00")) == [
+        "STD1",
+        "STD2",
+        "STD3",
+    ]
+    matches = index.valid_between(end="2025-02-01T00:00:00")
+    assert [period["periodId"] for period in matches[0]["periods"]] == ["P1"]
+    assert index.valid_between("2025-07-02T00:00:00", "2025-07-01T00:00:00") == []
+
+
+def test_periods_changed_in_place():
+    stands = copy.deepcopy(STANDS)
+    with patch(f"{MODULE}.now_gmt", return_value=NOW):
+        assert get_resource_id(stands) == ["STD1", "STD3"]
+        # e.g. Set To Dictionary on a period of the response
+        stands[0]["periods"][-1]["endDateTime"] = "2025-01-01T00:00:00"
+        assert get_resource_id(stands) == ["STD3"]
+
+
+def test_resources_not_ended_now():
+    with patch(f"{MODULE}.now_gmt", return_value=NOW):
+        assert get_resource_id(STANDS) == ["STD1", "STD3"]
+        assert get_resource_name(STANDS, return_type="str") == "A1, A3"
+        assert get_resource_name_and_id(STANDS) == [
+            {"name": "A1", "id": "STD1"},
+            {"name": "A3", "id": "STD3"},
+        ]
+        assert get_valid_resources(STANDS, valid_at=NOW) == [
+            {
+                "id": "STD1",
+                "name": "A1",
+                "periods": [
+                    {
+                        "periodId": "P2",
+                        "startDateTime": "2025-03-01T00:00:00.000Z",
+                        "endDateTime": None,
+                    }
+                ],
+            }
+        ]
+    assert get_resource_id({"errors": []}) is None
@@ -5,6 +5,7 @@ import json
 
 from ams.data_model.common_libs.request_response_handler.response_validator import (
     load_and_validate_response_schema,
+    SCHEMA_VALIDATORS,
     verify_response_status_code,
     search_jmespath,
     execute_jmespath_queries,
@@ -62,6 +63,37 @@ def test_load_and_validate_response_schema_invalid():
         load_and_validate_response_schema(current_file, schema_name, invalid_response)
 
 
+def test_schema_validator_is_cached():
+    schema_file_path = create_temp_schema_file(schema_content)
+    load_and_validate_response_schema(current_file, schema_name, response)
+    validator = SCHEMA_VALIDATORS.get_validator(schema_file_path)
+    load_and_validate_response_schema(current_file, schema_name, response)
+    assert SCHEMA_VALIDATORS.get_validator(schema_file_path) is validator
+
+
+def test_load_and_validate_response_schema_fields():
+    create_temp_schema_file(
+        {
+            "type": "object",
+            "properties": {"key": {"type": "string"}, "other": {"type": "integer"}},
+            "required": ["key", "other"],
+        }
+    )
+    # only the requested fields are validated
+    load_and_validate_response_schema(
+        current_file, schema_name, {"key": "value", "other": "wrong"}, ["key"]
+    )
+    with pytest.raises(AssertionError):
+        load_and_validate_response_schema(
+            current_file, schema_name, {"key": 1, "other": 1}, ["key"]
+        )
+    with pytest.raises(ValueError):
+        load_and_validate_response_schema(
+            current_file, schema_name, response, ["unknown"]
+        )
+    create_temp_schema_file(schema_content)
+
+
 def test_verify_response_status_code_valid():
     try:
         verify_response_status_code(200, "200")
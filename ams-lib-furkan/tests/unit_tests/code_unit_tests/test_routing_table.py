@@ -0,0 +1,65 @@
+"""Unit tests for the routing tables"""
+
+from unittest.mock import patch
+
+from ams.data_model.common_libs.utils.routing_table import (
+    RoutingTable,
+    invalidate_routing_tables,
+)
+from ams.mdm_api_calls.sds.injector import SDS_ROUTES, sds_count, sds_get, sds_list
+
+MODULE = "ams.mdm_api_calls.sds.injector"
+
+
+def _context(airport_id, customer_id):
+    return {
+        "test_context": {
+            "generic_context": {
+                "ref_airport_full": airport_id,
+                "customer_id": customer_id,
+            }
+        }
+    }
+
+
+def test_built_once_per_values():
+    builds = []
+
+    def build(values):
+        builds.append(values)
+        return {"path": "/list/{}".format(*values)}
+
+    table = RoutingTable("test", build)
+    assert table.get(("APT_NCE",)) == {"path": "/list/APT_NCE"}
+    assert table.get(("APT_NCE",)) == {"path": "/list/APT_NCE"}
+    assert table.get(("APT_BRU",)) == {"path": "/list/APT_BRU"}
+    assert builds == [("APT_NCE",), ("APT_BRU",)]
+
+    invalidate_routing_tables()
+    assert table.statistics() == {"entries": 0, "builds": 2}
+    table.get(("APT_BRU",))
+    assert table.statistics() == {"entries": 1, "builds": 3}
+
+
+def test_sds_paths_resolved_from_the_table():
+    SDS_ROUTES.invalidate()
+    with patch(f"{MODULE}._sds_call") as mock_sds_call, patch(
+        f"{MODULE}.get_context", return_value=_context("APT_NCE", "CUST")
+    ) as mock_get_context:
+        sds_list("stand", 3)
+        sds_get("stand", 2)
+        sds_count("runway")
+        builds = SDS_ROUTES.statistics()["builds"]
+
+        # the paths are resolved again for another airport
+        mock_get_context.return_value = _context("APT_BRU", "CUST")
+        sds_list("stand", 3)
+
+    assert [call.args[3] for call in mock_sds_call.call_args_list] == [
+        "/list/APT_NCE",
+        "/CUST/APT_NCE/{id}",
+        "/count/APT_NCE",
+        "/list/APT_BRU",
+    ]
+    assert SDS_ROUTES.statistics()["builds"] == builds + 1
+    SDS_ROUTES.invalidate()
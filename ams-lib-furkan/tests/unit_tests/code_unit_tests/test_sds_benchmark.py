@@ -0,0 +1,66 @@
+"""Unit tests for the SDS read benchmark"""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ams.mdm_api_calls.sds.injector import SDS_ROUTES, sds_benchmark_read_endpoints
+
+MODULE = "ams.mdm_api_calls.sds.injector"
+
+CONTEXT = {
+    "test_context": {"generic_context": {"ref_airport_full": "ARP", "customer_id": "CUST"}}
+}
+
+
+def _send_request(rest_details, _session_key):
+    response = MagicMock()
+    if rest_details["path"] == "/sds/data/v3/gate/list/ARP":
+        response.status_code = 500
+        response.content = b""
+    elif rest_details["path"].endswith("DUMMY"):
+        response.status_code = 404
+        response.content = b""
+    else:
+        response.status_code = 200
+        response.content = b'[{"id": "STD1"}]'
+    return response
+
+
+def test_reads_aggregated_per_endpoint(tmp_path):
+    SDS_ROUTES.invalidate()
+    with patch(f"{MODULE}.send_request", side_effect=_send_request) as mock_send_request, patch(
+        f"{MODULE}.get_context", return_value=CONTEXT
+    ):
+        report = sds_benchmark_read_endpoints(
+            concurrency=4,
+            repeat=2,
+            entity_types=["stand", "gate"],
+            output_dir=str(tmp_path),
+            fail_on_errors=False,
+        )
+
+        with pytest.raises(ValueError, match="2 SDS reads failed, e.g. gate v3 list"):
+            sds_benchmark_read_endpoints(
+                entity_types=["gate"], repeat=2, output_dir=str(tmp_path)
+            )
+
+    # stand v2, v3, v4 and gate v3, v4, read by id and listed, twice
+    assert report["calls"] == 20
+    assert report["errors"] == 2
+    rows = {(row["entity_type"], row["version"], row["read"]): row for row in report["rows"]}
+    assert len(rows) == 10
+    assert rows[("stand", 3, "list")]["count"] == 2
+    assert rows[("stand", 3, "list")]["bytes"] == 16
+    assert rows[("stand", 2, "get")]["errors"] == 0
+    assert rows[("gate", 3, "list")]["failures"] == ["Call failed with status 500"]
+    assert rows[("gate", 3, "list")]["bytes"] is None
+    # the reads are not served from the HTTP cache
+    assert all(
+        "cache" not in call.args[0] for call in mock_send_request.call_args_list
+    )
+
+    with open(tmp_path / "sds_read_benchmark.json", encoding="utf-8") as file:
+        assert json.load(file)["calls"] == 8
+    SDS_ROUTES.invalidate()
@@ -0,0 +1,113 @@
+"""Unit tests for the concurrent SDS saves and deletes"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ams.data_model.common_libs.utils.entity_store import SDS_STORE
+from ams.mdm_api_calls.sds.injector import (
+    SDS_ROUTES,
+    sds_delete_many,
+    sds_save_many,
+)
+
+MODULE = "ams.mdm_api_calls.sds.injector"
+
+CONTEXT = {
+    "test_context": {"generic_context": {"ref_airport_full": "ARP", "customer_id": "CUST"}}
+}
+
+
+def _payload_generator(item, _filename, _current_file):
+    generator = MagicMock()
+    generator.construct_generic_payload.return_value = f'{{"name": "{item["name"]}"}}'
+    return generator
+
+
+def test_save_many_concurrent_and_registered_for_clean_up():
+    in_flight = []
+    max_in_flight = []
+    lock = threading.Lock()
+
+    def sds_call(operation, _entity_type, _version, _endpoint, payload=None):
+        with lock:
+            in_flight.append(payload)
+            max_in_flight.append(len(in_flight))
+        time.sleep(0.05)
+        with lock:
+            in_flight.remove(payload)
+        if "S3" in payload:
+            raise ValueError("Call failed with status 400")
+        return {"id": payload.split('"')[3].replace("S", "STD")}
+
+    stands = [{"name": f"S{index}"} for index in range(6)]
+    with patch(f"{MODULE}._sds_call", side_effect=sds_call), patch(
+        f"{MODULE}.PayloadGenerator", side_effect=_payload_generator
+    ), patch(f"{MODULE}.add_data_to_clean_up") as mock_add_data_to_clean_up, patch(
+        f"{MODULE}.get_context", return_value=CONTEXT
+    ):
+        results = sds_save_many("stand", stands, concurrency=3, return_errors=True)
+
+        with pytest.raises(ValueError, match="Failed to save 1 entities stand"):
+            sds_save_many("stand", stands[3:4])
+
+    assert [result["id"] for result in results] == [
+        "STD0",
+        "STD1",
+        "STD2",
+        None,
+        "STD4",
+        "STD5",
+    ]
+    assert results[3]["error"] == "Call failed with status 400"
+    assert all(result["elapsed"] >= 0.05 for result in results)
+    assert max(max_in_flight) == 3
+    assert [call.args for call in mock_add_data_to_clean_up.call_args_list] == [
+        ("stand", "STD0"),
+        ("stand", "STD1"),
+        ("stand", "STD2"),
+        ("stand", "STD4"),
+        ("stand", "STD5"),
+    ]
+
+
+def test_save_many_with_bulk_endpoint():
+    def sds_call(_operation, _entity_type, _version, endpoint, payload=None):
+        assert endpoint == "/saveAll"
+        assert payload == '[{"name": "S0"},{"name": "S1"}]'
+        return [{"id": "STD0"}, {"id": "STD1"}]
+
+    with patch.dict(f"{MODULE}.ENTITIES", {"stand": {4: {"save_many": "/saveAll"}}}), patch(
+        f"{MODULE}._sds_call", side_effect=sds_call
+    ) as mock_sds_call, patch(
+        f"{MODULE}.PayloadGenerator", side_effect=_payload_generator
+    ), patch(
+        f"{MODULE}.add_data_to_clean_up"
+    ), patch(
+        f"{MODULE}.get_context", return_value=CONTEXT
+    ):
+        SDS_ROUTES.invalidate()
+        results = sds_save_many("stand", [{"name": "S0"}, {"name": "S1"}])
+    SDS_ROUTES.invalidate()
+
+    assert mock_sds_call.call_count == 1
+    assert [result["id"] for result in results] == ["STD0", "STD1"]
+
+
+def test_delete_many_updates_the_store():
+    SDS_STORE.reset()
+    SDS_STORE.find(("stand", 4, "CUST"), lambda: [{"id": "STD1"}, {"id": "STD2"}])
+    with patch(f"{MODULE}._sds_call") as mock_sds_call, patch(
+        f"{MODULE}.get_context", return_value=CONTEXT
+    ):
+        results = sds_delete_many("stand", ["STD1", "STD2"], version="4")
+
+    assert sorted(call.args[3] for call in mock_sds_call.call_args_list) == [
+        "?id=STD1",
+        "?id=STD2",
+    ]
+    assert [result["error"] for result in results] == [None, None]
+    assert SDS_STORE.find(("stand", 4, "CUST"), list) == []
+    SDS_STORE.reset()
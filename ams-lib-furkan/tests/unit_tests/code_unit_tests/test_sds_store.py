@@ -0,0 +1,84 @@
+"""Unit tests for the in-memory SDS store"""
+
+from unittest.mock import patch
+
+from ams.data_model.common_libs.utils.entity_store import SDS_STORE, EntityStore
+from ams.mdm_api_calls.sds.airline import sds_save_airline
+
+MODULE = "ams.mdm_api_calls.sds.injector"
+
+CONTEXT = {
+    "test_context": {"generic_context": {"ref_airport_full": "ARP", "customer_id": "CUST"}}
+}
+
+AIRLINES = [
+    {"id": "ALN1", "periods": [{"iata": "ZZ", "icao": "ZZZ"}]},
+    {"id": "ALN2", "periods": [{"iata": "ZY", "icao": "ZZY"}]},
+]
+
+
+class Clock:
+    """Clock moved by the tests"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lookups_by_index_until_expired():
+    clock = Clock()
+    store = EntityStore(ttl=10, clock=clock)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return [
+            {"id": "ARP1", "iataCode": "ZZZ", "icaoCode": "ZZZZ"},
+            {"id": "ARP2", "iataCode": "ZZY", "icaoCode": "ZZZZ"},
+        ]
+
+    assert [e["id"] for e in store.find("airport", load, icao="ZZZZ")] == ["ARP1", "ARP2"]
+    assert [e["id"] for e in store.find("airport", load, iata="ZZZ", icao="ZZZZ")] == ["ARP1"]
+    assert store.find("airport", load, iata="XXX") == []
+
+    # saved and deleted entities are updated in place
+    store.put("airport", {"id": "ARP3", "iataCode": "XXX"})
+    store.remove(lambda key: key == "airport", "ARP1")
+    assert [e["id"] for e in store.find("airport", load, iata="XXX")] == ["ARP3"]
+    assert [e["id"] for e in store.find("airport", load, icao="ZZZZ")] == ["ARP2"]
+    assert len(loads) == 1
+
+    clock.now = 10
+    store.find("airport", load, iata="ZZZ")
+    assert len(loads) == 2
+    assert store.statistics() == {"keys": 1, "entities": 2, "hits": 4, "loads": 2}
+
+
+def test_save_airline_looks_up_the_store():
+    SDS_STORE.reset()
+    calls = []
+
+    def sds_call(operation, entity_type, version, endpoint, payload=None, stream=None):
+        calls.append((operation, entity_type, version, endpoint))
+        if operation == "GET":
+            return iter(AIRLINES)
+        return {"id": "ALN3", "periods": [{"iata": "ZX", "icao": "ZZX"}]}
+
+    with patch(f"{MODULE}._sds_call", side_effect=sds_call), patch(
+        f"{MODULE}.get_context", return_value=CONTEXT
+    ), patch(
+        f"{MODULE}.add_data_to_clean_up"
+    ), patch(f"{MODULE}.PayloadGenerator"), patch(
+        "ams.mdm_api_calls.sds.airline.get_customer_id", return_value="CUST"
+    ):
+        assert sds_save_airline("ZZ")["id"] == "ALN1"
+        assert sds_save_airline("ZY", icao="ZZY")["id"] == "ALN2"
+        # the created airline is found without request
+        assert sds_save_airline("ZX", icao="ZZX")["id"] == "ALN3"
+        assert sds_save_airline("ZX", icao="ZZX")["id"] == "ALN3"
+
+    assert [call[0] for call in calls] == ["GET", "POST"]
+    assert calls[0][:3] == ("GET", "airline", 4)
+    SDS_STORE.reset()
@@ -0,0 +1,101 @@
+"""Unit tests for the cached AMS session bootstrap"""
+
+from unittest.mock import patch
+import pytest
+
+from ams.data_model.initialize_ams_test.session_cache import (
+    SESSION_CACHE,
+    reauthenticate,
+)
+from ams.initalize_ams_test import injector
+
+MODULE = "ams.initalize_ams_test.injector"
+
+
+class FakeSessions:
+    """Protocols sessions keeping the context data of the opened session"""
+
+    def __init__(self):
+        self.logins = 0
+        self.context_data = None
+
+    def open_session(self, test_context):
+        self.logins += 1
+        self.context_data = {
+            "test_context": test_context,
+            "global_environment_context": {"login": self.logins},
+        }
+
+    def _get_session_context_data(self, *_args):
+        return self.context_data
+
+    def _get_security_context_details(self, *_args):
+        return {"header": {"Cookie": f"session={self.logins}"}}
+
+
+class FakeAMSSession:
+    """AMS session logging in through the fake protocols sessions"""
+
+    def __init__(self, fake_sessions, test_context):
+        self.fake_sessions = fake_sessions
+        self.test_context = test_context
+
+    def create_ams_session(self):
+        self.fake_sessions.open_session(self.test_context)
+
+
+@pytest.fixture
+def sessions():
+    fake_sessions = FakeSessions()
+    SESSION_CACHE.discard()
+    with patch(f"{MODULE}.AMSSession") as mock_ams_session, patch(
+        f"{MODULE}.session_manager"
+    ) as mock_session_manager, patch(
+        "ams.data_model.initialize_ams_test.session_cache.session_manager",
+        mock_session_manager,
+    ), patch(
+        f"{MODULE}._get_active_configuration",
+        side_effect=lambda: fake_sessions.context_data.setdefault(
+            "active_configuration", {"settings": []}
+        ),
+    ), patch(
+        f"{MODULE}.get_component_versions"
+    ), patch(
+        f"{MODULE}.initialize_context", side_effect=lambda: {"generic_context": {}}
+    ):
+        mock_session_manager.sessions = fake_sessions
+        mock_ams_session.side_effect = lambda protocol, test_context: FakeAMSSession(
+            fake_sessions, test_context
+        )
+        yield fake_sessions
+    SESSION_CACHE.discard()
+
+
+def test_session_is_reused(sessions):
+    injector.open_generic_ams_session("REST", ".", load_active_conf=True)
+    first_context = sessions.context_data["test_context"]
+    injector.open_generic_ams_session("REST", ".")
+
+    assert sessions.logins == 1
+    # the test context is new, the configuration is reused
+    assert sessions.context_data["test_context"] is not first_context
+    assert "active_configuration" in sessions.context_data
+
+    injector.open_generic_ams_session("REST", ".", refresh_session="True")
+    assert sessions.logins == 2
+
+
+def test_session_is_opened_again_when_expired(sessions):
+    with patch(f"{MODULE}.session_ttl", return_value=0.0):
+        injector.open_generic_ams_session("REST", ".")
+        injector.open_generic_ams_session("REST", ".")
+    assert sessions.logins == 2
+
+
+def test_reauthenticate(sessions):
+    injector.open_generic_ams_session("REST", ".", load_active_conf=True)
+    assert reauthenticate("defaultKey") is True
+    assert sessions.logins == 2
+    # what was loaded by the previous session is kept
+    assert "active_configuration" in sessions.context_data
+    assert reauthenticate("otherKey") is False
@@ -0,0 +1,83 @@
+"""Unit tests for the session pool"""
+
+import time
+from unittest.mock import patch
+
+from ams.data_model.common_libs.clients.ams_rest_client import (
+    _handle_unauthorized,
+    get_security_context,
+)
+from ams.data_model.initialize_ams_test.session_pool import SessionPool, load_pool_users
+
+ENVIRONMENT_CONTEXT = {"server_url": "https://ams.test"}
+
+
+class FakeLogin:
+    """Returns a new cookie for every login"""
+
+    def __init__(self):
+        self.logins = []
+
+    def __call__(self, _environment_context, user):
+        self.logins.append(user["username"])
+        return {"Cookie": f"session={user['username']}-{len(self.logins)}"}
+
+
+def test_load_pool_users(tmp_path):
+    users_file = tmp_path / "operators.txt"
+    users_file.write_text(
+        "user fids_operator\npassword secret\norganization BRU\n"
+        "user fom_controller\npassword other\n",
+        encoding="utf-8",
+    )
+    assert load_pool_users(str(users_file)) == [
+        {"username": "fids_operator", "password": "secret", "organization": "BRU"},
+        {"username": "fom_controller", "password": "other", "organization": "1A"},
+    ]
+
+
+def test_sessions_resolved_round_robin_and_refreshed_on_401():
+    login = FakeLogin()
+    users = [{"username": "a"}, {"username": "b"}]
+    pool = SessionPool(
+        users, ENVIRONMENT_CONTEXT, size=3, refresh_interval=0, login=login
+    ).open()
+    try:
+        assert sorted(login.logins) == ["a", "a", "b"]
+        assert [pool.acquire() for _ in range(4)] == [
+            "pool_0",
+            "pool_1",
+            "pool_2",
+            "pool_0",
+        ]
+        security_context = get_security_context("pool_1")
+        assert security_context["server_url"] == "https://ams.test"
+        assert security_context["header"]["Cookie"].startswith("session=b-")
+
+        # a rejected pooled session is logged in again
+        assert _handle_unauthorized("pool_1")
+        assert get_security_context("pool_1")["header"]["Cookie"] == "session=b-4"
+    finally:
+        pool.close()
+
+    # the keys are not resolved by the pool anymore
+    with patch(
+        "ams.data_model.common_libs.clients.ams_rest_client.session_manager"
+    ) as mock_session_manager:
+        mock_session_manager.sessions._get_security_context_details.return_value = None
+        assert get_security_context("pool_1") is None
+        assert not _handle_unauthorized("pool_1")
+
+
+def test_sessions_refreshed_in_background():
+    login = FakeLogin()
+    pool = SessionPool(
+        [{"username": "a"}], ENVIRONMENT_CONTEXT, refresh_interval=0.05, login=login
+    ).open()
+    try:
+        deadline = time.monotonic() + 5
+        while len(login.logins) < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert len(login.logins) >= 3
+    finally:
+        pool.close()
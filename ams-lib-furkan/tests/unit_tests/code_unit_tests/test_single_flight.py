@@ -0,0 +1,123 @@
+"""Unit tests for the single flight calls"""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ams.data_model.common_libs.clients.ams_rest_client import RestTransport
+from ams.data_model.common_libs.clients.single_flight import SINGLE_FLIGHT, SingleFlight
+
+MODULE = "ams.data_model.common_libs.clients.ams_rest_client"
+
+
+def _run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_identical_calls_collapsed():
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"versions": 1}
+
+    threads, results, _errors = _run_concurrently(
+        5, lambda: flight.do("versions", fetch, dict)
+    )
+    # wait until the 4 other callers wait for the first one
+    for _ in range(500):
+        if flight.statistics()["coalesced"] == 4:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert all(result == {"versions": 1} for result in results)
+    # the waiters get a copy
+    assert len({id(result) for result in results}) == 5
+    assert flight.statistics() == {"executed": 1, "coalesced": 4}
+
+    # the next call is executed again
+    flight.do("versions", fetch)
+    assert len(calls) == 2
+
+
+def test_error_shared_with_waiters():
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("boom")
+
+    threads, _results, errors = _run_concurrently(3, lambda: flight.do("key", fail))
+    for _ in range(500):
+        if flight.statistics()["coalesced"] == 2:
+            break
+        threading.Event().wait(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert all(isinstance(error, ValueError) for error in errors)
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+
+
+def test_transport_collapses_identical_gets():
+    SINGLE_FLIGHT.reset()
+    release = threading.Event()
+    response = MagicMock()
+    response.status_code = 200
+    response.content = b"{}"
+
+    def request(*_args, **_kwargs):
+        release.wait(5)
+        return response
+
+    session = MagicMock()
+    session.request.side_effect = request
+    transport = RestTransport(pool_size=1, timeout=1)
+    details = {"operation": "GET", "path": "/esb4/api/node/interface/descriptor"}
+    with patch(f"{MODULE}.session_manager") as mock_session_manager, patch.object(
+        transport, "get_session", return_value=session
+    ):
+        mock_session_manager.sessions._get_security_context_details.return_value = {
+            "server_url": "http://ams.test",
+            "header": {},
+        }
+        threads, results, errors = _run_concurrently(
+            3, lambda: transport.send(dict(details))
+        )
+        for _ in range(500):
+            if SINGLE_FLIGHT.statistics()["coalesced"] == 2:
+                break
+            threading.Event().wait(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        # other operations are always sent
+        transport.send({"operation": "POST", "path": "/x", "data": "{}"})
+
+    assert errors == [None] * 3
+    assert all(result.status_code == 200 for result in results)
+    assert session.request.call_count == 2
+    assert SINGLE_FLIGHT.statistics() == {"executed": 1, "coalesced": 2}
+    SINGLE_FLIGHT.reset()
@@ -0,0 +1,73 @@
+"""Unit tests for the xMIDS data channel manager"""
+
+from unittest.mock import MagicMock, patch
+
+from ams.fid_api_calls.xmids.channel_manager import XmidsChannelManager
+
+MODULE = "ams.fid_api_calls.xmids.channel_manager"
+
+
+def _open_data_channel(**kwargs):
+    ws = MagicMock()
+    ws.is_connected.return_value = True
+    ws.request_update.return_value = True
+    ws.get_snapshot.side_effect = lambda view: [view, kwargs["context"]]
+    return ws
+
+
+def _selection_rule(rule_name, _session_key, **_kwargs):
+    response = MagicMock()
+    response.json.return_value = {"results": [{"fdrClearRule": f"select {rule_name}"}]}
+    return response
+
+
+def test_channel_reused_per_context():
+    manager = XmidsChannelManager()
+    with patch(
+        f"{MODULE}.fids_open_data_channel", side_effect=_open_data_channel
+    ) as mock_open, patch(
+        f"{MODULE}.fids_selection_rule_get_by_name", side_effect=_selection_rule
+    ) as mock_rule, patch(
+        f"{MODULE}.fids_close_data_channel"
+    ) as mock_close:
+        context = {"MONITOR.resourceName": "C1"}
+        dedicated, common = manager.query(
+            ["xMIDS Counter Flights", "xMIDS Counter Common Allocations"], context
+        )
+        assert dedicated == ["robot_xmids_counter_flights", context]
+        assert common == ["robot_xmids_counter_common_allocations", context]
+
+        manager.query(["xMIDS Counter Flights"], context)
+        manager.query(["xMIDS Counter Flights"], {"MONITOR.resourceName": "C2"})
+
+    # one channel per context, both rules of the counter on the same channel
+    assert mock_open.call_count == 2
+    assert mock_open.call_args_list[0].kwargs["selection_rules"] == {
+        "robot_xmids_counter_flights": "select xMIDS Counter Flights",
+        "robot_xmids_counter_common_allocations": "select xMIDS Counter Common Allocations",
+    }
+    assert mock_rule.call_count == 2
+    mock_close.assert_not_called()
+
+
+def test_channel_reopened_with_new_rule_or_when_closed():
+    manager = XmidsChannelManager()
+    with patch(
+        f"{MODULE}.fids_open_data_channel", side_effect=_open_data_channel
+    ) as mock_open, patch(
+        f"{MODULE}.fids_selection_rule_get_by_name", side_effect=_selection_rule
+    ), patch(
+        f"{MODULE}.fids_close_data_channel"
+    ) as mock_close:
+        manager.query(["xMIDS Arrival Flights"], {})
+        manager.query(["xMIDS Departure Flights"], {})
+        assert set(mock_open.call_args.kwargs["selection_rules"]) == {
+            "robot_xmids_arrival_flights",
+            "robot_xmids_departure_flights",
+        }
+
+        manager.channels["{}"].ws.is_connected.return_value = False
+        manager.query(["xMIDS Arrival Flights"], {})
+
+    assert mock_open.call_count == 3
+    assert mock_close.call_count == 2
@@ -104,3 +104,24 @@ def test_payload_generation_without_mock(
         generated_payload
         == """{"flight": {"customerId": "value","airlineCode": "ARL_" ,"flightNumber": "1246" ,"operationalSuffix": ""},}"""
     )
+
+
+def test_compiled_template_is_cached(tmp_path):
+    """Test the template is compiled once and recompiled when the file changes."""
+    template_file = tmp_path / "cached.jinja"
+    template_file.write_text("Hello {{ data.key }}")
+    current_file = str(tmp_path / "injector.py")
+
+    with patch.object(
+        PayloadGenerator, "read_template", wraps=PayloadGenerator.read_template
+    ) as mock_read_template:
+        first = PayloadGenerator({"key": "one"}, "cached.jinja", current_file)
+        second = PayloadGenerator({"key": "two"}, "cached.jinja", current_file)
+        assert first.construct_generic_payload() == "Hello one"
+        assert second.construct_generic_payload() == "Hello two"
+        assert mock_read_template.call_count == 1
+
+        template_file.write_text("Bye {{ data.key }}")
+        os.utime(template_file, ns=(0, 0))
+        assert second.construct_generic_payload() == "Bye two"
+        assert mock_read_template.call_count == 2